@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Artifact Index
+
+Local retrieval index over the files a crew writes:
+- Artifacts are split into overlapping passages and embedded with a hashing
+  TF-IDF vectorizer (no model download, no network, no fitted vocabulary,
+  so vectors stay comparable across runs and topics)
+- Vectors live in a memory-mapped float32 matrix on disk; passages and
+  metadata sit next to it
+- Approximate nearest-neighbour search with random-hyperplane LSH, reranked
+  by exact cosine similarity (exact search for small indexes and for
+  searches limited to a few files)
+- Replaced and removed passages drop out of the document frequencies at
+  once; the files are compacted once they make up half of the rows
+- ArtifactSearchTool lets agents fetch the top-k passages instead of reading
+  whole files; a tool scoped to a run's files only ever returns passages of
+  those files, so crews sharing the index never see each other's artifacts
+
+Layout of an index directory:
+
+    .crewai_index/
+        vectors.f32         # memory-mapped matrix, one row per passage
+        passages.jsonl      # one passage (source, text) per line
+        meta.json           # row count, capacity, document frequencies, sources
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Type
+import numpy as np
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+
+DEFAULT_INDEX_DIR = ".crewai_index"
+DIMENSIONS = 2048
+PASSAGE_WORDS = 120
+PASSAGE_OVERLAP = 20
+LSH_TABLES = 8
+LSH_BITS = 10
+EXACT_SEARCH_LIMIT = 5000
+COMPACT_MIN_DELETED = 1000
+COMPACT_RATIO = 0.5
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def features(text: str) -> List[str]:
+    """Unigrams and bigrams of the lower-cased words."""
+    words = WORD_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def embed(text: str, dimensions: int = DIMENSIONS) -> np.ndarray:
+    """Signed feature-hashing vector with sublinear term frequency, L2-normalised."""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    counts: Dict[int, float] = {}
+    for feature in features(text):
+        hashed = _hash(feature)
+        slot = hashed % dimensions
+        counts[slot] = counts.get(slot, 0.0) + (1.0 if (hashed >> 63) & 1 else -1.0)
+    for slot, count in counts.items():
+        vector[slot] = np.sign(count) * (1.0 + np.log(abs(count))) if count else 0.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def split_passages(text: str, words: int = PASSAGE_WORDS, overlap: int = PASSAGE_OVERLAP) -> List[str]:
+    """Overlapping windows of about `words` words, starting new windows at paragraph breaks where possible."""
+    passages: List[str] = []
+    current: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        tokens = paragraph.split()
+        if not tokens:
+            continue
+        if current and len(current) + len(tokens) > words:
+            passages.append(" ".join(current))
+            current = current[-overlap:] if overlap else []
+        current.extend(tokens)
+        while len(current) > words:
+            passages.append(" ".join(current[:words]))
+            current = current[words - overlap:]
+    if current:
+        passages.append(" ".join(current))
+    return passages
+
+
+class ArtifactIndex:
+    """Persistent passage index with hashing TF-IDF vectors and LSH search."""
+
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR, dimensions: int = DIMENSIONS):
+        """
+        Open (or create) an index.
+
+        Args:
+            directory: Directory holding the index files
+            dimensions: Vector size (must match an existing index)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._passages_path = os.path.join(directory, "passages.jsonl")
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+
+        meta: Dict[str, Any] = {}
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, 'r') as f:
+                meta = json.load(f)
+        self.dimensions = meta.get("dimensions", dimensions)
+        self.count = meta.get("count", 0)
+        self.capacity = meta.get("capacity", 0)
+        self.sources: Dict[str, Dict[str, Any]] = meta.get("sources", {})
+        self.deleted: Set[int] = set(meta.get("deleted", []))
+        self.document_frequency = np.zeros(self.dimensions, dtype=np.float64)
+        if "document_frequency" in meta:
+            self.document_frequency[:] = meta["document_frequency"]
+
+        self.passages: List[Dict[str, Any]] = []
+        if os.path.exists(self._passages_path):
+            with open(self._passages_path, 'r') as f:
+                self.passages = [json.loads(line) for line in f][:self.count]
+        self._vectors = self._open_vectors(max(self.capacity, 256))
+
+        rng = np.random.default_rng(0)
+        self._planes = rng.standard_normal((LSH_TABLES, LSH_BITS, self.dimensions)).astype(np.float32)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(LSH_TABLES)]
+        if self.count:
+            self._add_to_buckets(0, self.count)
+
+    def _open_vectors(self, capacity: int) -> np.memmap:
+        mode = "r+" if os.path.exists(self._vectors_path) else "w+"
+        if mode == "r+" and os.path.getsize(self._vectors_path) < capacity * self.dimensions * 4:
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(capacity * self.dimensions * 4)
+        self.capacity = capacity
+        return np.memmap(self._vectors_path, dtype=np.float32, mode=mode, shape=(capacity, self.dimensions))
+
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        """LSH bucket id of every vector in every table: shape (tables, n)."""
+        bits = np.einsum("tbd,nd->tnb", self._planes, vectors) > 0
+        return (bits * (1 << np.arange(LSH_BITS))).sum(axis=2)
+
+    def _add_to_buckets(self, start: int, end: int) -> None:
+        signatures = self._signatures(np.asarray(self._vectors[start:end]))
+        for table, buckets in enumerate(self._buckets):
+            for offset, signature in enumerate(signatures[table]):
+                buckets.setdefault(int(signature), []).append(start + offset)
+
+    def _save_meta(self) -> None:
+        meta = {
+            "dimensions": self.dimensions,
+            "count": self.count,
+            "capacity": self.capacity,
+            "sources": self.sources,
+            "deleted": sorted(self.deleted),
+            "document_frequency": self.document_frequency.tolist(),
+        }
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _drop(self, rows: List[int]) -> None:
+        """Delete rows from search results and from the document frequencies (lock held)."""
+        rows = [row for row in rows if row not in self.deleted]
+        if rows:
+            self.document_frequency -= (np.asarray(self._vectors[rows]) != 0).sum(axis=0)
+            np.maximum(self.document_frequency, 0, out=self.document_frequency)
+            self.deleted.update(rows)
+
+    def _compact_if_needed(self) -> None:
+        """Rewrite the vectors and passages without deleted rows once they are half the index (lock held)."""
+        if len(self.deleted) < max(COMPACT_MIN_DELETED, self.count * COMPACT_RATIO):
+            return
+        live = [row for row in range(self.count) if row not in self.deleted]
+        renumber = {row: new_row for new_row, row in enumerate(live)}
+        capacity = max(len(live), 256)
+
+        tmp_vectors_path = f"{self._vectors_path}.tmp"
+        vectors = np.memmap(tmp_vectors_path, dtype=np.float32, mode="w+", shape=(capacity, self.dimensions))
+        if live:
+            vectors[:len(live)] = self._vectors[live]
+        vectors.flush()
+        del vectors
+        passages = [self.passages[row] for row in live]
+        tmp_passages_path = f"{self._passages_path}.tmp"
+        with open(tmp_passages_path, 'w') as f:
+            for passage in passages:
+                f.write(json.dumps(passage) + "\n")
+
+        self._vectors.flush()
+        del self._vectors
+        os.replace(tmp_vectors_path, self._vectors_path)
+        os.replace(tmp_passages_path, self._passages_path)
+        self._vectors = self._open_vectors(capacity)
+        self.passages = passages
+        self.count = len(live)
+        self.deleted = set()
+        for info in self.sources.values():
+            info["rows"] = [renumber[row] for row in info["rows"] if row in renumber]
+        self._buckets = [{} for _ in range(LSH_TABLES)]
+        if self.count:
+            self._add_to_buckets(0, self.count)
+        self._save_meta()
+
+    def add_text(self, source: str, text: str) -> int:
+        """
+        Index (or re-index) the content of one artifact.
+
+        Unchanged content is skipped; changed content replaces the source's
+        earlier passages.
+
+        Args:
+            source: Identifier of the artifact, usually its path
+            text: Full content of the artifact
+
+        Returns:
+            int: Number of passages added
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        passages = split_passages(text)
+        vectors = np.stack([embed(passage, self.dimensions) for passage in passages]) if passages else None
+
+        with self._lock:
+            previous = self.sources.get(source)
+            if previous and previous["sha256"] == digest:
+                return 0
+            if previous:
+                self._drop(previous["rows"])
+                self._compact_if_needed()
+
+            start = self.count
+            end = start + len(passages)
+            if end > self.capacity:
+                self._vectors.flush()
+                self._vectors = self._open_vectors(max(end, self.capacity * 2))
+            if vectors is not None:
+                self._vectors[start:end] = vectors
+                self._vectors.flush()
+                self.document_frequency += (vectors != 0).sum(axis=0)
+            with open(self._passages_path, 'a') as f:
+                for passage in passages:
+                    f.write(json.dumps({"source": source, "text": passage}) + "\n")
+            self.passages.extend({"source": source, "text": passage} for passage in passages)
+            self.count = end
+            self.sources[source] = {"sha256": digest, "rows": list(range(start, end))}
+            if vectors is not None:
+                self._add_to_buckets(start, end)
+            self._save_meta()
+            return len(passages)
+
+    def remove(self, source: str) -> bool:
+        """Drop an artifact's passages from search results. Returns False if it was not indexed."""
+        with self._lock:
+            previous = self.sources.pop(source, None)
+            if previous is None:
+                return False
+            self._drop(previous["rows"])
+            self._compact_if_needed()
+            self._save_meta()
+            return True
+
+    def add_file(self, path: str) -> int:
+        """Index a file from disk (see add_text)."""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return self.add_text(os.path.normpath(path), f.read())
+
+    def _idf(self) -> np.ndarray:
+        live = max(self.count - len(self.deleted), 1)
+        return np.log((1 + live) / (1 + self.document_frequency)).astype(np.float32) + 1.0
+
+    def search(self, query: str, k: int = 4, source: Optional[str] = None,
+               sources: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Top-k passages for a query.
+
+        Args:
+            query: Natural-language query
+            k: Number of passages to return
+            source: Only search passages of this artifact
+            sources: Only search passages of these artifacts
+
+        Returns:
+            List[Dict[str, Any]]: {"source", "score", "text"} records, best first
+        """
+        query_vector = embed(query, self.dimensions) * self._idf()
+        norm = np.linalg.norm(query_vector)
+        if not norm:
+            return []
+        query_vector /= norm
+
+        with self._lock:
+            if source is not None or sources is not None:
+                # A few files' passages: score them all rather than hope they share the query's buckets.
+                wanted = [source] if source is not None else list(sources)
+                allowed = [row for path in wanted
+                           for row in self.sources.get(os.path.normpath(path), {}).get("rows", [])]
+                if source is not None and sources is not None and \
+                        os.path.normpath(source) not in {os.path.normpath(path) for path in sources}:
+                    allowed = []
+                candidates = np.array(sorted(set(allowed)), dtype=np.int64)
+            elif self.count - len(self.deleted) <= EXACT_SEARCH_LIMIT:
+                candidates = np.arange(self.count)
+            else:
+                signatures = self._signatures(query_vector[None, :])[:, 0]
+                rows: Set[int] = set()
+                for table, buckets in enumerate(self._buckets):
+                    rows.update(buckets.get(int(signatures[table]), ()))
+                candidates = np.fromiter(rows, dtype=np.int64) if len(rows) >= k else np.arange(self.count)
+
+            if self.deleted:
+                candidates = candidates[~np.isin(candidates, list(self.deleted))]
+            if not len(candidates):
+                return []
+
+            candidates = np.sort(candidates)
+            scores = np.asarray(self._vectors[candidates]) @ query_vector
+            best = [i for i in np.argsort(-scores)[:k] if scores[i] > 0]
+            return [{"source": self.passages[candidates[i]]["source"], "score": round(float(scores[i]), 4),
+                     "text": self.passages[candidates[i]]["text"]} for i in best]
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors.flush()
+
+
+class ArtifactSearchInput(BaseModel):
+    query: str = Field(..., description="What you are looking for in the crew's files")
+    k: int = Field(default=4, description="Number of passages to return")
+    source: Optional[str] = Field(default=None, description="Only search this file (optional)")
+
+
+class ArtifactSearchTool(BaseTool):
+    name: str = "Search Crew Files"
+    description: str = (
+        "Searches the files written by the crew (research notes, drafts, reports) and returns "
+        "only the most relevant passages. Prefer this over reading whole files."
+    )
+    args_schema: Type[BaseModel] = ArtifactSearchInput
+    index: Any = None
+    scope: Optional[List[str]] = None  # the run's artifact paths; None searches every indexed file
+
+    def _run(self, query: str, k: int = 4, source: Optional[str] = None) -> str:
+        results = self.index.search(query, k=k, source=source, sources=self.scope)
+        if not results:
+            return "No matching passages found."
+        return "\n\n".join(f"[{result['source']} | score {result['score']}]\n{result['text']}"
+                           for result in results)
+
+
+def index_written_files(index: ArtifactIndex):
+    """Decorator for a FileWriterTool's run function that indexes every file it writes."""
+    def decorator(run):
+        def write_and_index(*args: Any, **kwargs: Any) -> Any:
+            result = run(*args, **kwargs)
+            filename, content = kwargs.get("filename"), kwargs.get("content")
+            if filename and isinstance(content, str) and not str(result).lower().startswith("error"):
+                index.add_text(os.path.normpath(os.path.join(kwargs.get("directory") or "./", filename)), content)
+            return result
+        return write_and_index
+    return decorator
+
+
+def main() -> None:
+    """Index files or search the index: python artifact_index.py add FILE... | search QUERY."""
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("add", "search"):
+        print("Usage: python artifact_index.py add FILE... | search QUERY")
+        return
+
+    index = ArtifactIndex()
+    if sys.argv[1] == "add":
+        for path in sys.argv[2:]:
+            print(f"📥 {path}: {index.add_file(path)} passage(s) added")
+    else:
+        for result in index.search(" ".join(sys.argv[2:])):
+            print(f"📄 {result['source']} (score {result['score']})\n{result['text']}\n")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
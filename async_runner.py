@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Async Crew Runner
+
+Lets an asyncio application run many crews from one event loop:
+- Crew runs are awaited, never blocking the loop; CrewAI's agent loop is
+  synchronous, so each active run occupies one worker of a shared, bounded
+  executor (not a thread per request)
+- Backpressure: at most `max_concurrent` runs execute at once, at most
+  `max_waiting` more wait in line for a slot (first come, first served),
+  and further runs are rejected with CrewOverloaded right away (e.g. to
+  answer HTTP 503)
+- Per-run timeouts and cancellation: a timed-out or cancelled run is
+  stopped at its next LLM call (CancellableLLM raises RunCancelled), so its
+  slot is freed without waiting for the remaining tasks; completed tasks stay
+  checkpointed and can be resumed. The next run of the same crew waits for
+  the stopped one to finish first
+
+Usage:
+    result = await crew.execute_async(timeout=300)
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import asyncio
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, TypeVar, Union
+from crewai.llms.base_llm import BaseLLM
+
+from llm_wrappers import DelegatingLLM
+
+
+DEFAULT_MAX_CONCURRENT = 8
+DEFAULT_MAX_WAITING = 64
+
+T = TypeVar("T")
+
+
+class RunCancelled(BaseException):
+    """Raised inside a crew run that was cancelled (a BaseException, so agents cannot swallow it)."""
+
+
+class CrewOverloaded(RuntimeError):
+    """Raised when a run is submitted while the limiter's waiting queue is full."""
+
+
+class CancellableLLM(DelegatingLLM):
+    """LLM wrapper that stops a run at its next LLM call once the run's cancel event is set."""
+
+    cancel_event: Any = None
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        if self.cancel_event.is_set():
+            raise RunCancelled("Crew run cancelled")
+        return self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                   available_functions=available_functions, from_task=from_task,
+                                   from_agent=from_agent, response_model=response_model)
+
+
+def cancellable(llm: BaseLLM, cancel_event: threading.Event) -> BaseLLM:
+    """Wrap an LLM so that setting cancel_event stops the run using it."""
+    return CancellableLLM(llm, cancel_event=cancel_event)
+
+
+def _retrieve(future: "asyncio.Future[Any]") -> None:
+    """Mark a stopped run's outcome as seen, so asyncio does not log it as never retrieved."""
+    if not future.cancelled():
+        future.exception()
+
+
+class CrewRunLimiter:
+    """Bounded admission and execution for crew runs awaited from asyncio."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_waiting: int = DEFAULT_MAX_WAITING):
+        """
+        Args:
+            max_concurrent: Runs executing at the same time (and worker threads)
+            max_waiting: Runs allowed to wait for a free slot before new runs are rejected
+        """
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="crew-async")
+        self._free = max_concurrent
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = deque()
+        self._stopping: Dict[threading.Event, Future] = {}  # cancel event → its run, still stopping
+        self._lock = threading.Lock()
+        self._counters = {"running": 0, "waiting": 0, "completed": 0, "failed": 0,
+                          "timed_out": 0, "cancelled": 0, "rejected": 0}
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    async def _acquire(self) -> None:
+        """Take a slot, waiting in line (first come, first served) if none is free."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                self._counters["running"] += 1
+                return
+            if self._counters["waiting"] >= self.max_waiting:
+                self._counters["rejected"] += 1
+                raise CrewOverloaded(f"{self.max_concurrent} crew runs active and {self.max_waiting} waiting")
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+            self._counters["waiting"] += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = (loop, waiter) in self._waiters
+                if queued:
+                    self._waiters.remove((loop, waiter))
+                    self._counters["waiting"] -= 1
+            if not queued and waiter.done() and not waiter.cancelled():
+                self._release()  # the slot was handed over as the wait was cancelled
+            raise
+
+    def _release(self) -> None:
+        """Free a slot, handing it to the longest-waiting run (on that run's event loop)."""
+        with self._lock:
+            self._counters["running"] -= 1
+            if not self._waiters:
+                self._free += 1
+                return
+            loop, waiter = self._waiters.popleft()
+            self._counters["waiting"] -= 1
+            self._counters["running"] += 1
+        loop.call_soon_threadsafe(self._grant, waiter)
+
+    def _grant(self, waiter: "asyncio.Future[None]") -> None:
+        if waiter.cancelled():
+            self._release()  # the waiting run gave up; pass the slot on
+        else:
+            waiter.set_result(None)
+
+    async def _previous_stopped(self, cancel_event: threading.Event) -> None:
+        """Wait until a timed-out or cancelled run on the same cancel event has stopped."""
+        with self._lock:
+            previous = self._stopping.get(cancel_event)
+        if previous is not None:
+            stopped = asyncio.wrap_future(previous)
+            await asyncio.wait([stopped])
+            _retrieve(stopped)
+
+    async def run(self, function: Callable[[], T], cancel_event: threading.Event,
+                  timeout: Optional[float] = None) -> T:
+        """
+        Run a blocking crew function on the executor and await its result.
+
+        On timeout or cancellation of the awaiting task, cancel_event is set
+        and the slot is held until the run has stopped at its next LLM call.
+        A new run with the same cancel_event first waits for such a run to
+        stop, then clears the event; clearing it earlier would let the old
+        run carry on.
+
+        Raises:
+            CrewOverloaded: The waiting queue is full
+            asyncio.TimeoutError: The run took longer than timeout seconds
+        """
+        await self._previous_stopped(cancel_event)
+        cancel_event.clear()
+        await self._acquire()
+        future = self.executor.submit(function)
+        awaited = asyncio.wrap_future(future)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(awaited), timeout)
+        except BaseException as e:
+            if not future.done():
+                cancel_event.set()
+                self._count("timed_out" if isinstance(e, asyncio.TimeoutError) else "cancelled")
+                awaited.add_done_callback(_retrieve)
+                with self._lock:
+                    self._stopping[cancel_event] = future
+                future.add_done_callback(functools.partial(self._release_when_stopped, cancel_event))
+            else:
+                self._count("cancelled" if isinstance(e, RunCancelled) else "failed")
+                self._release()
+            if isinstance(e, RunCancelled):
+                raise asyncio.CancelledError() from e
+            raise
+        self._count("completed")
+        self._release()
+        return result
+
+    def _release_when_stopped(self, cancel_event: threading.Event, future: Future) -> None:
+        with self._lock:
+            if self._stopping.get(cancel_event) is future:
+                del self._stopping[cancel_event]
+        self._release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+_shared_limiter: Optional[CrewRunLimiter] = None
+_shared_limiter_lock = threading.Lock()
+
+
+def shared_limiter() -> CrewRunLimiter:
+    """The process-wide limiter (CREWAI_MAX_CREWS concurrent runs, CREWAI_MAX_WAITING waiting)."""
+    global _shared_limiter
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = CrewRunLimiter(
+                max_concurrent=int(os.getenv("CREWAI_MAX_CREWS", DEFAULT_MAX_CONCURRENT)),
+                max_waiting=int(os.getenv("CREWAI_MAX_WAITING", DEFAULT_MAX_WAITING)))
+        return _shared_limiter
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Crew Orchestration Benchmarks
+
+Measures the overhead CrewAI and this repository add around LLM calls, fully
+offline, by running every example crew against the MockLLM:
+- Crew construction time
+- Per-task overhead (run time with a zero-latency LLM, divided by tasks)
+- Tool-dispatch latency (tool call emitted → LLM called again with the result)
+- Memory high-water mark (tracemalloc peak for one build + run)
+- Throughput of concurrent ContentCreationCrews at several concurrency levels
+- Async execution (execute_async on one event loop, bounded executor) against
+  one thread per crew: throughput and peak thread count
+- Process start-up: interpreter, importing the crew modules, '--help' and
+  the early exit when API keys are missing (what short-lived batch workers pay)
+
+Results can be saved as JSON and compared against a saved baseline, failing
+when any metric regresses by more than a threshold.
+
+Usage:
+    python benchmark_crews.py
+    python benchmark_crews.py --json baseline.json
+    python benchmark_crews.py --compare baseline.json --threshold 0.2
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import tempfile
+import statistics
+import tracemalloc
+import subprocess
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, "examples"))
+sys.path.insert(0, ROOT)
+
+from mock_llm import MockLLM  # noqa: E402
+
+
+TOOL_INPUTS = {
+    "calculator": {"operation": "multiply", "a": 15, "b": 3},
+    "quick_calculator": {"expression": "(15 * 3) + (20 / 4)"},
+    "text_analyzer": {"text": "CrewAI is a powerful framework for creating collaborative AI agents."},
+}
+
+# Metrics where a larger value is better; every other metric is better when smaller.
+HIGHER_IS_BETTER = ("throughput",)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the crews' verbose console output."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _basic(llm: MockLLM, workdir: str) -> Tuple[Callable[[], Any], int]:
+    from basic_crew import create_basic_crew
+    crew = create_basic_crew(llm=llm)
+    return crew.kickoff, len(crew.tasks)
+
+
+def _custom_tools(llm: MockLLM, workdir: str) -> Tuple[Callable[[], Any], int]:
+    from custom_tools import create_custom_tools_crew
+    crew = create_custom_tools_crew(llm=llm)
+    return crew.kickoff, len(crew.tasks)
+
+
+def _content(llm: MockLLM, workdir: str) -> Tuple[Callable[[], Any], int]:
+    from crewai_example import ContentCreationCrew
+    from llm_cache import ResponseCache
+    crew = ContentCreationCrew("Benchmark Topic", llm=llm, output_dir=workdir, verbose=False,
+                               response_cache=ResponseCache(os.path.join(workdir, "cache.sqlite3")),
+                               bypass_cache=True, runs_dir=os.path.join(workdir, "runs"))
+    return crew.execute, len(crew.tasks)
+
+
+def _enhanced(llm: MockLLM, workdir: str) -> Tuple[Callable[[], Any], int]:
+    from enhanced_agents_example import EnhancedAgentsExample
+    example = EnhancedAgentsExample("Benchmark Topic", output_file=os.path.join(workdir, "analysis.md"),
+                                    llm=llm, memory=False, verbose=False,
+                                    runs_dir=os.path.join(workdir, "runs"))
+    return example.execute, len(example.tasks)
+
+
+SCENARIOS: Dict[str, Callable[[MockLLM, str], Tuple[Callable[[], Any], int]]] = {
+    "basic_crew": _basic,
+    "custom_tools_crew": _custom_tools,
+    "content_creation": _content,
+    "enhanced_agents": _enhanced,
+}
+
+
+def bench_scenario(name: str, repeats: int) -> Dict[str, float]:
+    """Construction time, per-task overhead and memory peak of one example crew."""
+    build = SCENARIOS[name]
+    construct_times: List[float] = []
+    run_times: List[float] = []
+    tasks = 1
+
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as workdir, quiet():
+            llm = MockLLM(seed=1)
+            start = time.perf_counter()
+            run, tasks = build(llm, workdir)
+            construct_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            run()
+            run_times.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as workdir, quiet():
+        tracemalloc.start()
+        run, _ = build(MockLLM(seed=1), workdir)
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "construct_ms": statistics.median(construct_times) * 1000,
+        "task_overhead_ms": statistics.median(run_times) * 1000 / tasks,
+        "memory_peak_mb": peak / (1024 * 1024),
+    }
+
+
+def bench_tool_dispatch(repeats: int) -> Dict[str, float]:
+    """Round trip from a tool call being emitted to the LLM receiving its result."""
+    round_trips: List[float] = []
+    for _ in range(repeats):
+        with tempfile.TemporaryDirectory() as workdir, quiet():
+            llm = MockLLM(seed=1, tool_calls_per_task=3, tool_inputs=TOOL_INPUTS)
+            run, _ = _custom_tools(llm, workdir)
+            cwd = os.getcwd()
+            os.chdir(workdir)  # the Data Logger writes relative to the working directory
+            try:
+                run()
+            finally:
+                os.chdir(cwd)
+            round_trips.extend(llm.tool_round_trips)
+
+    if not round_trips:
+        return {"tool_dispatch_ms": float("nan")}
+    return {
+        "tool_dispatch_ms": statistics.median(round_trips) * 1000,
+        "tool_dispatch_p95_ms": sorted(round_trips)[int(len(round_trips) * 0.95)] * 1000,
+    }
+
+
+def bench_throughput(levels: List[int], latency: float, jobs_per_worker: int) -> Dict[str, float]:
+    """Completed ContentCreationCrews per second at each concurrency level."""
+    results = {}
+    for concurrency in levels:
+        jobs = concurrency * jobs_per_worker
+        with tempfile.TemporaryDirectory() as workdir, quiet():
+            llm = MockLLM(seed=1, latency=latency)
+
+            def job(index: int) -> None:
+                run, _ = _content(llm, os.path.join(workdir, f"job-{index}"))
+                run()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(job, range(jobs)))
+            elapsed = time.perf_counter() - start
+        results[f"throughput_c{concurrency}_crews_per_s"] = jobs / elapsed
+    return results
+
+
+@contextlib.contextmanager
+def peak_threads(result: Dict[str, int]):
+    """Sample the number of live threads while the block runs; result["peak"] gets the maximum."""
+    result["peak"] = threading.active_count()
+    done = threading.Event()
+
+    def sample() -> None:
+        while not done.wait(0.005):
+            result["peak"] = max(result["peak"], threading.active_count())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield result
+    finally:
+        done.set()
+        sampler.join()
+
+
+def bench_async(levels: List[int], latency: float, jobs_per_worker: int) -> Dict[str, float]:
+    """execute_async() on one event loop against one thread per crew, at each concurrency level."""
+    from async_runner import CrewRunLimiter
+    from crewai_example import ContentCreationCrew
+    from llm_cache import ResponseCache
+
+    def make_crew(llm: MockLLM, workdir: str, index: int) -> ContentCreationCrew:
+        directory = os.path.join(workdir, f"job-{index}")
+        return ContentCreationCrew("Benchmark Topic", llm=llm, output_dir=directory, verbose=False,
+                                   response_cache=ResponseCache(os.path.join(directory, "cache.sqlite3")),
+                                   bypass_cache=True, runs_dir=os.path.join(directory, "runs"))
+
+    results = {}
+    for concurrency in levels:
+        jobs = concurrency * jobs_per_worker
+
+        with tempfile.TemporaryDirectory() as workdir, quiet():
+            llm = MockLLM(seed=1, latency=latency)
+            crews = [make_crew(llm, workdir, index) for index in range(jobs)]
+            threads = [threading.Thread(target=crew.execute) for crew in crews]
+            with peak_threads({}) as peak:
+                start = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - start
+        results[f"throughput_threads_c{concurrency}_crews_per_s"] = jobs / elapsed
+        results[f"threads_per_crew_c{concurrency}_peak_threads"] = peak["peak"]
+
+        with tempfile.TemporaryDirectory() as workdir, quiet():
+            llm = MockLLM(seed=1, latency=latency)
+            crews = [make_crew(llm, workdir, index) for index in range(jobs)]
+            limiter = CrewRunLimiter(max_concurrent=concurrency, max_waiting=jobs)
+
+            async def run_all() -> None:
+                await asyncio.gather(*(crew.execute_async(limiter=limiter) for crew in crews))
+
+            with peak_threads({}) as peak:
+                start = time.perf_counter()
+                asyncio.run(run_all())
+                elapsed = time.perf_counter() - start
+            limiter.executor.shutdown()
+        results[f"throughput_async_c{concurrency}_crews_per_s"] = jobs / elapsed
+        results[f"async_c{concurrency}_peak_threads"] = peak["peak"]
+    return results
+
+
+STARTUP_COMMANDS = {
+    "interpreter": ["-c", "pass"],
+    "import_crewai_example": ["-c", "import crewai_example"],
+    "import_enhanced_agents": ["-c", "import enhanced_agents_example"],
+    "crewai_example_help": ["crewai_example.py", "--help"],
+    "enhanced_agents_no_key_exit": ["enhanced_agents_example.py"],
+}
+
+
+def bench_startup(runs: int) -> Dict[str, float]:
+    """Median wall time of fresh Python processes doing nothing but start up."""
+    env = {key: value for key, value in os.environ.items() if key not in ("OPENAI_API_KEY", "SERPER_API_KEY")}
+    results = {}
+    for name, arguments in STARTUP_COMMANDS.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *arguments], cwd=ROOT, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        results[f"startup.{name}_ms"] = statistics.median(times) * 1000
+    return results
+
+
+def run_benchmarks(repeats: int, levels: List[int], latency: float, jobs_per_worker: int,
+                   scenarios: Optional[List[str]] = None, startup_runs: int = 5) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    if startup_runs:
+        print("⏱️  start-up...")
+        results.update(bench_startup(startup_runs))
+
+    for name in scenarios or list(SCENARIOS):
+        print(f"⏱️  {name}...")
+        for metric, value in bench_scenario(name, repeats).items():
+            results[f"{name}.{metric}"] = value
+
+    print("⏱️  tool dispatch...")
+    results.update(bench_tool_dispatch(repeats))
+
+    print(f"⏱️  throughput at concurrency {levels}...")
+    results.update(bench_throughput(levels, latency, jobs_per_worker))
+
+    print(f"⏱️  async vs thread-per-crew at concurrency {levels}...")
+    results.update(bench_async(levels, latency, jobs_per_worker))
+    return results
+
+
+def print_results(results: Dict[str, float], baseline: Optional[Dict[str, float]] = None) -> None:
+    print("\n📊 Benchmark Results")
+    print("-" * 78)
+    header = f"{'Metric':<52} {'Value':>10}"
+    print(header + (f" {'Baseline':>10}" if baseline else ""))
+    for metric, value in results.items():
+        line = f"{metric:<52} {value:>10.2f}"
+        if baseline and metric in baseline:
+            line += f" {baseline[metric]:>10.2f}"
+        print(line)
+
+
+def find_regressions(results: Dict[str, float], baseline: Dict[str, float],
+                     threshold: float) -> List[str]:
+    """Metrics that got worse than the baseline by more than threshold (a fraction)."""
+    regressions = []
+    for metric, value in results.items():
+        previous = baseline.get(metric)
+        if not previous or value != value:  # missing, zero or NaN
+            continue
+        change = (value - previous) / previous
+        if any(key in metric for key in HIGHER_IS_BETTER):
+            change = -change
+        if change > threshold:
+            regressions.append(f"{metric}: {previous:.2f} → {value:.2f} ({change:+.0%} worse)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline orchestration benchmarks for the example crews")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per scenario")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="Only run these scenarios")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Concurrency levels for the throughput benchmark")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock LLM latency per call (throughput)")
+    parser.add_argument("--jobs-per-worker", type=int, default=2, help="Crews per worker (throughput)")
+    parser.add_argument("--startup-runs", type=int, default=5, help="Processes per start-up measurement (0 skips)")
+    parser.add_argument("--json", metavar="PATH", help="Write results to a JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare with a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression (fraction)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeats, args.concurrency, args.latency, args.jobs_per_worker, args.scenario,
+                             args.startup_runs)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.json}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions above {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Task Checkpoints
+
+Durable checkpoints for sequential crews:
+- Every completed task output is written to a run directory, keyed by the
+  run ID and a fingerprint of the task
+- On resume, tasks with a stored output are skipped and their outputs are
+  fed to downstream tasks as context
+
+Layout of a run directory:
+
+    .crewai_runs/<run_id>/
+        <task fingerprint>.json     # one file per completed task
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+from typing import Any, Callable, Dict, List, Optional
+from crewai import Task, TaskOutput
+
+
+DEFAULT_RUNS_DIR = ".crewai_runs"
+
+
+def default_run_id(*parts: str) -> str:
+    """Stable, readable run ID derived from the run's inputs (e.g. topic and output file)."""
+    digest = hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()[:10]
+    slug = re.sub(r"[^a-z0-9]+", "-", parts[0].lower()).strip("-")[:40] if parts else "run"
+    return f"{slug}-{digest}"
+
+
+def context_tasks(task: Task) -> List[Task]:
+    """The tasks listed in a task's `context` (an unset context means none)."""
+    context = task.context
+    return [t for t in context if isinstance(t, Task)] if isinstance(context, list) else []
+
+
+def task_fingerprint(task: Task) -> str:
+    """
+    Fingerprint of everything that determines a task's output.
+
+    Covers the description, expected output, the agent's role/goal/backstory,
+    and (recursively) the fingerprints of its context tasks, so changing an
+    upstream task invalidates every checkpoint downstream of it.
+    """
+    agent = task.agent
+    payload = {
+        "description": task.description,
+        "expected_output": task.expected_output,
+        "role": getattr(agent, "role", None),
+        "goal": getattr(agent, "goal", None),
+        "backstory": getattr(agent, "backstory", None),
+        "context": [task_fingerprint(context_task) for context_task in context_tasks(task)],
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class _SaveCheckpoint:
+    """Task callback that checkpoints the output, then runs the task's own callback."""
+
+    def __init__(self, checkpoint: "RunCheckpoint", task: Task, fingerprint: str,
+                 callback: Optional[Callable[[TaskOutput], Any]]):
+        self.checkpoint = checkpoint
+        self.task = task
+        self.fingerprint = fingerprint
+        self.callback = callback
+
+    def __call__(self, output: TaskOutput) -> Any:
+        self.checkpoint.save(self.fingerprint, self.task, output)
+        if self.callback is not None:
+            return self.callback(output)
+
+
+class RunCheckpoint:
+    """Stores completed task outputs for one run."""
+
+    def __init__(self, run_id: str, root: str = DEFAULT_RUNS_DIR):
+        """
+        Args:
+            run_id: Identifier of the run (reuse it to resume)
+            root: Directory holding all run directories
+        """
+        self.run_id = run_id
+        self.directory = os.path.join(root, run_id)
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.json")
+
+    def load(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record for a task fingerprint, if any."""
+        try:
+            with open(self._path(fingerprint), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, fingerprint: str, task: Task, output: TaskOutput) -> None:
+        """Durably store a task output (written to a temp file, fsynced, then renamed)."""
+        os.makedirs(self.directory, exist_ok=True)
+        record = {
+            "run_id": self.run_id,
+            "fingerprint": fingerprint,
+            "description": task.description,
+            "expected_output": task.expected_output,
+            "agent": getattr(task.agent, "role", None),
+            "raw": output.raw,
+            "saved_at": time.time(),
+        }
+        path = self._path(fingerprint)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Delete every checkpoint of this run."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def attach(self, tasks: List[Task]) -> None:
+        """Make every task checkpoint its output as soon as it completes."""
+        for task in tasks:
+            if isinstance(task.callback, _SaveCheckpoint):
+                continue
+            task.callback = _SaveCheckpoint(self, task, task_fingerprint(task), task.callback)
+
+    def restore(self, tasks: List[Task]) -> List[Task]:
+        """
+        Restore stored outputs onto completed tasks.
+
+        Restored tasks get their `output` set, so tasks listing them in
+        `context` receive the stored output exactly as if it had just run.
+
+        Returns:
+            List[Task]: The tasks that still have to run, in order
+        """
+        pending = []
+        pending_ids = set()
+        for task in tasks:
+            # A task whose context has to be re-run must be re-run as well.
+            upstream_pending = any(id(context_task) in pending_ids for context_task in context_tasks(task))
+            record = None if upstream_pending else self.load(task_fingerprint(task))
+            if record is None:
+                pending.append(task)
+                pending_ids.add(id(task))
+                continue
+            task.output = TaskOutput(
+                description=task.description,
+                expected_output=task.expected_output,
+                raw=record["raw"],
+                agent=record["agent"] or "",
+            )
+        return pending
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Context Compaction
+
+Shrinks the context a task receives from its upstream tasks:
+- Upstream outputs are split into markdown sections
+- Sections are ranked against the task (description and expected output)
+  with BM25, headings weighted higher than body text
+- The best sections are kept, in their original order, until the task's
+  token budget is used up; the rest are replaced by a short omission note
+- Compacted contexts are cached, so re-running or resuming a pipeline does
+  not redo the work
+
+Task definitions stay unchanged: the compactor plugs into the DAG scheduler
+as its context builder, or wraps task execution for sequential crews.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import re
+import math
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from crewai import Task
+
+from checkpoint import context_tasks
+from tool_wrappers import wrap_method
+from tracing import CHARS_PER_TOKEN, annotate, estimate_tokens
+
+
+DIVIDER = "\n\n----------\n\n"
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+\S", re.MULTILINE)
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the this to with "
+    "your you will should include including based provide each all their which".split()
+)
+HEADING_WEIGHT = 3
+MIN_TRUNCATED_TOKENS = 64
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens without stopwords."""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split markdown into (heading, body) sections.
+
+    Text before the first heading becomes a section with an empty heading.
+    Text without headings is split into paragraphs instead.
+    """
+    starts = [match.start() for match in HEADING_PATTERN.finditer(text)]
+    if not starts:
+        return [("", paragraph.strip()) for paragraph in re.split(r"\n\s*\n", text) if paragraph.strip()]
+
+    sections = []
+    if text[:starts[0]].strip():
+        sections.append(("", text[:starts[0]].strip()))
+    for start, end in zip(starts, starts[1:] + [len(text)]):
+        heading, _, body = text[start:end].strip().partition("\n")
+        sections.append((heading.strip(), body.strip()))
+    return sections
+
+
+def bm25_scores(query: List[str], documents: List[List[str]], k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """Okapi BM25 score of every document for the query."""
+    if not documents:
+        return []
+    average_length = sum(len(document) for document in documents) / len(documents) or 1.0
+    document_frequency = Counter(word for document in documents for word in set(document))
+    count = len(documents)
+    query_terms = set(query)
+
+    scores = []
+    for document in documents:
+        frequencies = Counter(document)
+        norm = k1 * (1 - b + b * len(document) / average_length)
+        score = 0.0
+        for term in query_terms:
+            frequency = frequencies.get(term)
+            if frequency:
+                idf = math.log(1 + (count - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+                score += idf * frequency * (k1 + 1) / (frequency + norm)
+        scores.append(score)
+    return scores
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text to about max_tokens, at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > 0 else limit].rstrip() + " …"
+
+
+class ContextCompactor:
+    """
+    Builds token-budgeted task contexts from upstream outputs.
+
+    Usable directly as a DagScheduler context builder
+    (`DagScheduler(tasks, context_builder=compactor)`), or attached to the
+    tasks of a sequential crew with `attach()`.
+    """
+
+    def __init__(self, budget: int = 1500, budgets: Optional[Dict[str, int]] = None, cache_size: int = 256):
+        """
+        Args:
+            budget: Default context budget in (estimated) tokens
+            budgets: Per-task budgets, keyed by task name or agent role
+            cache_size: Number of compacted contexts kept in memory
+        """
+        self.budget = budget
+        self.budgets = budgets or {}
+        self.cache_size = cache_size
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def budget_for(self, task: Task) -> int:
+        """The token budget of a task (by name, then agent role, then the default)."""
+        for key in (getattr(task, "name", None), getattr(task.agent, "role", None)):
+            if key and key in self.budgets:
+                return self.budgets[key]
+        return self.budget
+
+    def __call__(self, task: Task, upstream: List[Task]) -> str:
+        outputs = [context_task.output.raw for context_task in upstream if context_task.output is not None]
+        return self.compact(task, outputs) if outputs else ""
+
+    def compact(self, task: Task, outputs: List[str]) -> str:
+        """
+        Compact upstream outputs into the context string for a task.
+
+        Args:
+            task: Task that will receive the context
+            outputs: Raw outputs of its upstream tasks, in context order
+
+        Returns:
+            str: Outputs joined by CrewAI's divider, unchanged if they fit the budget
+        """
+        budget = self.budget_for(task)
+        full = DIVIDER.join(outputs)
+        full_tokens = estimate_tokens(full)
+        query = f"{task.description}\n{task.expected_output}"
+        key = hashlib.sha256("\x00".join([str(budget), query, *outputs]).encode("utf-8")).hexdigest()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+        if cached is None:
+            cached = full if full_tokens <= budget else self._select(query, outputs, budget)
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = cached
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        compacted_tokens = estimate_tokens(cached)
+        with self._lock:
+            self.tokens_before += full_tokens
+            self.tokens_after += compacted_tokens
+        annotate(context_tokens_before=full_tokens, context_tokens_after=compacted_tokens)
+        return cached
+
+    def _select(self, query: str, outputs: List[str], budget: int) -> str:
+        sections = [(index, heading, body) for index, output in enumerate(outputs)
+                    for heading, body in split_sections(output)]
+        documents = [tokenize(heading) * HEADING_WEIGHT + tokenize(body) for _, heading, body in sections]
+        scores = bm25_scores(tokenize(query), documents)
+
+        chosen: Dict[int, str] = {}
+        remaining = budget
+        for position in sorted(range(len(sections)), key=lambda i: (-scores[i], i)):
+            _, heading, body = sections[position]
+            text = f"{heading}\n{body}".strip()
+            cost = estimate_tokens(text)
+            if cost <= remaining:
+                chosen[position] = text
+                remaining -= cost
+            elif remaining >= MIN_TRUNCATED_TOKENS:
+                chosen[position] = _truncate(text, remaining)
+                remaining = 0
+
+        parts = []
+        for index in range(len(outputs)):
+            positions = [p for p in range(len(sections)) if sections[p][0] == index]
+            kept = [chosen[p] for p in positions if p in chosen]
+            omitted = len(positions) - len(kept)
+            if omitted:
+                kept.append(f"[{omitted} less relevant section(s) omitted]")
+            parts.append("\n\n".join(kept))
+        return DIVIDER.join(parts)
+
+    def attach(self, tasks: List[Task]) -> List[Task]:
+        """
+        Make sequential crews pass compacted context to the given tasks (in place).
+
+        The context CrewAI builds from a task's `context=[...]` is replaced by
+        the compacted one; tasks without explicit context tasks are unchanged.
+        """
+        for task in tasks:
+            if context_tasks(task):
+                wrap_method(task, "execute_sync", self._compacting(task), tag="context_compaction")
+        return tasks
+
+    def _compacting(self, task: Task):
+        def decorator(execute_sync):
+            def execute(*args: Any, **kwargs: Any) -> Any:
+                upstream = context_tasks(task)
+                if "context" in kwargs and all(context_task.output is not None for context_task in upstream):
+                    kwargs["context"] = self(task, upstream)
+                return execute_sync(*args, **kwargs)
+            return execute
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        """Token totals before and after compaction, and cache counters."""
+        with self._lock:
+            return {
+                "tokens_before": self.tokens_before,
+                "tokens_after": self.tokens_after,
+                "saved": round(1 - self.tokens_after / self.tokens_before, 3) if self.tokens_before else 0.0,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Crew Service
+
+Runs ContentCreationCrew and EnhancedAgentsExample jobs in one long-lived
+process instead of a cold process per run:
+- Warm pool: CrewAI, the crew specs, tools, LLMs and agents are built once
+  at start-up; each job retargets an idle warm crew to its topic, so only
+  the tasks are built per job
+- Jobs are scheduled from a priority queue (higher priority first, FIFO
+  within a priority) onto at most `concurrency` workers; once `max_queued`
+  jobs are waiting, new jobs are rejected with CrewOverloaded (HTTP 503)
+- Every job records its queue wait and execution time, and /stats reports
+  their percentiles separately, so queueing delay is visible apart from
+  crew run time
+- Jobs are accepted over local HTTP (127.0.0.1 by default)
+
+Usage:
+    python crew_service.py --port 8765 --concurrency 4
+    curl -X POST localhost:8765/jobs -d '{"kind": "content", "topic": "Edge AI", "priority": 5}'
+    curl localhost:8765/jobs/<id>
+    curl localhost:8765/stats
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import uuid
+import argparse
+import itertools
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from async_runner import CrewOverloaded
+from crewai_example import ContentCreationCrew
+from enhanced_agents_example import EnhancedAgentsExample
+
+
+JOB_KINDS = ("content", "enhanced")
+DEFAULT_PORT = 8765
+MAX_FINISHED_JOBS = 1000
+TIMING_WINDOW = 1000
+
+
+@dataclass
+class Job:
+    """One crew run submitted to the service."""
+
+    id: str
+    kind: str
+    topic: str
+    priority: int = 0
+    status: str = "queued"  # queued, running, done, failed
+    result: Optional[str] = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.monotonic)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        return None if self.started is None else self.started - self.submitted
+
+    @property
+    def execution(self) -> Optional[float]:
+        return None if self.finished is None else self.finished - self.started
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id, "kind": self.kind, "topic": self.topic, "priority": self.priority,
+            "status": self.status, "result": self.result, "error": self.error,
+            "queue_wait_s": None if self.queue_wait is None else round(self.queue_wait, 3),
+            "execution_s": None if self.execution is None else round(self.execution, 3),
+        }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _summary(values: Deque[float]) -> Dict[str, float]:
+    values = list(values)
+    if not values:
+        return {"count": 0}
+    return {"count": len(values), "mean_s": round(sum(values) / len(values), 3),
+            "p50_s": round(_percentile(values, 0.5), 3), "p95_s": round(_percentile(values, 0.95), 3)}
+
+
+class CrewService:
+    """Priority-scheduled crew jobs on a bounded set of workers with warm crews."""
+
+    def __init__(self, concurrency: int = 2, max_queued: int = 100, kinds: Tuple[str, ...] = JOB_KINDS,
+                 output_root: str = "service_runs", llm: Optional[Any] = None):
+        """
+        Args:
+            concurrency: Jobs running at the same time (warm crews built per kind)
+            max_queued: Jobs allowed to wait before new jobs are rejected
+            kinds: Job kinds to serve ("content": ContentCreationCrew,
+                "enhanced": EnhancedAgentsExample)
+            output_root: Directory receiving one sub-directory per job
+            llm: LLM used by every agent (defaults to CrewAI's default model)
+        """
+        unknown = set(kinds) - set(JOB_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown job kind(s) {sorted(unknown)}. Use {', '.join(JOB_KINDS)}.")
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.kinds = tuple(kinds)
+        self.output_root = output_root
+        self.llm = llm
+        self._queue: "queue.PriorityQueue[Tuple[int, int, Optional[Job]]]" = queue.PriorityQueue()
+        self._order = itertools.count()
+        self._warm: Dict[str, "queue.Queue[Any]"] = {kind: queue.Queue() for kind in self.kinds}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._counters = {"queued": 0, "running": 0, "done": 0, "failed": 0, "rejected": 0}
+        self._queue_waits: Deque[float] = deque(maxlen=TIMING_WINDOW)
+        self._executions: Deque[float] = deque(maxlen=TIMING_WINDOW)
+
+    def _new_crew(self, kind: str) -> Any:
+        if kind == "content":
+            return ContentCreationCrew("warm-up", llm=self.llm, verbose=False)
+        return EnhancedAgentsExample("warm-up", llm=self.llm, verbose=False)
+
+    def start(self) -> "CrewService":
+        """Build the warm crews and start the workers."""
+        os.makedirs(self.output_root, exist_ok=True)
+        start = time.perf_counter()
+        for kind in self.kinds:
+            for _ in range(self.concurrency):
+                self._warm[kind].put(self._new_crew(kind).build())
+        print(f"🔥 Warmed {self.concurrency} crew(s) per kind ({', '.join(self.kinds)}) "
+              f"in {time.perf_counter() - start:.1f}s")
+        for index in range(self.concurrency):
+            worker = threading.Thread(target=self._work, name=f"crew-service-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        return self
+
+    def stop(self) -> None:
+        """Stop the workers once every job queued so far has run."""
+        for _ in self._workers:
+            self._queue.put((sys.maxsize, next(self._order), None))
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+
+    def submit(self, kind: str, topic: str, priority: int = 0) -> Job:
+        """
+        Queue a job; jobs with a higher priority run first.
+
+        Raises:
+            ValueError: Unknown or unserved job kind, or empty topic
+            CrewOverloaded: max_queued jobs are already waiting
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown job kind '{kind}'. Use one of {', '.join(self.kinds)}.")
+        if not topic or not topic.strip():
+            raise ValueError("A job needs a topic")
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, topic=topic.strip(), priority=priority)
+        with self._lock:
+            if self._counters["queued"] >= self.max_queued:
+                self._counters["rejected"] += 1
+                raise CrewOverloaded(f"{self.max_queued} jobs already queued")
+            self._counters["queued"] += 1
+            self._jobs[job.id] = job
+            self._queue.put((-priority, next(self._order), job))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self) -> None:
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            crew = self._warm[job.kind].get()
+            with self._lock:
+                self._counters["queued"] -= 1
+                self._counters["running"] += 1
+            job.started = time.monotonic()
+            job.status = "running"
+            try:
+                job.result = str(self._run(crew, job))
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished = time.monotonic()
+                self._warm[job.kind].put(crew)
+                self._finish(job)
+
+    def _run(self, crew: Any, job: Job) -> Any:
+        """Retarget a warm crew to the job and execute it."""
+        output_dir = os.path.join(self.output_root, job.id)
+        output_file = "article.md" if job.kind == "content" else "analysis.md"
+        crew.retarget(job.topic, output_file=output_file, output_dir=output_dir, run_id=job.id)
+        return crew.execute()
+
+    def _finish(self, job: Job) -> None:
+        with self._lock:
+            self._counters["running"] -= 1
+            self._counters[job.status] += 1
+            self._queue_waits.append(job.queue_wait)
+            self._executions.append(job.execution)
+            finished = [job_id for job_id, other in self._jobs.items() if other.finished is not None]
+            for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self._jobs[job_id]
+        job.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counters and queue-wait / execution-time percentiles of recent jobs."""
+        with self._lock:
+            return {**self._counters, "concurrency": self.concurrency,
+                    "queue_wait": _summary(self._queue_waits), "execution": _summary(self._executions)}
+
+
+class CrewServiceServer:
+    """
+    HTTP intake for a CrewService:
+
+        POST /jobs       {"kind", "topic", "priority"?, "wait"?} → 202 (200 with wait: true)
+        GET  /jobs/<id>  → the job's status, result and timings
+        GET  /stats      → CrewService.stats()
+    """
+
+    def __init__(self, service: CrewService, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/jobs":
+                    return self._reply(404, {"error": "not found"})
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    job = service.submit(body.get("kind", "content"), body.get("topic", ""),
+                                         int(body.get("priority", 0)))
+                except CrewOverloaded as e:
+                    return self._reply(503, {"error": str(e)}, {"Retry-After": "5"})
+                except (ValueError, TypeError, AttributeError) as e:
+                    return self._reply(400, {"error": str(e)})
+                if body.get("wait"):
+                    job.done.wait()
+                    return self._reply(200, job.to_dict())
+                self._reply(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+            def do_GET(self):
+                path = self.path.rstrip("/")
+                if path == "/stats":
+                    return self._reply(200, service.stats())
+                job = service.get(path[len("/jobs/"):]) if path.startswith("/jobs/") else None
+                if job is None:
+                    return self._reply(404, {"error": "not found"})
+                self._reply(200, job.to_dict())
+
+            def log_message(self, format, *args):
+                pass
+
+        self.service = service
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "CrewServiceServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    """Run the crew service until interrupted."""
+    parser = argparse.ArgumentParser(description="Long-lived CrewAI service with warm crews and a job queue")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs running at the same time")
+    parser.add_argument("--max-queued", type=int, default=100, help="Waiting jobs before new jobs get 503")
+    parser.add_argument("--kinds", nargs="+", choices=JOB_KINDS, default=list(JOB_KINDS), help="Job kinds to serve")
+    parser.add_argument("--output-root", default="service_runs", help="Directory for per-job output")
+    parser.add_argument("--mock", action="store_true", help="Serve with the offline MockLLM (no API keys needed)")
+    args = parser.parse_args()
+
+    llm = None
+    if args.mock:
+        from mock_llm import MockLLM
+        llm = MockLLM()
+    elif not os.getenv('OPENAI_API_KEY'):
+        print("⚠️  Warning: OPENAI_API_KEY not set. Please set your OpenAI API key (or use --mock).")
+        return
+
+    service = CrewService(concurrency=args.concurrency, max_queued=args.max_queued, kinds=tuple(args.kinds),
+                          output_root=args.output_root, llm=llm).start()
+    with CrewServiceServer(service, args.host, args.port) as server:
+        print(f"🛰️  Crew service listening on {server.url} (POST /jobs, GET /jobs/<id>, GET /stats)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping crew service")
+    service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Declarative Crew Specs
+
+Agents, tasks and crew options described in YAML or JSON instead of Python:
+- A spec is validated and compiled once into a CrewTemplate: every prompt
+  string is interned and pre-split into literal text and {placeholders}
+- Compiled templates are cached by the SHA-256 of the spec file, so loading
+  the same spec again (from any path, in any crew) costs a stat() call
+- Instantiating a template for a new topic only substitutes parameters into
+  the pre-split prompts before creating the CrewAI objects
+
+Spec format (placeholders are the template's declared params):
+
+    params: [topic, output_file]
+    crew:                       # optional Crew options
+      process: sequential
+    agents:
+      researcher:
+        role: Research Specialist
+        goal: ...
+        backstory: ...
+        tools: [web_search]     # keys of the tools dict passed in
+    tasks:
+      - name: research
+        agent: researcher
+        description: Research {topic} ...
+        expected_output: ...
+        context: []             # names of earlier tasks
+
+Usage:
+    python crew_spec.py crews/*.yaml    # validate specs
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import sys
+import json
+import string
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from crewai import Agent, Task, Crew
+
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crews")
+
+SPEC_KEYS = frozenset({"name", "params", "crew", "agents", "tasks"})
+AGENT_KEYS = frozenset({"role", "goal", "backstory", "tools", "allow_delegation", "max_iter"})
+TASK_KEYS = frozenset({"name", "agent", "description", "expected_output", "context"})
+CREW_KEYS = frozenset({"process", "memory", "cache"})
+PROCESSES = ("sequential", "hierarchical")
+
+_formatter = string.Formatter()
+
+
+class CrewSpecError(ValueError):
+    """A crew spec that cannot be compiled."""
+
+
+class PromptTemplate:
+    """A prompt string pre-split into interned literal text and named placeholders."""
+
+    __slots__ = ("text", "fields", "_pieces", "_static")
+
+    def __init__(self, text: str, where: str):
+        self.text = sys.intern(text)
+        pieces: List[Tuple[str, Optional[str]]] = []
+        try:
+            for literal, field, spec, conversion in _formatter.parse(text):
+                if field is not None and (not field.isidentifier() or spec or conversion):
+                    raise CrewSpecError(f"{where}: unsupported placeholder '{{{field}}}' "
+                                        "(use '{name}', or '{{' and '}}' for literal braces)")
+                pieces.append((sys.intern(literal), sys.intern(field) if field is not None else None))
+        except ValueError as e:
+            if isinstance(e, CrewSpecError):
+                raise
+            raise CrewSpecError(f"{where}: {e}") from None
+        self._pieces = tuple(pieces)
+        self.fields: FrozenSet[str] = frozenset(field for _, field in pieces if field is not None)
+        self._static = None if self.fields else sys.intern("".join(literal for literal, _ in pieces))
+
+    def render(self, params: Dict[str, str]) -> str:
+        """The prompt with every placeholder replaced (static prompts are returned as-is)."""
+        if self._static is not None:
+            return self._static
+        return "".join(literal + params[field] if field is not None else literal
+                       for literal, field in self._pieces)
+
+
+@dataclass(frozen=True)
+class AgentTemplate:
+    """Compiled agent definition."""
+
+    name: str
+    role: PromptTemplate
+    goal: PromptTemplate
+    backstory: PromptTemplate
+    tools: Tuple[str, ...]
+    options: Tuple[Tuple[str, Any], ...]
+
+
+@dataclass(frozen=True)
+class TaskTemplate:
+    """Compiled task definition; context lists indices of earlier tasks."""
+
+    name: str
+    agent: str
+    description: PromptTemplate
+    expected_output: PromptTemplate
+    context: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class CrewTemplate:
+    """A validated crew spec, instantiated with create_agents(), create_tasks() and create_crew()."""
+
+    name: str
+    digest: str
+    params: FrozenSet[str]
+    agents: Tuple[AgentTemplate, ...]
+    tasks: Tuple[TaskTemplate, ...]
+    crew_options: Tuple[Tuple[str, Any], ...]
+
+    @property
+    def tool_names(self) -> FrozenSet[str]:
+        return frozenset(tool for agent in self.agents for tool in agent.tools)
+
+    @property
+    def agent_params(self) -> FrozenSet[str]:
+        return frozenset().union(*(prompt.fields for agent in self.agents
+                                   for prompt in (agent.role, agent.goal, agent.backstory)))
+
+    @property
+    def task_params(self) -> FrozenSet[str]:
+        return frozenset().union(*(prompt.fields for task in self.tasks
+                                   for prompt in (task.description, task.expected_output)))
+
+    def _params(self, params: Dict[str, Any], required: FrozenSet[str]) -> Dict[str, str]:
+        missing = required.difference(params)
+        if missing:
+            raise CrewSpecError(f"Crew '{self.name}' is missing parameter(s): {', '.join(sorted(missing))}")
+        return {name: str(params[name]) for name in required}
+
+    def create_agents(self, tools: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None,
+                      **agent_options: Any) -> Dict[str, Agent]:
+        """
+        Create one Agent per agent definition.
+
+        Args:
+            tools: Tool instances by the names used in the spec
+            params: Values for the template's placeholders
+            **agent_options: Extra Agent arguments for every agent (llm, verbose, ...)
+
+        Returns:
+            Dict[str, Agent]: Agents by name, in spec order
+        """
+        tools = tools or {}
+        missing = self.tool_names.difference(tools)
+        if missing:
+            raise CrewSpecError(f"Crew '{self.name}' needs tool(s): {', '.join(sorted(missing))}")
+        values = self._params(params or {}, self.agent_params)
+        return {
+            agent.name: Agent(
+                role=agent.role.render(values),
+                goal=agent.goal.render(values),
+                backstory=agent.backstory.render(values),
+                tools=[tools[tool] for tool in agent.tools],
+                **{**dict(agent.options), **agent_options}
+            )
+            for agent in self.agents
+        }
+
+    def create_tasks(self, agents: Dict[str, Agent], params: Optional[Dict[str, Any]] = None) -> List[Task]:
+        """Create the tasks, in spec order, assigned to the given agents."""
+        values = self._params(params or {}, self.task_params)
+        tasks: List[Task] = []
+        for task in self.tasks:
+            options: Dict[str, Any] = {"context": [tasks[index] for index in task.context]} if task.context else {}
+            tasks.append(Task(
+                name=task.name,
+                description=task.description.render(values),
+                expected_output=task.expected_output.render(values),
+                agent=agents[task.agent],
+                **options
+            ))
+        return tasks
+
+    def create_crew(self, agents: Dict[str, Agent], tasks: List[Task], **crew_options: Any) -> Crew:
+        """Create the Crew; keyword arguments override the spec's crew options."""
+        return Crew(agents=list(agents.values()), tasks=tasks, **{**dict(self.crew_options), **crew_options})
+
+
+def _require_text(mapping: Dict[str, Any], key: str, where: str) -> str:
+    value = mapping.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise CrewSpecError(f"{where}: '{key}' must be a non-empty string")
+    return value.strip()
+
+
+def _check_keys(mapping: Any, allowed: FrozenSet[str], where: str) -> None:
+    if not isinstance(mapping, dict):
+        raise CrewSpecError(f"{where}: expected a mapping")
+    unknown = set(mapping).difference(allowed)
+    if unknown:
+        raise CrewSpecError(f"{where}: unknown key(s) {', '.join(sorted(unknown))}")
+
+
+def _prompt(mapping: Dict[str, Any], key: str, where: str, params: FrozenSet[str]) -> PromptTemplate:
+    prompt = PromptTemplate(_require_text(mapping, key, where), f"{where}.{key}")
+    undeclared = prompt.fields.difference(params)
+    if undeclared:
+        raise CrewSpecError(f"{where}.{key}: undeclared parameter(s) {', '.join(sorted(undeclared))}")
+    return prompt
+
+
+def compile_spec(spec: Dict[str, Any], source: str = "<spec>", digest: str = "") -> CrewTemplate:
+    """
+    Validate a parsed spec and compile it into a CrewTemplate.
+
+    Args:
+        spec: Parsed YAML/JSON document
+        source: Name used in error messages (usually the file path)
+        digest: Content hash of the spec (computed from the spec when empty)
+
+    Raises:
+        CrewSpecError: If the spec is malformed or inconsistent
+    """
+    _check_keys(spec, SPEC_KEYS, source)
+    params = spec.get("params") or []
+    if not isinstance(params, list) or not all(isinstance(p, str) and p.isidentifier() for p in params):
+        raise CrewSpecError(f"{source}: 'params' must be a list of identifiers")
+    declared = frozenset(sys.intern(p) for p in params)
+
+    crew_options = spec.get("crew") or {}
+    _check_keys(crew_options, CREW_KEYS, f"{source}.crew")
+    if crew_options.get("process", "sequential") not in PROCESSES:
+        raise CrewSpecError(f"{source}.crew: unknown process '{crew_options['process']}'. "
+                            f"Use one of {', '.join(PROCESSES)}.")
+    crew_options = {"process": "sequential", **crew_options}
+
+    agent_specs = spec.get("agents")
+    if not isinstance(agent_specs, dict) or not agent_specs:
+        raise CrewSpecError(f"{source}: 'agents' must be a non-empty mapping")
+    agents = []
+    for name, agent in agent_specs.items():
+        where = f"{source}.agents.{name}"
+        _check_keys(agent, AGENT_KEYS, where)
+        tools = agent.get("tools") or []
+        if not isinstance(tools, list) or not all(isinstance(tool, str) for tool in tools):
+            raise CrewSpecError(f"{where}: 'tools' must be a list of tool names")
+        options = tuple((key, agent[key]) for key in ("allow_delegation", "max_iter") if key in agent)
+        agents.append(AgentTemplate(
+            name=sys.intern(name),
+            role=_prompt(agent, "role", where, declared),
+            goal=_prompt(agent, "goal", where, declared),
+            backstory=_prompt(agent, "backstory", where, declared),
+            tools=tuple(sys.intern(tool) for tool in tools),
+            options=options,
+        ))
+
+    task_specs = spec.get("tasks")
+    if not isinstance(task_specs, list) or not task_specs:
+        raise CrewSpecError(f"{source}: 'tasks' must be a non-empty list")
+    tasks: List[TaskTemplate] = []
+    positions: Dict[str, int] = {}
+    for index, task in enumerate(task_specs):
+        where = f"{source}.tasks[{index}]"
+        _check_keys(task, TASK_KEYS, where)
+        name = _require_text(task, "name", where)
+        if name in positions:
+            raise CrewSpecError(f"{where}: duplicate task name '{name}'")
+        agent = _require_text(task, "agent", where)
+        if agent not in agent_specs:
+            raise CrewSpecError(f"{where}: unknown agent '{agent}'")
+        context = task.get("context") or []
+        if not isinstance(context, list):
+            raise CrewSpecError(f"{where}: 'context' must be a list of task names")
+        unknown = [str(upstream) for upstream in context if upstream not in positions]
+        if unknown:
+            raise CrewSpecError(f"{where}: 'context' must name earlier tasks (unknown: {', '.join(unknown)})")
+        tasks.append(TaskTemplate(
+            name=sys.intern(name),
+            agent=sys.intern(agent),
+            description=_prompt(task, "description", where, declared),
+            expected_output=_prompt(task, "expected_output", where, declared),
+            context=tuple(positions[upstream] for upstream in context),
+        ))
+        positions[name] = index
+
+    if not digest:
+        digest = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()
+    return CrewTemplate(
+        name=spec.get("name") or os.path.splitext(os.path.basename(source))[0],
+        digest=digest,
+        params=declared,
+        agents=tuple(agents),
+        tasks=tuple(tasks),
+        crew_options=tuple(crew_options.items()),
+    )
+
+
+def parse_spec(data: bytes, path: str) -> Dict[str, Any]:
+    """Parse a spec file's contents (.json as JSON, anything else as YAML)."""
+    try:
+        if path.endswith(".json"):
+            return json.loads(data)
+        import yaml
+        return yaml.safe_load(data)
+    except ValueError as e:
+        raise CrewSpecError(f"{path}: invalid JSON: {e}") from None
+    except ImportError:
+        raise CrewSpecError(f"{path}: PyYAML is required for YAML specs (pip install pyyaml)") from None
+    except Exception as e:
+        raise CrewSpecError(f"{path}: invalid YAML: {e}") from None
+
+
+_templates: Dict[str, CrewTemplate] = {}
+_paths: Dict[str, Tuple[Tuple[int, int], str]] = {}
+_lock = threading.Lock()
+
+
+def load_template(path: str) -> CrewTemplate:
+    """
+    Load and compile a spec file, reusing the compiled template when possible.
+
+    A file whose size and modification time are unchanged is not read again;
+    a changed file is re-hashed, and only compiled if no template with the
+    same content hash exists.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        known = _paths.get(path)
+        if known is not None and known[0] == signature:
+            return _templates[known[1]]
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    with _lock:
+        template = _templates.get(digest)
+    if template is None:
+        template = compile_spec(parse_spec(data, path), source=path, digest=digest)
+    with _lock:
+        template = _templates.setdefault(digest, template)
+        _paths[path] = (signature, digest)
+    return template
+
+
+def spec_path(name: str) -> str:
+    """Path of a bundled spec in crews/ (e.g. 'content_creation')."""
+    return os.path.join(SPECS_DIR, f"{name}.yaml")
+
+
+def main() -> None:
+    paths = sys.argv[1:] or sorted(os.path.join(SPECS_DIR, name) for name in os.listdir(SPECS_DIR))
+    failed = 0
+    for path in paths:
+        try:
+            template = load_template(path)
+        except (CrewSpecError, OSError) as e:
+            failed += 1
+            print(f"❌ {e}")
+            continue
+        params = ", ".join(sorted(template.params)) or "none"
+        print(f"✅ {path}: {len(template.agents)} agent(s), {len(template.tasks)} task(s), params: {params}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
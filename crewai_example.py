@@ -9,185 +9,472 @@ Author: AI Assistant
 Date: 2025
 """
 
+from __future__ import annotations
+
 import os
-from typing import List, Dict, Any
-from crewai import Agent, Task, Crew
-from crewai_tools import SerperApiTool, FileReadTool, FileWriteTool
+import re
+import sys
+import json
+import time
+import argparse
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
+
+# CrewAI, crewai_tools and the modules built on them take seconds to import, so
+# they are imported where they are first needed: '--help' and early exits in
+# main() stay fast, and nothing is loaded before a crew is actually built.
+if TYPE_CHECKING:
+    from crewai import Agent, Task, Crew
+    from crewai.llms.base_llm import BaseLLM
+    from async_runner import CrewRunLimiter
+    from checkpoint import RunCheckpoint
+    from crew_spec import CrewTemplate
+    from llm_cache import ResponseCache
+    from speculative_pipeline import SectionFeeds
+    from streaming_output import Observer, StreamingOutput
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crews")
 
 
 class ContentCreationCrew:
     """
     A CrewAI implementation for automated content creation.
 
-    This crew consists of three specialized agents:
+    This crew consists of three specialized agents, defined in
+    crews/content_creation.yaml:
     1. Researcher - Gathers information and data
     2. Writer - Creates content based on research
     3. Editor - Reviews and improves the content
+
+    The LLM, tools, agents, tasks and crew are built on first use (at the
+    latest by execute()), so constructing a crew is cheap.
     """
 
-    def __init__(self, topic: str, output_file: str = "output.md"):
+    def __init__(self, topic: str, output_file: str = "output.md", llm: Optional[BaseLLM] = None,
+                 response_cache: Optional[ResponseCache] = None, bypass_cache: bool = False,
+                 run_id: Optional[str] = None, runs_dir: Optional[str] = None,
+                 output_dir: Optional[str] = None, verbose: bool = True, spec: Optional[str] = None,
+                 stream: bool = False, on_chunk: Optional[Observer] = None, pipeline: bool = False):
         """
         Initialize the content creation crew.
 
         Args:
             topic: The topic to research and write about
             output_file: File path for the final output
+            llm: LLM used by every agent (defaults to CrewAI's default model)
+            response_cache: Cache for LLM responses (defaults to the on-disk cache
+                in .crewai_cache/, shared by every crew in the process)
+            bypass_cache: Always call the LLM, ignoring cached responses
+            run_id: Checkpoint run ID (defaults to one derived from topic and output file)
+            runs_dir: Directory where task checkpoints are stored (default: .crewai_runs)
+            output_dir: Directory for the research notes, draft and final output
+                (defaults to the current directory)
+            verbose: Print agent and crew progress
+            spec: Crew spec defining the agents and tasks (default: crews/content_creation.yaml)
+            stream: Write each task's answer as it is generated to an answer file
+                next to the file the task writes ('draft_article.answer.md' etc.),
+                renamed into place when the task completes
+            on_chunk: Called with (task name, text) for every streamed piece of text
+                (implies stream=True)
+            pipeline: Start the writer and editor speculatively on the first
+                completed sections of the research and draft, rerunning a task
+                whose input sections changed and following up on one that
+                missed much of its input (see speculative_pipeline.py;
+                implies stream=True)
         """
+        self._set_target(topic, output_file, output_dir)
+        self.verbose = verbose
+        self.bypass_cache = bypass_cache
+        self.run_id = run_id
+        self.runs_dir = runs_dir
+        self.spec = spec or os.path.join(SPECS_DIR, "content_creation.yaml")
+        self.stream = stream or on_chunk is not None or pipeline
+        self.on_chunk = on_chunk
+        self.pipeline = pipeline
+        self.cancel_event = threading.Event()
+        self._llm = llm
+        self._response_cache = response_cache
+
+    def _set_target(self, topic: str, output_file: str, output_dir: Optional[str]) -> None:
         self.topic = topic
-        self.output_file = output_file
-        self.tools = self._setup_tools()
-        self.agents = self._create_agents()
-        self.tasks = self._create_tasks()
-        self.crew = self._create_crew()
+        self.output_dir = output_dir or ""
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self.output_file = os.path.join(self.output_dir, output_file)
+        self.research_file = os.path.join(self.output_dir, "research_findings.md")
+        self.draft_file = os.path.join(self.output_dir, "draft_article.md")
+
+    def retarget(self, topic: str, output_file: str = "output.md", output_dir: Optional[str] = None,
+                 run_id: Optional[str] = None) -> ContentCreationCrew:
+        """
+        Point the crew at a new topic, keeping its LLM, tools and agents.
+
+        Tasks, crew and checkpoint are rebuilt on next use. Used by the crew
+        service (crew_service.py) to run job after job on warm agents; the
+        crew must not be executing.
+        """
+        self._set_target(topic, output_file, output_dir)
+        self.run_id = run_id
+        for component in ("tasks", "crew", "checkpoint"):
+            self.__dict__.pop(component, None)
+        if "tools" in self.__dict__:
+            self.tools['artifact_search'].scope = self._artifact_paths()
+        return self
+
+    def build(self) -> ContentCreationCrew:
+        """Build the LLM, tools, agents, tasks and crew now instead of on first use."""
+        from tracing import span
+
+        with span("crew.build", "crew", topic=self.topic):
+            for component in ("llm", "tools", "agents", "tasks", "crew"):
+                getattr(self, component)
+        return self
+
+    @cached_property
+    def template(self) -> CrewTemplate:
+        from crew_spec import load_template
+
+        return load_template(self.spec)
+
+    @cached_property
+    def response_cache(self) -> ResponseCache:
+        return self._response_cache or _shared_response_cache()
+
+    @cached_property
+    def llm(self) -> BaseLLM:
+        from async_runner import cancellable
+        from llm_cache import CachingLLM
+        from llm_wrappers import default_llm
+        from prompt_prefix import with_prefix_cache
+        from tracing import instrument_llm
+
+        llm = CachingLLM(with_prefix_cache(self._llm or default_llm()), self.response_cache,
+                         bypass=self.bypass_cache)
+        # Outside the cache, so a cancelled run stops on cached responses too.
+        llm = instrument_llm(cancellable(llm, self.cancel_event))
+        return self.streams.wrap(llm) if self.streams else llm
+
+    @cached_property
+    def tools(self) -> Dict[str, Any]:
+        return self._setup_tools()
+
+    @cached_property
+    def agents(self) -> Dict[str, Agent]:
+        return self._create_agents()
+
+    @cached_property
+    def tasks(self) -> List[Task]:
+        from tracing import instrument_tasks
+
+        tasks = instrument_tasks(self._create_tasks())
+        self.checkpoint.attach(tasks)
+        if self.streams:
+            self.streams.attach(tasks, [self.research_file, self.draft_file, self.output_file])
+        return tasks
+
+    @cached_property
+    def crew(self) -> Crew:
+        return self._create_crew()
+
+    @cached_property
+    def streams(self) -> Optional[StreamingOutput]:
+        from streaming_output import StreamingOutput
+
+        if not self.stream:
+            return None
+        return StreamingOutput(self.sections if self.pipeline else self.on_chunk)
+
+    @cached_property
+    def sections(self) -> SectionFeeds:
+        from speculative_pipeline import SectionFeeds
+
+        return SectionFeeds(self.on_chunk)
+
+    @cached_property
+    def checkpoint(self) -> RunCheckpoint:
+        from checkpoint import DEFAULT_RUNS_DIR, RunCheckpoint, default_run_id
+
+        return RunCheckpoint(self.run_id or default_run_id(self.topic, self.output_file),
+                             self.runs_dir or DEFAULT_RUNS_DIR)
 
     def _setup_tools(self) -> Dict[str, Any]:
-        """Set up tools for the agents."""
-        return {
-            'web_search': SerperApiTool(),
-            'file_read': FileReadTool(),
-            'file_write': FileWriteTool()
-        }
+        """
+        Set up tools for the agents.
+
+        The stateless tools are shared by every crew in the process;
+        'artifact_search' is the crew's own, limited to this run's files.
+        """
+        from artifact_index import ArtifactSearchTool
+        from tracing import instrument_tools
+
+        tools = dict(_shared_tools())
+        tools['artifact_search'] = ArtifactSearchTool(index=_shared_artifact_index(), scope=self._artifact_paths())
+        instrument_tools(list(tools.values()))
+        return tools
+
+    def _artifact_paths(self) -> List[str]:
+        return [os.path.normpath(path) for path in (self.research_file, self.draft_file, self.output_file)]
 
     def _create_agents(self) -> Dict[str, Agent]:
-        """Create specialized agents for the content creation process."""
-
-        # Research Agent
-        researcher = Agent(
-            role="Research Specialist",
-            goal="Gather comprehensive, accurate, and up-to-date information on the given topic",
-            backstory="""You are an expert research specialist with over 10 years of experience
-            in data analysis and information gathering. You have a keen eye for credible sources
-            and can quickly identify the most relevant information from vast amounts of data.
-            You specialize in academic research, market analysis, and trend identification.""",
-            tools=[self.tools['web_search'], self.tools['file_read']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        # Writer Agent
-        writer = Agent(
-            role="Content Writer",
-            goal="Create engaging, informative, and well-structured content based on research findings",
-            backstory="""You are a seasoned content writer with expertise in multiple domains.
-            You have a talent for transforming complex information into clear, engaging content
-            that resonates with various audiences. You excel at storytelling, technical writing,
-            and creating content that both educates and entertains.""",
-            tools=[self.tools['file_read'], self.tools['file_write']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        # Editor Agent
-        editor = Agent(
-            role="Content Editor",
-            goal="Review, refine, and polish content to ensure high quality, accuracy, and readability",
-            backstory="""You are a meticulous content editor with years of experience in
-            publishing and content management. You have an excellent command of grammar,
-            style, and tone. You can spot inconsistencies, improve flow, and ensure content
-            meets professional standards while maintaining the author's voice.""",
-            tools=[self.tools['file_read'], self.tools['file_write']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        return {
-            'researcher': researcher,
-            'writer': writer,
-            'editor': editor
-        }
+        """Create specialized agents for the content creation process (defined in the crew spec)."""
+        return self.template.create_agents(self.tools, llm=self.llm, verbose=self.verbose)
 
     def _create_tasks(self) -> List[Task]:
-        """Create tasks for the content creation workflow."""
-
-        # Research Task
-        research_task = Task(
-            description=f"""Conduct comprehensive research on the topic: {self.topic}
-
-            Your research should include:
-            1. Current trends and developments
-            2. Key statistics and data points
-            3. Expert opinions and insights
-            4. Relevant case studies or examples
-            5. Potential challenges or controversies
-
-            Organize your findings in a structured format and save them to a file
-            named 'research_findings.md' for the writer to use.""",
-            agent=self.agents['researcher'],
-            expected_output="A comprehensive research report saved to 'research_findings.md'"
-        )
-
-        # Writing Task
-        writing_task = Task(
-            description=f"""Using the research findings, create a comprehensive article about {self.topic}.
-
-            The article should:
-            1. Have a compelling introduction that hooks the reader
-            2. Include relevant statistics and data from the research
-            3. Provide valuable insights and actionable information
-            4. Be well-structured with clear headings and sections
-            5. Be between 1500-2000 words
-            6. Include a conclusion that summarizes key points
-
-            Save the article as 'draft_article.md' for the editor to review.""",
-            agent=self.agents['writer'],
-            expected_output="A well-written article saved to 'draft_article.md'",
-            context=[research_task]
-        )
-
-        # Editing Task
-        editing_task = Task(
-            description=f"""Review and edit the draft article to ensure it meets professional standards.
-
-            Your editing should focus on:
-            1. Grammar, spelling, and punctuation
-            2. Clarity and readability
-            3. Logical flow and structure
-            4. Consistency in tone and style
-            5. Fact-checking and accuracy
-            6. SEO optimization (if applicable)
-
-            Make necessary improvements and save the final version to '{self.output_file}'.
-            Provide a brief summary of the changes made.""",
-            agent=self.agents['editor'],
-            expected_output=f"Final polished article saved to '{self.output_file}'",
-            context=[writing_task]
-        )
-
-        return [research_task, writing_task, editing_task]
-
-    def _create_crew(self) -> Crew:
-        """Create the crew with all agents and tasks."""
-        return Crew(
-            agents=list(self.agents.values()),
-            tasks=self.tasks,
-            process="sequential",
-            verbose=True
-        )
-
-    def execute(self) -> str:
+        """Create tasks for the content creation workflow (defined in the crew spec)."""
+        return self.template.create_tasks(self.agents, {
+            "topic": self.topic,
+            "research_file": self.research_file,
+            "draft_file": self.draft_file,
+            "output_file": self.output_file,
+        })
+
+    def _create_crew(self, tasks: Optional[List[Task]] = None) -> Crew:
+        """Create the crew with all agents and the given tasks (default: all tasks)."""
+        return self.template.create_crew(self.agents, tasks or self.tasks, verbose=self.verbose)
+
+    def execute(self, resume: bool = False) -> str:
         """
         Execute the content creation workflow.
 
+        Every completed task is checkpointed. With resume=True, tasks
+        completed by an earlier run with the same run ID are skipped and
+        their stored outputs are used as context.
+
+        Args:
+            resume: Continue the previous run instead of starting over
+
         Returns:
             str: Path to the final output file
         """
+        from tracing import span
+
         print(f"🚀 Starting content creation for topic: {self.topic}")
         print("=" * 60)
 
         try:
-            result = self.crew.kickoff()
+            self.build()
+            with span("crew.execute", "crew", topic=self.topic, pipeline=self.pipeline):
+                tasks = self._pending_tasks(resume)
+                if tasks and self.pipeline:
+                    from speculative_pipeline import SpeculativePipeline
+
+                    schedule = SpeculativePipeline(tasks, self.sections).run()
+                    print("\n⏱️  Pipeline:")
+                    print(schedule.report())
+                elif tasks:
+                    crew = self.crew if len(tasks) == len(self.tasks) else self._create_crew(tasks)
+                    crew.kickoff()
             print("\n" + "=" * 60)
             print(f"✅ Content creation completed successfully!")
             print(f"📄 Final output saved to: {self.output_file}")
+            self._print_cache_stats()
             return self.output_file
 
         except Exception as e:
             print(f"❌ Error during content creation: {str(e)}")
+            self._print_cache_stats()
             raise
 
+    async def execute_async(self, resume: bool = False, timeout: Optional[float] = None,
+                            limiter: Optional[CrewRunLimiter] = None) -> str:
+        """
+        Await execute() from an asyncio event loop.
+
+        Runs share a bounded executor (see async_runner.py): beyond its
+        concurrency limit runs wait for a slot, and once its waiting queue is
+        full they are rejected with CrewOverloaded. A run that times out or
+        whose awaiting task is cancelled stops at its next LLM call; its
+        completed tasks stay checkpointed for resume=True, and the next run
+        starts once it has stopped.
+
+        Args:
+            resume: Continue the previous run instead of starting over
+            timeout: Seconds after which the run is stopped (asyncio.TimeoutError)
+            limiter: Limiter to run under (default: the process-wide one)
+        """
+        from async_runner import shared_limiter
+
+        limiter = limiter or shared_limiter()
+        return await limiter.run(functools.partial(self.execute, resume=resume), self.cancel_event, timeout)
+
+    def cancel(self) -> None:
+        """Stop a running execute() at its next LLM call."""
+        self.cancel_event.set()
+
+    def _pending_tasks(self, resume: bool) -> List[Task]:
+        """Tasks still to run: all of them, or those without a checkpoint when resuming."""
+        if not resume:
+            self.checkpoint.clear()
+            # Passages indexed from an earlier run's files must not be found before they are rewritten.
+            for path in self._artifact_paths():
+                _shared_artifact_index().remove(path)
+            return self.tasks
+
+        pending = self.checkpoint.restore(self.tasks)
+        skipped = len(self.tasks) - len(pending)
+        if skipped:
+            print(f"⏩ Resuming run '{self.checkpoint.run_id}': skipping {skipped} completed task(s)")
+        return pending
+
+    def _print_cache_stats(self) -> None:
+        from prompt_prefix import format_stats, shared_prefix_cache
+
+        stats = self.response_cache.stats()
+        print(f"🗄️  LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB)")
+        print(format_stats(shared_prefix_cache().stats()))
+
+
+_response_cache: Optional[ResponseCache] = None
+_tools: Optional[Dict[str, Any]] = None
+_artifact_index: Optional[Any] = None
+_shared_lock = threading.Lock()
+
+
+def _shared_response_cache() -> ResponseCache:
+    """The default on-disk response cache, opened on first use."""
+    from llm_cache import ResponseCache
+
+    global _response_cache
+    with _shared_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache()
+        return _response_cache
+
+
+def _shared_artifact_index() -> Any:
+    """The on-disk artifact index (.crewai_index/), opened on first use."""
+    from artifact_index import ArtifactIndex
+
+    global _artifact_index
+    with _shared_lock:
+        if _artifact_index is None:
+            _artifact_index = ArtifactIndex()
+        return _artifact_index
+
+
+def _shared_tools() -> Dict[str, Any]:
+    """
+    Tools shared by every crew in the process, created on first use.
+
+    Every file written through 'file_write' is added to the artifact index,
+    which each crew's 'artifact_search' queries for the top passages of its
+    own files.
+    """
+    from crewai_tools import FileReadTool, FileWriterTool
+    from artifact_index import index_written_files
+    from search_gateway import GatewaySearchTool, shared_search_gateway
+    from tool_wrappers import wrap_tool
+
+    index = _shared_artifact_index()
+    global _tools
+    with _shared_lock:
+        if _tools is None:
+            file_write = FileWriterTool()
+            wrap_tool(file_write, index_written_files(index), tag="artifact_index")
+            _tools = {
+                'web_search': GatewaySearchTool(gateway=shared_search_gateway()),
+                'file_read': FileReadTool(),
+                'file_write': file_write,
+            }
+        return _tools
+
+
+def _slugify(text: str, max_length: int = 60) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:max_length] or "topic"
+
+
+def read_topics(path: str) -> List[str]:
+    """Read one topic per line, skipping blank lines and '#' comments."""
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+
+def run_batch(topics: List[str], output_root: str = "articles", concurrency: int = 4,
+              output_file: str = "article.md", resume: bool = False, bypass_cache: bool = False,
+              llm: Optional[BaseLLM] = None) -> List[Dict[str, Any]]:
+    """
+    Run one ContentCreationCrew per topic, several at a time.
+
+    Each topic gets its own directory under output_root. Tools and the LLM
+    response cache are shared by all crews. Progress and failures are
+    reported per topic, and a summary is written to batch_report.json.
+
+    Args:
+        topics: Topics to write about
+        output_root: Directory receiving one sub-directory per topic
+        concurrency: Maximum number of crews running at the same time
+        output_file: File name of the final article inside each topic directory
+        resume: Resume each topic from its checkpoints
+        bypass_cache: Always call the LLM, ignoring cached responses
+        llm: LLM used by every agent (defaults to CrewAI's default model)
+
+    Returns:
+        List[Dict[str, Any]]: One status record per topic, in input order
+    """
+    os.makedirs(output_root, exist_ok=True)
+    total = len(topics)
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    print(f"📚 Running {total} topic(s) with concurrency {concurrency}")
+
+    def run_topic(index: int, topic: str) -> Dict[str, Any]:
+        output_dir = os.path.join(output_root, f"{index + 1:03d}-{_slugify(topic)}")
+        start = time.perf_counter()
+        try:
+            crew = ContentCreationCrew(topic=topic, output_file=output_file, llm=llm,
+                                       bypass_cache=bypass_cache, output_dir=output_dir, verbose=False)
+            crew.execute(resume=resume)
+            return {"topic": topic, "status": "ok", "output_file": crew.output_file,
+                    "seconds": round(time.perf_counter() - start, 2)}
+        except Exception as e:
+            return {"topic": topic, "status": "failed", "error": str(e), "output_dir": output_dir,
+                    "seconds": round(time.perf_counter() - start, 2)}
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="crew") as pool:
+        futures = {pool.submit(run_topic, index, topic): index for index, topic in enumerate(topics)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            results[futures[future]] = result
+            if result["status"] == "ok":
+                print(f"✅ [{done}/{total}] {result['topic']} ({result['seconds']}s) → {result['output_file']}")
+            else:
+                print(f"❌ [{done}/{total}] {result['topic']} failed after {result['seconds']}s: {result['error']}")
+
+    failed = sum(1 for result in results if result["status"] != "ok")
+    with open(os.path.join(output_root, "batch_report.json"), 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📊 Batch finished: {total - failed} succeeded, {failed} failed "
+          f"(report: {os.path.join(output_root, 'batch_report.json')})")
+    return results
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CrewAI content creation workflow")
+    parser.add_argument("--topic", default="The Future of Artificial Intelligence in Healthcare",
+                        help="Topic of a single article")
+    parser.add_argument("--output-file", default="ai_healthcare_article.md", help="Final article file")
+    parser.add_argument("--topics", metavar="FILE", help="Batch mode: file with one topic per line")
+    parser.add_argument("--concurrency", type=int, default=4, help="Crews running at once in batch mode")
+    parser.add_argument("--output-root", default="articles", help="Batch mode: directory for per-topic output")
+    parser.add_argument("--resume", action="store_true", default=os.getenv('CREWAI_RESUME') == '1',
+                        help="Continue failed runs from their last completed task")
+    parser.add_argument("--bypass-cache", action="store_true", default=os.getenv('CREWAI_BYPASS_CACHE') == '1',
+                        help="Always call the LLM, ignoring cached responses")
+    parser.add_argument("--stream", action="store_true", default=os.getenv('CREWAI_STREAM') == '1',
+                        help="Write each task's answer to an answer file and stdout as it is generated")
+    parser.add_argument("--pipeline", action="store_true", default=os.getenv('CREWAI_PIPELINE') == '1',
+                        help="Start the writer and editor on the first finished sections of their input")
+    parser.add_argument("--trace", metavar="FILE", default=os.getenv('CREWAI_TRACE'),
+                        help="Record spans to FILE (.json: Chrome trace, otherwise JSONL) and print a summary")
+    return parser.parse_args(argv)
+
 
 def main():
     """Main function to demonstrate the CrewAI content creation workflow."""
+    args = parse_args()
 
     # Set up environment variables (you'll need to set these)
     if not os.getenv('SERPER_API_KEY'):
@@ -197,20 +484,35 @@ def main():
         print("⚠️  Warning: OPENAI_API_KEY not set. Please set your OpenAI API key.")
         return
 
-    # Example usage
-    topic = "The Future of Artificial Intelligence in Healthcare"
-    output_file = "ai_healthcare_article.md"
+    from tracing import configure_tracing
+
+    tracer = configure_tracing(args.trace)
+
+    if args.topics:
+        results = run_batch(read_topics(args.topics), output_root=args.output_root,
+                            concurrency=args.concurrency, resume=args.resume, bypass_cache=args.bypass_cache)
+        tracer.report()
+        if any(result["status"] != "ok" for result in results):
+            sys.exit(1)
+        return
 
     # Create and execute the crew
-    crew = ContentCreationCrew(topic=topic, output_file=output_file)
+    on_chunk = None
+    if args.stream:
+        from streaming_output import print_chunk
+        on_chunk = print_chunk
+    crew = ContentCreationCrew(topic=args.topic, output_file=args.output_file, bypass_cache=args.bypass_cache,
+                               on_chunk=on_chunk, pipeline=args.pipeline, verbose=not args.stream)
 
     try:
-        result_file = crew.execute()
+        result_file = crew.execute(resume=args.resume)
         print(f"\n🎉 Success! Check out your article at: {result_file}")
 
     except Exception as e:
         print(f"❌ Failed to create content: {str(e)}")
 
+    tracer.report()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
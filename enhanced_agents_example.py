@@ -9,176 +9,242 @@ Author: AI Assistant
 Date: 2025
 """
 
+from __future__ import annotations
+
 import os
-from typing import List, Dict, Any
-from crewai import Agent, Task, Crew
-from crewai_tools import SerperApiTool, FileReadTool, FileWriteTool
+import functools
+import threading
+from functools import cached_property
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 
+# Heavy imports (CrewAI, crewai_tools) are deferred until a crew is built; see crewai_example.py.
+if TYPE_CHECKING:
+    from crewai import Agent, Task, Crew
+    from crewai.llms.base_llm import BaseLLM
+    from async_runner import CrewRunLimiter
+    from checkpoint import RunCheckpoint
+    from crew_spec import CrewTemplate
+    from context_compaction import ContextCompactor
+    from streaming_output import Observer, StreamingOutput
+
+PROCESS_MODES = ("sequential", "dag")
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crews")
 
-class EnhancedAgentsExample:
-    """Example demonstrating enhanced agent configurations for real-world applications."""
 
-    def __init__(self, topic: str = "AI in Healthcare", output_file: str = "enhanced_analysis.md"):
+class EnhancedAgentsExample:
+    """
+    Example demonstrating enhanced agent configurations for real-world applications.
+
+    The LLM, tools, agents, tasks and crew are built on first use (at the
+    latest by execute()).
+    """
+
+    def __init__(self, topic: str = "AI in Healthcare", output_file: str = "enhanced_analysis.md",
+                 run_id: Optional[str] = None, runs_dir: Optional[str] = None, output_dir: Optional[str] = None,
+                 process: str = "sequential", max_workers: int = 3, llm: Optional[BaseLLM] = None,
+                 memory: bool = True, verbose: bool = True, context_budget: Optional[int] = None,
+                 spec: Optional[str] = None, stream: bool = False, on_chunk: Optional[Observer] = None):
+        """
+        Args:
+            topic: Topic of the analysis
+            output_file: File path for the final analysis
+            run_id: Checkpoint run ID (defaults to one derived from topic and output file)
+            runs_dir: Directory where task checkpoints are stored (default: .crewai_runs)
+            output_dir: Directory for the research, content strategy and final
+                analysis (defaults to the current directory)
+            process: "sequential" runs the crew task by task; "dag" runs tasks
+                concurrently as soon as the tasks in their context are done
+                (crew-level memory is not used in "dag" mode)
+            max_workers: Maximum number of concurrent tasks in "dag" mode
+            llm: LLM used by every agent (defaults to CrewAI's default model)
+            memory: Enable crew memory in "sequential" mode
+            verbose: Print agent and crew progress
+            context_budget: Token budget for the context each task receives from
+                upstream tasks; larger contexts are compacted to their most
+                relevant sections (None passes upstream outputs unchanged)
+            spec: Crew spec defining the agents and tasks (default: crews/enhanced_agents.yaml)
+            stream: Write each task's answer as it is generated to an answer file
+                next to the file the task writes, renamed into place when the task completes
+            on_chunk: Called with (task name, text) for every streamed piece of text
+                (implies stream=True)
+        """
+        if process not in PROCESS_MODES:
+            raise ValueError(f"Unknown process '{process}'. Use one of {', '.join(PROCESS_MODES)}.")
+        self._set_target(topic, output_file, output_dir)
+        self.process = process
+        self.max_workers = max_workers
+        self.memory = memory
+        self.verbose = verbose
+        self.context_budget = context_budget
+        self.run_id = run_id
+        self.runs_dir = runs_dir
+        self.spec = spec or os.path.join(SPECS_DIR, "enhanced_agents.yaml")
+        self.stream = stream or on_chunk is not None
+        self.on_chunk = on_chunk
+        self.cancel_event = threading.Event()
+        self._llm = llm
+
+    def _set_target(self, topic: str, output_file: str, output_dir: Optional[str]) -> None:
         self.topic = topic
-        self.output_file = output_file
-        self.tools = self._setup_tools()
-        self.agents = self._create_enhanced_agents()
-        self.tasks = self._create_enhanced_tasks()
-        self.crew = self._create_enhanced_crew()
+        self.output_dir = output_dir or ""
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self.output_file = os.path.join(self.output_dir, output_file)
+        self.research_file = os.path.join(self.output_dir, "comprehensive_research.md")
+        self.strategy_file = os.path.join(self.output_dir, "content_strategy.md")
+
+    def retarget(self, topic: str, output_file: str = "enhanced_analysis.md", output_dir: Optional[str] = None,
+                 run_id: Optional[str] = None) -> EnhancedAgentsExample:
+        """
+        Point the example at a new topic, keeping its LLM, tools and agents.
+
+        Tasks, crew and checkpoint are rebuilt on next use; see
+        ContentCreationCrew.retarget().
+        """
+        self._set_target(topic, output_file, output_dir)
+        self.run_id = run_id
+        for component in ("tasks", "crew", "checkpoint"):
+            self.__dict__.pop(component, None)
+        return self
+
+    def build(self) -> EnhancedAgentsExample:
+        """Build the LLM, tools, agents, tasks and crew now instead of on first use."""
+        from tracing import span
+
+        with span("crew.build", "crew", topic=self.topic):
+            for component in ("llm", "tools", "agents", "tasks", "crew"):
+                getattr(self, component)
+        return self
+
+    @cached_property
+    def template(self) -> CrewTemplate:
+        from crew_spec import load_template
+
+        return load_template(self.spec)
+
+    @cached_property
+    def llm(self) -> BaseLLM:
+        from async_runner import cancellable
+        from llm_wrappers import default_llm
+        from prompt_prefix import with_prefix_cache
+        from tracing import instrument_llm
+
+        # The agents' role, goal, backstory and tool descriptions form a prompt
+        # prefix that is identical on every call; keep it byte-stable and cached.
+        llm = instrument_llm(cancellable(with_prefix_cache(self._llm or default_llm()), self.cancel_event))
+        return self.streams.wrap(llm) if self.streams else llm
+
+    @cached_property
+    def tools(self) -> Dict[str, Any]:
+        return self._setup_tools()
+
+    @cached_property
+    def agents(self) -> Dict[str, Agent]:
+        return self._create_enhanced_agents()
+
+    @cached_property
+    def tasks(self) -> List[Task]:
+        from tracing import instrument_tasks
+
+        tasks = instrument_tasks(self._create_enhanced_tasks())
+        self.checkpoint.attach(tasks)
+        if self.compactor and self.process == "sequential":
+            self.compactor.attach(tasks)
+        if self.streams:
+            self.streams.attach(tasks, [self.research_file, self.strategy_file, self.output_file])
+        return tasks
+
+    @cached_property
+    def crew(self) -> Crew:
+        return self._create_enhanced_crew()
+
+    @cached_property
+    def streams(self) -> Optional[StreamingOutput]:
+        from streaming_output import StreamingOutput
+
+        return StreamingOutput(self.on_chunk) if self.stream else None
+
+    @cached_property
+    def checkpoint(self) -> RunCheckpoint:
+        from checkpoint import DEFAULT_RUNS_DIR, RunCheckpoint, default_run_id
+
+        return RunCheckpoint(self.run_id or default_run_id(self.topic, self.output_file),
+                             self.runs_dir or DEFAULT_RUNS_DIR)
+
+    @cached_property
+    def compactor(self) -> Optional[ContextCompactor]:
+        from context_compaction import ContextCompactor
+
+        return ContextCompactor(self.context_budget) if self.context_budget else None
 
     def _setup_tools(self) -> Dict[str, Any]:
         """Setup tools for enhanced agents."""
-        return {
-            'web_search': SerperApiTool(),
+        from crewai_tools import FileReadTool, FileWriterTool
+        from search_gateway import GatewaySearchTool, shared_search_gateway
+        from tracing import instrument_tools
+
+        tools = {
+            'web_search': GatewaySearchTool(gateway=shared_search_gateway()),
             'file_read': FileReadTool(),
-            'file_write': FileWriteTool()
+            'file_write': FileWriterTool()
         }
+        instrument_tools(list(tools.values()))
+        return tools
 
     def _create_enhanced_agents(self) -> Dict[str, Agent]:
-        """Create enhanced agents with comprehensive roles, goals, and backstories."""
-
-        # Enhanced Research Specialist
-        research_specialist = Agent(
-            role="Senior Market Research Analyst specializing in healthcare technology and competitive intelligence",
-            goal="Conduct comprehensive market research to identify emerging trends, competitive dynamics, and market opportunities in the healthcare technology sector, providing actionable intelligence for strategic decision-making",
-            backstory="""You are a senior market research analyst with 12+ years of experience in
-            healthcare technology, competitive intelligence, and strategic analysis. You've worked
-            with major healthcare companies like Johnson & Johnson, Pfizer, and UnitedHealth Group,
-            helping them understand market dynamics and identify billion-dollar opportunities. Your
-            expertise includes advanced statistical analysis, competitive benchmarking, and trend
-            forecasting. You've successfully predicted major healthcare technology disruptions and
-            have helped companies launch products that generated over $500M in revenue. You're known
-            for your ability to uncover hidden market insights and for translating complex data into
-            clear, actionable strategic recommendations.""",
-            tools=[self.tools['web_search'], self.tools['file_read']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        # Enhanced Content Strategist
-        content_strategist = Agent(
-            role="Senior Content Strategist specializing in healthcare communications and thought leadership",
-            goal="Develop comprehensive content strategies that educate healthcare professionals, engage stakeholders, and position organizations as thought leaders in the healthcare technology space",
-            backstory="""You are a senior content strategist with 10+ years of experience in
-            healthcare communications, thought leadership, and content marketing. You've worked with
-            leading healthcare organizations like Mayo Clinic, Cleveland Clinic, and pharmaceutical
-            companies, creating content strategies that reach millions of healthcare professionals.
-            Your expertise includes medical writing, regulatory compliance, and audience engagement.
-            You've helped organizations increase their thought leadership visibility by 300% and
-            have developed content frameworks used by major healthcare institutions. You're known for
-            your ability to make complex medical concepts accessible and for creating content that
-            drives meaningful engagement with healthcare audiences.""",
-            tools=[self.tools['file_read'], self.tools['file_write']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        # Enhanced Business Analyst
-        business_analyst = Agent(
-            role="Senior Business Analyst specializing in healthcare technology ROI and strategic planning",
-            goal="Analyze business opportunities, assess market potential, and develop strategic recommendations that drive growth and competitive advantage in healthcare technology markets",
-            backstory="""You are a senior business analyst with 15+ years of experience in
-            healthcare technology, strategic planning, and business development. You've worked with
-            Fortune 500 healthcare companies, startups, and consulting firms, helping them evaluate
-            market opportunities worth billions of dollars. Your expertise includes financial modeling,
-            market sizing, and strategic planning. You've helped companies make investment decisions
-            that led to successful product launches and market expansions. You're known for your
-            ability to build compelling business cases and for providing strategic insights that
-            drive executive decision-making.""",
-            tools=[self.tools['file_read'], self.tools['file_write']],
-            verbose=True,
-            allow_delegation=False
-        )
-
-        return {
-            'research_specialist': research_specialist,
-            'content_strategist': content_strategist,
-            'business_analyst': business_analyst
-        }
+        """Create enhanced agents with comprehensive roles, goals, and backstories (defined in the crew spec)."""
+        return self.template.create_agents(self.tools, llm=self.llm, verbose=self.verbose)
 
     def _create_enhanced_tasks(self) -> List[Task]:
-        """Create enhanced tasks with detailed descriptions and expectations."""
-
-        # Enhanced Research Task
-        research_task = Task(
-            description=f"""Conduct a comprehensive market research analysis on the topic: {self.topic}
-
-            Your research should include:
-            1. **Market Size and Growth**: Quantify the current market size, growth rates, and future projections
-            2. **Competitive Landscape**: Analyze key players, market share, and competitive positioning
-            3. **Technology Trends**: Identify emerging technologies, innovations, and disruption patterns
-            4. **Regulatory Environment**: Assess regulatory frameworks, compliance requirements, and policy impacts
-            5. **Customer Insights**: Understand user needs, pain points, and adoption barriers
-            6. **Investment Landscape**: Analyze funding trends, M&A activity, and investment patterns
-            7. **Geographic Analysis**: Identify regional opportunities and market variations
-            8. **Risk Assessment**: Evaluate market risks, challenges, and potential obstacles
-
-            Organize your findings in a structured format and save them to 'comprehensive_research.md'.
-            Include specific data points, statistics, and actionable insights.""",
-            agent=self.agents['research_specialist'],
-            expected_output="A comprehensive market research report with quantitative data, competitive analysis, and strategic insights saved to 'comprehensive_research.md'"
-        )
-
-        # Enhanced Content Strategy Task
-        content_task = Task(
-            description=f"""Based on the research findings, develop a comprehensive content strategy for {self.topic}.
-
-            Your content strategy should include:
-            1. **Audience Analysis**: Define target audiences, their needs, and content preferences
-            2. **Content Pillars**: Identify key themes and topics that align with business objectives
-            3. **Content Types**: Recommend specific content formats (whitepapers, webinars, case studies, etc.)
-            4. **Distribution Strategy**: Outline channels, platforms, and publishing schedules
-            5. **Thought Leadership Plan**: Develop positioning and messaging for thought leadership
-            6. **Engagement Metrics**: Define KPIs and success measures for content performance
-            7. **Competitive Analysis**: Assess competitor content strategies and identify opportunities
-            8. **Implementation Roadmap**: Create a phased approach for content development and distribution
-
-            Create a detailed content strategy document and save it to 'content_strategy.md'.""",
-            agent=self.agents['content_strategist'],
-            expected_output="A comprehensive content strategy document with audience analysis, content pillars, and implementation roadmap saved to 'content_strategy.md'",
-            context=[research_task]
-        )
-
-        # Enhanced Business Analysis Task
-        business_analysis_task = Task(
-            description=f"""Analyze the business opportunities and develop strategic recommendations for {self.topic}.
-
-            Your business analysis should include:
-            1. **Market Opportunity Assessment**: Quantify market potential and revenue opportunities
-            2. **Competitive Advantage Analysis**: Identify unique positioning and differentiation strategies
-            3. **Business Model Recommendations**: Suggest optimal business models and revenue streams
-            4. **Go-to-Market Strategy**: Develop comprehensive market entry and expansion plans
-            5. **Resource Requirements**: Estimate investment needs, team requirements, and timeline
-            6. **Risk Mitigation**: Identify potential challenges and develop mitigation strategies
-            7. **Success Metrics**: Define key performance indicators and success criteria
-            8. **Strategic Roadmap**: Create a 3-5 year strategic plan with milestones and objectives
-
-            Develop a comprehensive business analysis and strategic recommendations document.""",
-            agent=self.agents['business_analyst'],
-            expected_output=f"Comprehensive business analysis with strategic recommendations and implementation roadmap saved to '{self.output_file}'",
-            context=[research_task, content_task]
-        )
-
-        return [research_task, content_task, business_analysis_task]
-
-    def _create_enhanced_crew(self) -> Crew:
-        """Create an enhanced crew with optimized configuration."""
-        return Crew(
-            agents=list(self.agents.values()),
-            tasks=self.tasks,
-            process="sequential",
-            verbose=True,
-            memory=True,
-            cache=True
-        )
+        """Create enhanced tasks with detailed descriptions and expectations (defined in the crew spec)."""
+        return self.template.create_tasks(self.agents, {
+            "topic": self.topic,
+            "research_file": self.research_file,
+            "strategy_file": self.strategy_file,
+            "output_file": self.output_file,
+        })
+
+    def _create_enhanced_crew(self, tasks: Optional[List[Task]] = None) -> Crew:
+        """Create an enhanced crew with optimized configuration (default: all tasks)."""
+        return self.template.create_crew(self.agents, tasks or self.tasks, verbose=self.verbose,
+                                         memory=self.memory)
+
+    def execute(self, resume: bool = False) -> str:
+        """
+        Execute the enhanced agents example.
+
+        Every completed task is checkpointed. With resume=True, tasks
+        completed by an earlier run with the same run ID are skipped and
+        their stored outputs are used as context.
+        """
+        from dag_scheduler import DagScheduler
+        from prompt_prefix import format_stats, shared_prefix_cache
+        from tracing import span
 
-    def execute(self) -> str:
-        """Execute the enhanced agents example."""
         print(f"🚀 Starting Enhanced Agents Analysis: {self.topic}")
         print("=" * 60)
 
         try:
-            result = self.crew.kickoff()
+            self.build()
+            with span("crew.execute", "crew", topic=self.topic, process=self.process):
+                tasks = self._pending_tasks(resume)
+                if tasks and self.process == "dag":
+                    schedule = DagScheduler(tasks, max_workers=self.max_workers,
+                                            context_builder=self.compactor).run()
+                    print("\n⏱️  Task Schedule:")
+                    print(schedule.report())
+                    result = self.tasks[-1].output
+                elif tasks:
+                    crew = self.crew if len(tasks) == len(self.tasks) else self._create_enhanced_crew(tasks)
+                    result = crew.kickoff()
+                else:
+                    result = self.tasks[-1].output
+
+            if self.compactor:
+                stats = self.compactor.stats()
+                print(f"🗜️  Context compaction: {stats['tokens_before']} → {stats['tokens_after']} tokens "
+                      f"({stats['saved']:.0%} saved)")
+            print(format_stats(shared_prefix_cache().stats()))
 
             print("\n" + "=" * 60)
             print("✅ Enhanced Agents Analysis Completed Successfully!")
@@ -193,6 +259,44 @@ class EnhancedAgentsExample:
             print(f"❌ Error in enhanced agents analysis: {str(e)}")
             raise
 
+    async def execute_async(self, resume: bool = False, timeout: Optional[float] = None,
+                            limiter: Optional[CrewRunLimiter] = None) -> Any:
+        """
+        Await execute() from an asyncio event loop.
+
+        Runs share a bounded executor (see async_runner.py): beyond its
+        concurrency limit runs wait for a slot, and once its waiting queue is
+        full they are rejected with CrewOverloaded. A run that times out or
+        whose awaiting task is cancelled stops at its next LLM call; its
+        completed tasks stay checkpointed for resume=True, and the next run
+        starts once it has stopped.
+
+        Args:
+            resume: Continue the previous run instead of starting over
+            timeout: Seconds after which the run is stopped (asyncio.TimeoutError)
+            limiter: Limiter to run under (default: the process-wide one)
+        """
+        from async_runner import shared_limiter
+
+        limiter = limiter or shared_limiter()
+        return await limiter.run(functools.partial(self.execute, resume=resume), self.cancel_event, timeout)
+
+    def cancel(self) -> None:
+        """Stop a running execute() at its next LLM call."""
+        self.cancel_event.set()
+
+    def _pending_tasks(self, resume: bool) -> List[Task]:
+        """Tasks still to run: all of them, or those without a checkpoint when resuming."""
+        if not resume:
+            self.checkpoint.clear()
+            return self.tasks
+
+        pending = self.checkpoint.restore(self.tasks)
+        skipped = len(self.tasks) - len(pending)
+        if skipped:
+            print(f"⏩ Resuming run '{self.checkpoint.run_id}': skipping {skipped} completed task(s)")
+        return pending
+
 
 def main():
     """Main function to run the enhanced agents example."""
@@ -211,14 +315,32 @@ def main():
         print("Please set your Serper API key in the .env file for web search capabilities")
         return
 
+    # Set CREWAI_TRACE=trace.json (Chrome trace) or trace.jsonl to record spans
+    from tracing import configure_tracing
+
+    tracer = configure_tracing()
+
+    # Set CREWAI_STREAM=1 to write each task's answer to its file and stdout as it is generated
+    on_chunk = None
+    if os.getenv('CREWAI_STREAM') == '1':
+        from streaming_output import print_chunk
+        on_chunk = print_chunk
+
     try:
         # Create and run enhanced agents example
+        # Set CREWAI_PROCESS=dag to run independent tasks concurrently
         example = EnhancedAgentsExample(
             topic="Artificial Intelligence in Healthcare: Market Analysis and Strategic Opportunities",
-            output_file="healthcare_ai_analysis.md"
+            output_file="healthcare_ai_analysis.md",
+            process=os.getenv('CREWAI_PROCESS', 'sequential'),
+            # Set CREWAI_CONTEXT_BUDGET=<tokens> to compact the context passed between tasks
+            context_budget=int(os.getenv('CREWAI_CONTEXT_BUDGET', '0')) or None,
+            on_chunk=on_chunk,
+            verbose=on_chunk is None
         )
 
-        result = example.execute()
+        # Set CREWAI_RESUME=1 to continue a failed run from its last completed task
+        result = example.execute(resume=os.getenv('CREWAI_RESUME') == '1')
 
         print("\n🎯 Key Benefits of Enhanced Agents:")
         print("-" * 40)
@@ -231,6 +353,8 @@ def main():
     except Exception as e:
         print(f"❌ Error running enhanced agents example: {str(e)}")
 
+    tracer.report()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -15,9 +15,13 @@ import os
 from crewai import Agent, Task, Crew
 
 
-def create_basic_crew():
+def create_basic_crew(llm=None, topic="Artificial Intelligence in Healthcare"):
     """
     Create a simple crew with two agents working on a basic task.
+
+    Args:
+        llm: Optional LLM for both agents (defaults to CrewAI's default model)
+        topic: Topic to research and write about
     """
 
     # Create agents
@@ -25,6 +29,7 @@ def create_basic_crew():
         role="Research Assistant",
         goal="Gather information and provide accurate data",
         backstory="You are an expert researcher with years of experience in data analysis and information gathering.",
+        llm=llm,
         verbose=True,
         allow_delegation=False
     )
@@ -33,21 +38,22 @@ def create_basic_crew():
         role="Content Writer",
         goal="Create clear and engaging content based on research",
         backstory="You are a skilled writer who excels at transforming complex information into clear, engaging content.",
+        llm=llm,
         verbose=True,
         allow_delegation=False
     )
 
     # Create tasks
     research_task = Task(
-        description="Research the topic of 'Artificial Intelligence in Healthcare' and provide key insights, trends, and statistics.",
+        description=f"Research the topic of '{topic}' and provide key insights, trends, and statistics.",
         agent=researcher,
         expected_output="A comprehensive research summary with key findings and data points."
     )
 
     writing_task = Task(
-        description="Using the research findings, create a 500-word article about AI in healthcare that is informative and engaging for a general audience.",
+        description=f"Using the research findings, create a 500-word article about {topic} that is informative and engaging for a general audience.",
         agent=writer,
-        expected_output="A well-written article about AI in healthcare.",
+        expected_output=f"A well-written article about {topic}.",
         context=[research_task]
     )
 
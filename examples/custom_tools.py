@@ -13,19 +13,89 @@ Date: 2025
 
 import os
 import json
+import threading
 from datetime import datetime
-from crewai import Agent, Task, Crew, tool
-from crewai.tools import BaseTool
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Type, Union
+import numpy as np
+from pydantic import BaseModel, Field
+from crewai import Agent, Task, Crew
+from crewai.tools import BaseTool, tool
+
+from log_store import BufferedLogWriter, LogReader, log_directory_for, open_log_store
+from safe_eval import ExpressionError, evaluate, evaluate_vectorized
+from text_stats import analyze_file, analyze_parallel, analyze_stream
+from tool_cache import IMPURE, PURE, CachePolicy, set_cache_policy, shared_tool_cache, ttl
+from tool_pool import ExecutionPolicy, cpu_bound, set_execution_policy, shared_tool_pool
+
+
+CALCULATOR_OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+
+class CalculatorInput(BaseModel):
+    """Input schema for CalculatorTool: single values or equally long lists."""
+
+    operation: Union[str, List[str]] = Field(
+        ..., description="add, subtract, multiply or divide, or a list with one operation per element")
+    a: Union[float, List[float]] = Field(..., description="First operand, or a list of first operands")
+    b: Union[float, List[float]] = Field(..., description="Second operand, or a list of second operands")
+
+
+def calculate_batch(operations: List[str], a: List[float], b: List[float]) -> Dict[str, Any]:
+    """
+    Compute many calculator operations in one vectorized NumPy pass.
+
+    Scalars (or one-element lists) are broadcast against the longer inputs.
+
+    Returns:
+        dict: "results" (None where an element failed) and "errors" keyed by element index
+    """
+    ops = np.asarray(operations, dtype=object)
+    left = np.asarray(a, dtype=float)
+    right = np.asarray(b, dtype=float)
+    ops, left, right = np.broadcast_arrays(ops, left, right)
+
+    results = np.full(left.shape, np.nan)
+    errors: Dict[int, str] = {}
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for operation in CALCULATOR_OPERATIONS:
+            mask = ops == operation
+            if not mask.any():
+                continue
+            if operation == "add":
+                results[mask] = left[mask] + right[mask]
+            elif operation == "subtract":
+                results[mask] = left[mask] - right[mask]
+            elif operation == "multiply":
+                results[mask] = left[mask] * right[mask]
+            else:
+                results[mask] = left[mask] / right[mask]
+                for index in np.flatnonzero(mask & (right == 0)):
+                    errors[int(index)] = "Division by zero"
+
+    for index in np.flatnonzero(~np.isin(ops, CALCULATOR_OPERATIONS)):
+        errors[int(index)] = f"Unknown operation '{ops[index]}'"
+
+    values = [None if i in errors else float(value) for i, value in enumerate(results.tolist())]
+    return {"results": values, "errors": errors}
 
 
 class CalculatorTool(BaseTool):
     """Custom tool for performing mathematical calculations."""
 
     name: str = "Calculator"
-    description: str = "Performs basic mathematical calculations (add, subtract, multiply, divide)"
-
-    def _run(self, operation: str, a: float, b: float) -> str:
+    description: str = ("Performs basic mathematical calculations (add, subtract, multiply, divide). "
+                        "Pass lists for operation, a and b to compute many calculations in one call.")
+    args_schema: Type[BaseModel] = CalculatorInput
+    cache_policy: ClassVar[CachePolicy] = PURE
+    execution_policy: ClassVar[ExecutionPolicy] = cpu_bound(timeout=10)
+
+    def _run(self, operation: Union[str, List[str]], a: Union[float, List[float]],
+             b: Union[float, List[float]]) -> str:
         """Perform mathematical operations."""
+        if isinstance(operation, list) or isinstance(a, list) or isinstance(b, list):
+            return self._run_batch(operation, a, b)
+
         try:
             if operation == "add":
                 result = a + b
@@ -44,35 +114,58 @@ class CalculatorTool(BaseTool):
         except Exception as e:
             return f"Error: {str(e)}"
 
+    def _run_batch(self, operation: Union[str, List[str]], a: Union[float, List[float]],
+                   b: Union[float, List[float]]) -> str:
+        """Perform a list of operations and report errors per element."""
+        try:
+            batch = calculate_batch(operation, a, b)
+            return json.dumps(batch, separators=(",", ":"))
+        except ValueError as e:
+            return f"Error: operation, a and b lists must have matching lengths ({str(e)})"
+
+
+# Buffered log writers, shared by every DataLoggerTool instance in the process
+_log_writers: Dict[str, BufferedLogWriter] = {}
+_log_writers_lock = threading.Lock()
+
+
+def _get_log_writer(filename: str) -> BufferedLogWriter:
+    """Return the buffered writer for a filename, opening its store on first use."""
+    directory = os.path.abspath(log_directory_for(filename))
+    with _log_writers_lock:
+        if directory not in _log_writers:
+            _log_writers[directory] = BufferedLogWriter(open_log_store(directory))
+        return _log_writers[directory]
+
+
+def flush_logs() -> None:
+    """Wait until every queued log entry has been written to disk."""
+    with _log_writers_lock:
+        writers = list(_log_writers.values())
+    for writer in writers:
+        writer.flush()
+
 
 class DataLoggerTool(BaseTool):
-    """Custom tool for logging data to a file."""
+    """Custom tool for logging data to an append-only log."""
 
     name: str = "Data Logger"
-    description: str = "Logs data to a JSON file with timestamps"
+    description: str = "Logs data with timestamps to an append-only JSON-lines log"
+    cache_policy: ClassVar[CachePolicy] = IMPURE
+    # Every call has a side effect, so CrewAI's own tool cache must not replay it either
+    cache_function: Callable[..., bool] = lambda _args=None, _result=None: False
 
-    def _run(self, data: str, filename: str = "crewai_log.json") -> str:
-        """Log data to a JSON file."""
+    def _run(self, data: str, filename: str = "crewai_log") -> str:
+        """Queue data for the background log writer (an existing 'crewai_log.json' array is migrated once)."""
         try:
             log_entry = {
                 "timestamp": datetime.now().isoformat(),
                 "data": data
             }
 
-            # Load existing logs or create new list
-            try:
-                with open(filename, 'r') as f:
-                    logs = json.load(f)
-            except FileNotFoundError:
-                logs = []
-
-            logs.append(log_entry)
-
-            # Save updated logs
-            with open(filename, 'w') as f:
-                json.dump(logs, f, indent=2)
+            _get_log_writer(filename).write(log_entry)
 
-            return f"Data logged successfully to {filename}"
+            return f"Data logged successfully to {log_directory_for(filename)}"
         except Exception as e:
             return f"Error logging data: {str(e)}"
 
@@ -89,13 +182,39 @@ def quick_calc(expression: str) -> str:
         Result of the calculation
     """
     try:
-        # Note: eval() should be used carefully in production
-        result = eval(expression)
+        # Sandboxed: only arithmetic is accepted, and compiled expressions are cached
+        result = evaluate(expression)
         return f"{expression} = {result}"
-    except Exception as e:
+    except ExpressionError as e:
         return f"Error calculating {expression}: {str(e)}"
 
 
+@tool("Batch Calculator")
+def batch_calc(expressions: List[str], variables: Optional[Dict[str, List[float]]] = None) -> str:
+    """
+    Evaluates many mathematical expressions in a single call.
+
+    Args:
+        expressions: Expressions to evaluate (e.g., ["15 * 3", "20 / 4"])
+        variables: Optional lists of values; each expression is then evaluated
+            element-wise over them (e.g., {"x": [1, 2, 3]} with "x ** 2 + 1")
+
+    Returns:
+        One result or error per expression
+    """
+    lines = []
+    for expression in expressions:
+        try:
+            if variables:
+                result = evaluate_vectorized(expression, variables).tolist()
+            else:
+                result = evaluate(expression)
+            lines.append(f"{expression} = {result}")
+        except ExpressionError as e:
+            lines.append(f"{expression} -> Error: {str(e)}")
+    return "\n".join(lines)
+
+
 @tool("Text Analyzer")
 def analyze_text(text: str) -> str:
     """
@@ -108,32 +227,81 @@ def analyze_text(text: str) -> str:
         Analysis results
     """
     try:
-        words = text.split()
-        characters = len(text)
-        word_count = len(words)
-        avg_word_length = sum(len(word) for word in words) / word_count if word_count > 0 else 0
-
-        analysis = {
-            "character_count": characters,
-            "word_count": word_count,
-            "average_word_length": round(avg_word_length, 2),
-            "unique_words": len(set(words))
-        }
-
+        analysis = analyze_stream([text]).to_dict()
         return f"Text Analysis: {json.dumps(analysis, indent=2)}"
     except Exception as e:
         return f"Error analyzing text: {str(e)}"
 
 
-def create_custom_tools_crew():
-    """Create a crew that demonstrates custom tools."""
+@tool("Text File Analyzer")
+def analyze_text_file(path: str) -> str:
+    """
+    Analyzes a text file of any size in a single streaming pass.
+
+    Args:
+        path: Path to the text file to analyze
+
+    Returns:
+        Analysis results (unique words are estimated for very large vocabularies)
+    """
+    try:
+        analysis = analyze_file(path).to_dict()
+        return f"Text Analysis of {path}: {json.dumps(analysis, indent=2)}"
+    except Exception as e:
+        return f"Error analyzing {path}: {str(e)}"
+
+
+@tool("Text Corpus Analyzer")
+def analyze_text_corpus(paths: List[str], top_n: int = 10, ngram_size: int = 0) -> str:
+    """
+    Analyzes many (or very large) text files in parallel on all CPU cores.
+
+    Args:
+        paths: Paths of the text files making up the corpus
+        top_n: Number of most frequent words (and n-grams) to report, 0 to skip
+        ngram_size: Also count n-grams of this many words (e.g., 2 for bigrams), 0 to skip
+
+    Returns:
+        Merged analysis results for the whole corpus
+    """
+    try:
+        stats = analyze_parallel(paths=paths, track_frequencies=top_n > 0, ngram_size=ngram_size)
+        return f"Corpus Analysis of {len(paths)} file(s): {json.dumps(stats.to_dict(top_n=top_n), indent=2)}"
+    except Exception as e:
+        return f"Error analyzing corpus: {str(e)}"
+
+
+# Cache policies of the @tool functions (file contents may change, so file results expire)
+for _pure_tool in (quick_calc, batch_calc, analyze_text):
+    set_cache_policy(_pure_tool, PURE)
+for _file_tool in (analyze_text_file, analyze_text_corpus):
+    set_cache_policy(_file_tool, ttl(60))
+
+# CPU-bound tools run in the shared worker pool, so a heavy call does not stall
+# other agents (the corpus analyzer starts its own worker processes instead)
+for _cpu_tool in (quick_calc, batch_calc):
+    set_execution_policy(_cpu_tool, cpu_bound(timeout=10))
+for _cpu_tool in (analyze_text, analyze_text_file):
+    set_execution_policy(_cpu_tool, cpu_bound(timeout=60))
+
+
+def create_custom_tools_crew(llm=None):
+    """
+    Create a crew that demonstrates custom tools.
+
+    Args:
+        llm: Optional LLM for both agents (defaults to CrewAI's default model)
+    """
 
     # Create agents with custom tools
     analyst = Agent(
         role="Data Analyst",
         goal="Analyze data and perform calculations",
         backstory="You are a skilled data analyst who loves working with numbers and data.",
-        tools=[CalculatorTool(), DataLoggerTool(), quick_calc, analyze_text],
+        tools=shared_tool_cache().attach(shared_tool_pool().warm().attach([
+            CalculatorTool(), DataLoggerTool(), quick_calc, batch_calc, analyze_text, analyze_text_file,
+            analyze_text_corpus])),
+        llm=llm,
         verbose=True,
         allow_delegation=False
     )
@@ -142,6 +310,7 @@ def create_custom_tools_crew():
         role="Report Writer",
         goal="Create reports based on analysis results",
         backstory="You are a report writer who creates clear summaries of data analysis.",
+        llm=llm,
         verbose=True,
         allow_delegation=False
     )
@@ -154,7 +323,8 @@ def create_custom_tools_crew():
         2. Analyze the text: "CrewAI is a powerful framework for creating collaborative AI agents that work together to solve complex problems."
         3. Log the results of your analysis
 
-        Use the available tools to complete this task.
+        Use the available tools to complete this task. Batch independent
+        calculations into a single tool call where possible.
         """,
         agent=analyst,
         expected_output="Complete analysis with calculations, text analysis, and logged results."
@@ -201,11 +371,18 @@ def main():
         print("-" * 30)
         print(result)
 
-        # Show the log file if it was created
-        if os.path.exists("crewai_log.json"):
-            print("\n📊 Log File Created:")
-            with open("crewai_log.json", 'r') as f:
-                print(json.dumps(json.load(f), indent=2))
+        stats = shared_tool_cache().stats()
+        print(f"\n🗄️  Tool cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"(hit rate {stats['hit_rate']:.0%}, {stats['entries']} entries)")
+        pool_stats = shared_tool_pool().stats()
+        print(f"⚙️  Tool workers: {pool_stats['calls']} calls, {pool_stats['timeouts']} timeouts, "
+              f"{pool_stats['crashes']} crashes")
+
+        # Show the most recent log entries if a log was written
+        if os.path.isdir("crewai_log"):
+            flush_logs()
+            print("\n📊 Latest Log Entries:")
+            print(json.dumps(LogReader("crewai_log").tail(10), indent=2))
 
     except Exception as e:
         print(f"❌ Error running custom tools example: {str(e)}")
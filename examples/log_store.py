@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Append-Only Log Store
+
+Storage engine used by the DataLoggerTool in custom_tools.py:
+- Newline-delimited JSON (one entry per line), so each write is a true append
+- Configurable fsync policy ("always", "interval" or "never")
+- Segment rotation by size, with an index of segment start offsets
+- A reader that streams or tails the log without loading all of it
+- One-time migration from the old JSON-array log file
+- A buffered writer that coalesces entries and flushes them from a background thread
+
+Layout of a log directory:
+
+    crewai_log/
+        index.json              # segment list with first sequence numbers
+        00000000.jsonl          # sealed segment
+        00000001.jsonl          # active segment (appended to)
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import json
+import time
+import atexit
+import bisect
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+
+INDEX_FILE = "index.json"
+SEGMENT_SUFFIX = ".jsonl"
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def _segment_name(number: int) -> str:
+    return f"{number:08d}{SEGMENT_SUFFIX}"
+
+
+def _write_json_atomic(path: str, payload: Dict[str, Any]) -> None:
+    """Write a JSON file via a temporary file and an atomic rename."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _load_index(directory: str) -> List[Dict[str, Any]]:
+    index_path = os.path.join(directory, INDEX_FILE)
+    try:
+        with open(index_path, 'r') as f:
+            return json.load(f)["segments"]
+    except FileNotFoundError:
+        return []
+
+
+def _count_lines(path: str) -> int:
+    count = 0
+    with open(path, 'rb') as f:
+        for _ in f:
+            count += 1
+    return count
+
+
+class LogStore:
+    """
+    Append-only, segmented NDJSON log.
+
+    Appending an entry costs one encoded line written to the active segment,
+    independent of how large the log already is. The index is only rewritten
+    when a segment is sealed, so it stays off the hot path.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = 4 * 1024 * 1024,
+                 fsync: str = "interval", fsync_interval: float = 1.0):
+        """
+        Open (or create) a log store.
+
+        Args:
+            directory: Directory holding the segments and the index
+            max_segment_bytes: Size at which the active segment is sealed
+            fsync: One of "always", "interval" or "never"
+            fsync_interval: Seconds between fsyncs for the "interval" policy
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Use one of {', '.join(FSYNC_POLICIES)}.")
+
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._last_fsync = time.monotonic()
+
+        os.makedirs(directory, exist_ok=True)
+        self._segments = _load_index(directory)
+        if not self._segments:
+            self._segments = [{"name": _segment_name(0), "first_seq": 0, "count": 0}]
+            self._write_index()
+
+        self._recover_active_segment()
+        self._file = open(self._active_path, 'ab')
+
+    @property
+    def _active_path(self) -> str:
+        return os.path.join(self.directory, self._segments[-1]["name"])
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number the next appended entry will receive."""
+        active = self._segments[-1]
+        return active["first_seq"] + active["count"]
+
+    def _recover_active_segment(self) -> None:
+        """Re-count the active segment and drop a torn trailing line, if any."""
+        path = self._active_path
+        if not os.path.exists(path):
+            open(path, 'ab').close()
+
+        with open(path, 'rb+') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    # A crash mid-write left a partial line; cut it off.
+                    f.seek(0)
+                    data = f.read()
+                    f.truncate(data.rfind(b"\n") + 1)
+
+        self._segments[-1]["count"] = _count_lines(path)
+        self._active_bytes = os.path.getsize(path)
+
+    def _write_index(self) -> None:
+        _write_json_atomic(os.path.join(self.directory, INDEX_FILE),
+                           {"version": 1, "segments": self._segments})
+
+    def _rotate(self) -> None:
+        """Seal the active segment and start a new one."""
+        self._sync(force=True)
+        self._file.close()
+
+        number = int(self._segments[-1]["name"].split(".")[0]) + 1
+        self._segments.append({"name": _segment_name(number), "first_seq": self.next_seq, "count": 0})
+        self._write_index()
+
+        self._file = open(self._active_path, 'ab')
+        self._active_bytes = 0
+
+    def _sync(self, force: bool = False) -> None:
+        self._file.flush()
+        if self.fsync == "never" and not force:
+            return
+        now = time.monotonic()
+        if force or self.fsync == "always" or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def append(self, entry: Dict[str, Any]) -> int:
+        """
+        Append a single entry.
+
+        Args:
+            entry: JSON-serialisable dictionary
+
+        Returns:
+            int: Sequence number assigned to the entry
+        """
+        return self.append_many([entry])
+
+    def append_many(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Append several entries with a single write and sync.
+
+        Returns:
+            int: Sequence number assigned to the first entry
+        """
+        lines = [(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+                 for entry in entries]
+
+        with self._lock:
+            first_seq = self.next_seq
+            pending = []
+            pending_bytes = 0
+            for line in lines:
+                if self._active_bytes + pending_bytes + len(line) > self.max_segment_bytes \
+                        and self._active_bytes + pending_bytes > 0:
+                    self._write_lines(pending, pending_bytes)
+                    pending, pending_bytes = [], 0
+                    self._rotate()
+                pending.append(line)
+                pending_bytes += len(line)
+            self._write_lines(pending, pending_bytes)
+            self._sync()
+            return first_seq
+
+    def _write_lines(self, lines: List[bytes], size: int) -> None:
+        if not lines:
+            return
+        self._file.write(b"".join(lines))
+        self._active_bytes += size
+        self._segments[-1]["count"] += len(lines)
+
+    def close(self) -> None:
+        """Sync the active segment and persist the index."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._sync(force=True)
+            self._file.close()
+            self._write_index()
+
+    def __enter__(self) -> "LogStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class LogReader:
+    """Streams or tails a log directory written by LogStore."""
+
+    def __init__(self, directory: str, block_size: int = 64 * 1024):
+        self.directory = directory
+        self.block_size = block_size
+
+    def _segments(self) -> List[Dict[str, Any]]:
+        segments = _load_index(self.directory)
+        # The index may lag behind the active segment, so only trust the
+        # recorded counts of sealed segments.
+        if segments:
+            segments[-1] = dict(segments[-1], count=None)
+        return segments
+
+    def _segment_path(self, segment: Dict[str, Any]) -> str:
+        return os.path.join(self.directory, segment["name"])
+
+    def __len__(self) -> int:
+        segments = self._segments()
+        if not segments:
+            return 0
+        return segments[-1]["first_seq"] + _count_lines(self._segment_path(segments[-1]))
+
+    def iter_entries(self, start_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Stream entries in order, starting at a sequence number.
+
+        The index is used to jump straight to the segment holding start_seq,
+        so earlier segments are never opened.
+        """
+        segments = self._segments()
+        if not segments:
+            return
+
+        first_seqs = [segment["first_seq"] for segment in segments]
+        position = max(bisect.bisect_right(first_seqs, start_seq) - 1, 0)
+
+        for segment in segments[position:]:
+            seq = segment["first_seq"]
+            with open(self._segment_path(segment), 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # a writer is mid-append; stop at the last complete line
+                    if seq >= start_seq:
+                        yield json.loads(line)
+                    seq += 1
+
+    def tail(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the last n entries, reading segments backwards from the end.
+
+        Only the trailing blocks needed to find n complete lines are read.
+        """
+        if n <= 0:
+            return []
+
+        lines: List[bytes] = []
+        for segment in reversed(self._segments()):
+            path = self._segment_path(segment)
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                remainder = b""
+                at_end = True
+                while position > 0 and len(lines) < n:
+                    read_size = min(self.block_size, position)
+                    position -= read_size
+                    f.seek(position)
+                    block = f.read(read_size) + remainder
+                    if at_end:
+                        # Anything after the final newline is a line still being written,
+                        # which may span several blocks: skip back to that newline.
+                        newline = block.rfind(b"\n")
+                        if newline < 0:
+                            remainder = b""
+                            continue
+                        block = block[:newline]
+                        at_end = False
+                    parts = block.split(b"\n")
+                    remainder = parts.pop(0)
+                    lines[:0] = [part for part in parts if part]
+                if remainder and len(lines) < n:
+                    lines.insert(0, remainder)
+            if len(lines) >= n:
+                break
+
+        return [json.loads(line) for line in lines[-n:]]
+
+
+class BufferedLogWriter:
+    """
+    Coalesces log entries in memory and flushes them from a background thread.
+
+    write() only appends to an in-process buffer, so callers never touch the
+    file. The flush thread writes the buffered entries as one batch when
+    max_batch entries are waiting or flush_interval seconds have passed,
+    whichever comes first. Being the only writer of its store, it also stops
+    concurrent callers from racing on the same file. Pending entries are
+    drained on close() and at interpreter exit.
+    """
+
+    def __init__(self, store: LogStore, max_batch: int = 256, flush_interval: float = 0.5,
+                 max_pending: int = 10000):
+        """
+        Start a buffered writer for a store.
+
+        Args:
+            store: Log store the batches are appended to
+            max_batch: Number of buffered entries that triggers a flush
+            flush_interval: Maximum seconds an entry waits in the buffer
+            max_pending: Buffer size at which write() blocks until a flush
+        """
+        self.store = store
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._enqueued = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closed = False
+        self._error: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._flush_loop, name=f"log-flush:{store.directory}",
+                                        daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, entry: Dict[str, Any]) -> None:
+        """Queue an entry for the next flush."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Log writer for {self.store.directory} is closed")
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise RuntimeError(f"Previous log flush failed: {error}")
+            while len(self._buffer) >= self.max_pending:
+                self._cond.wait()
+            self._buffer.append(entry)
+            self._enqueued += 1
+            if len(self._buffer) >= self.max_batch:
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every entry queued so far has been written.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        with self._cond:
+            target = self._enqueued
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written >= target or not self._thread.is_alive(),
+                                       timeout)
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.flush_interval
+                while not (self._closed or self._flush_requested or len(self._buffer) >= self.max_batch):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._buffer = self._buffer, []
+                self._flush_requested = False
+                closing = self._closed
+
+            error = None
+            if batch:
+                try:
+                    self.store.append_many(batch)
+                except Exception as e:
+                    print(f"❌ Failed to flush {len(batch)} log entries: {e}")
+                    error = e
+
+            with self._cond:
+                self._error = error or self._error
+                self._written += len(batch)
+                self._cond.notify_all()
+                if closing and not self._buffer:
+                    return
+
+    def close(self) -> None:
+        """Drain the buffer, stop the flush thread and close the store."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        self.store.close()
+        atexit.unregister(self.close)
+
+
+def migrate_json_array(legacy_path: str, store: LogStore) -> int:
+    """
+    One-time migration from the old JSON-array log format.
+
+    The legacy file is renamed to '<name>.migrated' afterwards so the
+    migration never runs twice.
+
+    Args:
+        legacy_path: Path to a file containing a JSON array of entries
+        store: Destination log store
+
+    Returns:
+        int: Number of migrated entries
+    """
+    with open(legacy_path, 'r') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError(f"{legacy_path} does not contain a JSON array of log entries")
+
+    if entries:
+        store.append_many(entries)
+
+    os.replace(legacy_path, f"{legacy_path}.migrated")
+    return len(entries)
+
+
+def log_directory_for(filename: str) -> str:
+    """Map a DataLoggerTool filename ('crewai_log' or legacy 'crewai_log.json') to its log directory."""
+    return filename[:-len(".json")] if filename.endswith(".json") else filename
+
+
+def open_log_store(filename: str, **options: Any) -> LogStore:
+    """
+    Open the log store for a DataLoggerTool filename, migrating a legacy
+    JSON-array file with the same base name on first use.
+    """
+    directory = log_directory_for(filename)
+    store = LogStore(directory, **options)
+
+    legacy_path = f"{directory}.json"
+    if os.path.isfile(legacy_path):
+        count = migrate_json_array(legacy_path, store)
+        print(f"📦 Migrated {count} entries from {legacy_path} to {directory}/")
+
+    return store
+
+
+def main() -> None:
+    """Print the tail of a log directory: python log_store.py [directory] [n]."""
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "crewai_log"
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    if not os.path.isdir(directory):
+        print(f"❌ No log directory found at {directory}")
+        return
+
+    reader = LogReader(directory)
+    print(f"📊 {len(reader)} entries in {directory}/ (showing last {n})")
+    for entry in reader.tail(n):
+        print(json.dumps(entry))
+
+
+if __name__ == "__main__":
+    main()
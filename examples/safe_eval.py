@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Safe Expression Engine
+
+Sandboxed arithmetic evaluator used by the calculator tools in custom_tools.py:
+- Expressions are parsed once and only whitelisted AST nodes are accepted
+- Each expression is compiled into a tree of closures and kept in an LRU cache
+  keyed by the normalized expression, so agent retries skip parsing entirely
+- Operand size and exponent limits stop expressions like 9**9**9 from burning CPU
+- Batch entry points evaluate many expressions, or one expression over NumPy
+  arrays, in a single call
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import ast
+import math
+import operator
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for evaluation over arrays
+    np = None
+
+
+MAX_EXPRESSION_LENGTH = 1000
+MAX_AST_NODES = 200
+MAX_INT_BITS = 4096
+MAX_EXPONENT = 1000
+CACHE_SIZE = 1024
+
+Number = Union[int, float]
+
+CONSTANTS: Dict[str, float] = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+# name -> (scalar implementation, NumPy implementation name)
+FUNCTIONS: Dict[str, tuple] = {
+    "abs": (abs, "abs"),
+    "round": (round, "round"),
+    "min": (min, "minimum"),
+    "max": (max, "maximum"),
+    "sqrt": (math.sqrt, "sqrt"),
+    "exp": (math.exp, "exp"),
+    "log": (math.log, "log"),
+    "log10": (math.log10, "log10"),
+    "sin": (math.sin, "sin"),
+    "cos": (math.cos, "cos"),
+    "tan": (math.tan, "tan"),
+    "floor": (math.floor, "floor"),
+    "ceil": (math.ceil, "ceil"),
+}
+
+BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression is rejected or fails to evaluate."""
+
+
+def _is_array(value: Any) -> bool:
+    return np is not None and isinstance(value, np.ndarray)
+
+
+def _check_operand(value: Any) -> Any:
+    """Reject integers that grew past MAX_INT_BITS and non-real results such as (-8) ** 0.5."""
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise ExpressionError(f"Result exceeds the {MAX_INT_BITS}-bit operand limit")
+    if isinstance(value, complex):
+        raise ExpressionError("Result is not a real number")
+    return value
+
+
+def _check_power(base: Any, exponent: Any) -> None:
+    """Reject exponents that would produce enormous results."""
+    largest = float(np.max(np.abs(exponent))) if _is_array(exponent) else abs(exponent)
+    if largest > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent exceeds the limit of {MAX_EXPONENT}")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        if base.bit_length() * exponent > MAX_INT_BITS:
+            raise ExpressionError(f"Result exceeds the {MAX_INT_BITS}-bit operand limit")
+
+
+def _compile_node(node: ast.AST) -> Callable[[Dict[str, Any]], Any]:
+    """Turn a whitelisted AST node into a closure taking the variable bindings."""
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body)
+
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ExpressionError(f"Unsupported constant: {value!r}")
+        _check_operand(value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            constant = CONSTANTS[name]
+            return lambda env: constant
+
+        def load(env: Dict[str, Any]) -> Any:
+            try:
+                return env[name]
+            except KeyError:
+                raise ExpressionError(f"Unknown name: {name}") from None
+        return load
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+        op = BINARY_OPERATORS[type(node.op)]
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+
+        if isinstance(node.op, ast.Pow):
+            def power(env: Dict[str, Any]) -> Any:
+                base, exponent = left(env), right(env)
+                _check_power(base, exponent)
+                return _check_operand(op(base, exponent))
+            return power
+
+        return lambda env: _check_operand(op(left(env), right(env)))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS \
+            and not node.keywords:
+        scalar_fn, numpy_name = FUNCTIONS[node.func.id]
+        args = [_compile_node(arg) for arg in node.args]
+
+        def call(env: Dict[str, Any]) -> Any:
+            values = [arg(env) for arg in args]
+            if any(_is_array(value) for value in values):
+                if numpy_name in ("minimum", "maximum"):
+                    # Element-wise over any number of arguments, like the scalar min()/max().
+                    if not values:
+                        raise ExpressionError(f"{node.func.id}() needs at least one argument")
+                    return reduce(getattr(np, numpy_name), values)
+                return getattr(np, numpy_name)(*values)
+            return _check_operand(scalar_fn(*values))
+        return call
+
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+class CompiledExpression:
+    """A validated expression compiled into a closure tree."""
+
+    def __init__(self, source: str, tree: ast.Expression):
+        self.source = source
+        self.names = sorted({n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+                            - set(CONSTANTS) - set(FUNCTIONS))
+        self._fn = _compile_node(tree)
+
+    def __call__(self, variables: Optional[Dict[str, Any]] = None) -> Any:
+        try:
+            return self._fn(variables or {})
+        except ExpressionError:
+            raise
+        except ZeroDivisionError:
+            raise ExpressionError("Division by zero") from None
+        except (ArithmeticError, ValueError, TypeError) as e:
+            raise ExpressionError(str(e)) from None
+
+
+def normalize(expression: str) -> str:
+    """Collapse whitespace so trivially different spellings share a cache entry."""
+    return " ".join(expression.split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_normalized(expression: str) -> CompiledExpression:
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(expression, mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid syntax: {e.msg}") from None
+    if sum(1 for _ in ast.walk(tree)) > MAX_AST_NODES:
+        raise ExpressionError(f"Expression has more than {MAX_AST_NODES} syntax nodes")
+    return CompiledExpression(expression, tree)
+
+
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Compile an expression, reusing the cached result for repeated expressions.
+
+    Raises:
+        ExpressionError: If the expression contains anything but arithmetic
+    """
+    return _compile_normalized(normalize(expression))
+
+
+def evaluate(expression: str, variables: Optional[Dict[str, Any]] = None) -> Any:
+    """
+    Safely evaluate an arithmetic expression.
+
+    Args:
+        expression: Expression such as "2 + 3 * 4" or "sqrt(x) / 2"
+        variables: Optional values for names used in the expression
+
+    Returns:
+        The numeric result
+
+    Raises:
+        ExpressionError: If the expression is rejected or cannot be evaluated
+    """
+    return compile_expression(expression)(variables)
+
+
+def evaluate_many(expressions: List[str]) -> List[Union[Number, ExpressionError]]:
+    """
+    Evaluate a batch of expressions, reporting errors per expression.
+
+    Returns:
+        A list with either the result or the ExpressionError for each expression
+    """
+    results: List[Union[Number, ExpressionError]] = []
+    for expression in expressions:
+        try:
+            results.append(evaluate(expression))
+        except ExpressionError as e:
+            results.append(e)
+    return results
+
+
+def evaluate_vectorized(expression: str, variables: Dict[str, Any]) -> Any:
+    """
+    Evaluate one expression over whole arrays in a single NumPy pass.
+
+    Args:
+        expression: Expression using the names in variables, e.g. "a * b + 1"
+        variables: Mapping of names to sequences or NumPy arrays
+
+    Returns:
+        numpy.ndarray: Element-wise results (division by zero yields inf)
+
+    Raises:
+        ExpressionError: The expression is rejected, or any element overflows
+            or has no real result (NaN)
+    """
+    if np is None:
+        raise ExpressionError("NumPy is required for vectorized evaluation")
+
+    arrays = {name: np.asarray(values, dtype=float) for name, values in variables.items()}
+    with np.errstate(divide="ignore", over="raise", invalid="raise"):
+        return np.asarray(compile_expression(expression)(arrays))
+
+
+def cache_info() -> Any:
+    """Hit/miss statistics of the compiled-expression cache."""
+    return _compile_normalized.cache_info()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Log Store Tests
+
+Checks LogReader.tail() against a log whose active segment ends with a
+batch still being written (an unterminated line).
+
+Run with: python -m pytest examples/test_log_store.py
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+
+from log_store import LogReader, LogStore
+
+
+def write_entries(directory: str, count: int) -> str:
+    """Append count entries and return the path of the active segment."""
+    with LogStore(directory, fsync="never") as store:
+        store.append_many([{"n": number} for number in range(count)])
+        return store._active_path
+
+
+def test_tail_skips_partial_line_longer_than_a_block(tmp_path):
+    directory = str(tmp_path / "log")
+    path = write_entries(directory, 5)
+    with open(path, 'ab') as f:
+        f.write(b'{"n": 5, "text": "' + b"x" * 200_000)  # a batch still being written
+
+    assert LogReader(directory).tail(3) == [{"n": 2}, {"n": 3}, {"n": 4}]
+    assert LogReader(directory, block_size=16).tail(10) == [{"n": number} for number in range(5)]
+
+
+def test_tail_reads_across_small_blocks(tmp_path):
+    directory = str(tmp_path / "log")
+    write_entries(directory, 50)
+
+    assert LogReader(directory, block_size=7).tail(4) == [{"n": number} for number in range(46, 50)]
+    assert os.path.exists(os.path.join(directory, "index.json"))
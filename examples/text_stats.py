@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Streaming Text Statistics
+
+Single-pass text analysis used by the text analyzer tools in custom_tools.py:
+- Accepts a string, an iterator of chunks, or a file path read in chunks
+- Computes every statistic in one pass with bounded memory
+- Counts unique words exactly up to a threshold, then switches to HyperLogLog
+- Results are mergeable, so partial analyses of separate chunks can be combined
+- Optional word and n-gram frequencies
+- A parallel mode that analyzes word-aligned chunks in a process pool and
+  merges the partial results into exactly what a serial run produces
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import math
+import hashlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+DEFAULT_EXACT_UNIQUE_LIMIT = 100_000
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_PARALLEL_CHUNK_BYTES = 16 * 1024 * 1024
+ASCII_WHITESPACE = b" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f"
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch.
+
+    Words are hashed with BLAKE2b rather than hash(), so sketches built in
+    different processes agree and can be merged.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, item: str) -> None:
+        """Add an item to the sketch."""
+        value = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = value >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = value & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Fold another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        """Estimated number of distinct items."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class TextStats:
+    """
+    Mergeable text statistics accumulator.
+
+    Feed text with update() in chunks of any size; a word split across two
+    chunks is carried over and counted once. Call finish() after the last
+    chunk (to_dict() does this for you).
+    """
+
+    def __init__(self, exact_unique_limit: int = DEFAULT_EXACT_UNIQUE_LIMIT,
+                 track_frequencies: bool = False, ngram_size: int = 0):
+        """
+        Args:
+            exact_unique_limit: Number of distinct words tracked exactly before
+                switching to a HyperLogLog estimate
+            track_frequencies: Count how often each word occurs
+            ngram_size: Count n-grams of this many words (0 disables)
+        """
+        if ngram_size == 1 or ngram_size < 0:
+            raise ValueError("ngram_size must be 0 (disabled) or at least 2")
+        self.exact_unique_limit = exact_unique_limit
+        self.ngram_size = ngram_size
+        self.character_count = 0
+        self.word_count = 0
+        self.total_word_length = 0
+        self.word_frequencies: Optional[Counter] = Counter() if track_frequencies else None
+        self.ngram_frequencies: Optional[Counter] = Counter() if ngram_size else None
+        self._unique_words: Optional[Set[str]] = set()
+        self._sketch: Optional[HyperLogLog] = None
+        self._carry = ""
+        # First and last (n - 1) words, so n-grams spanning a merge boundary can be counted
+        self._head: List[str] = []
+        self._tail: List[str] = []
+
+    @property
+    def unique_is_exact(self) -> bool:
+        return self._sketch is None
+
+    @property
+    def unique_words(self) -> int:
+        if self._sketch is not None:
+            return self._sketch.count()
+        return len(self._unique_words)
+
+    def _switch_to_sketch(self) -> None:
+        self._sketch = HyperLogLog()
+        for word in self._unique_words:
+            self._sketch.add(word)
+        self._unique_words = None
+
+    def _add_words(self, text: str) -> None:
+        words = text.split()
+        self.word_count += len(words)
+        self.total_word_length += sum(map(len, words))
+
+        if self._sketch is None:
+            self._unique_words.update(words)
+            if len(self._unique_words) > self.exact_unique_limit:
+                self._switch_to_sketch()
+        else:
+            for word in words:
+                self._sketch.add(word)
+
+        if self.word_frequencies is not None:
+            self.word_frequencies.update(words)
+        if self.ngram_size:
+            self._add_ngrams(words)
+
+    def _add_ngrams(self, words: List[str]) -> None:
+        context = self.ngram_size - 1
+        if len(self._head) < context:
+            self._head.extend(words[:context - len(self._head)])
+        sequence = self._tail + words
+        self.ngram_frequencies.update(
+            " ".join(sequence[i:i + self.ngram_size]) for i in range(len(sequence) - context))
+        self._tail = sequence[-context:]
+
+    def update(self, chunk: str) -> None:
+        """Add the next chunk of text."""
+        self.character_count += len(chunk)
+        text = self._carry + chunk
+
+        # Hold back a trailing partial word until the next chunk arrives.
+        end = len(text)
+        while end and not text[end - 1].isspace():
+            end -= 1
+        self._carry = text[end:]
+        self._add_words(text[:end])
+
+    def finish(self) -> "TextStats":
+        """Count the trailing word held back from the last chunk."""
+        if self._carry:
+            self._add_words(self._carry)
+            self._carry = ""
+        return self
+
+    def merge(self, other: "TextStats", contiguous: bool = True) -> "TextStats":
+        """
+        Fold in the statistics of another, finished accumulator.
+
+        With contiguous=True the other text is taken to directly follow this
+        one, and the result is the same as analysing both in one pass provided
+        they were split on a word boundary. Use contiguous=False for separate
+        documents, so no n-gram spans the two.
+        """
+        self.finish()
+        other.finish()
+        if self.ngram_size != other.ngram_size \
+                or (self.word_frequencies is None) != (other.word_frequencies is None):
+            raise ValueError("Cannot merge TextStats with different frequency options")
+
+        if self.ngram_size:
+            context = self.ngram_size - 1
+            if contiguous:
+                # Counts the n-grams that start in this text and end in the other.
+                self._add_ngrams(other._head)
+                if other.word_count >= context:
+                    self._tail = list(other._tail)
+            else:
+                self._tail = list(other._tail)
+            self.ngram_frequencies.update(other.ngram_frequencies)
+        if self.word_frequencies is not None:
+            self.word_frequencies.update(other.word_frequencies)
+
+        self.character_count += other.character_count
+        self.word_count += other.word_count
+        self.total_word_length += other.total_word_length
+
+        if self._sketch is None and other._sketch is None:
+            self._unique_words.update(other._unique_words)
+            if len(self._unique_words) > self.exact_unique_limit:
+                self._switch_to_sketch()
+        else:
+            if self._sketch is None:
+                self._switch_to_sketch()
+            if other._sketch is not None:
+                self._sketch.merge(other._sketch)
+            else:
+                for word in other._unique_words:
+                    self._sketch.add(word)
+        return self
+
+    def to_dict(self, top_n: int = 10) -> Dict[str, Any]:
+        """Statistics in the format reported by the Text Analyzer tool."""
+        self.finish()
+        average = self.total_word_length / self.word_count if self.word_count > 0 else 0
+        result = {
+            "character_count": self.character_count,
+            "word_count": self.word_count,
+            "average_word_length": round(average, 2),
+            "unique_words": self.unique_words,
+            "unique_words_exact": self.unique_is_exact,
+        }
+        if self.word_frequencies is not None:
+            result["top_words"] = _most_common(self.word_frequencies, top_n)
+        if self.ngram_frequencies is not None:
+            result["top_ngrams"] = _most_common(self.ngram_frequencies, top_n)
+        return result
+
+
+def _most_common(counter: Counter, n: int) -> List[Tuple[str, int]]:
+    """Top n items, ties broken alphabetically so merge order never matters."""
+    return sorted(counter.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+
+def analyze_stream(chunks: Iterable[str], exact_unique_limit: int = DEFAULT_EXACT_UNIQUE_LIMIT,
+                   track_frequencies: bool = False, ngram_size: int = 0) -> TextStats:
+    """
+    Analyze text arriving as an iterator of chunks in a single pass.
+
+    Args:
+        chunks: Any iterable of strings (a list, a generator, an open file...)
+        exact_unique_limit: Distinct words tracked exactly before estimating
+        track_frequencies: Count how often each word occurs
+        ngram_size: Count n-grams of this many words (0 disables)
+
+    Returns:
+        TextStats: The finished statistics
+    """
+    stats = TextStats(exact_unique_limit, track_frequencies, ngram_size)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats.finish()
+
+
+def iter_file_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8") -> Iterable[str]:
+    """Yield a text file in chunks of chunk_size characters."""
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def analyze_file(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = "utf-8",
+                 exact_unique_limit: int = DEFAULT_EXACT_UNIQUE_LIMIT,
+                 track_frequencies: bool = False, ngram_size: int = 0) -> TextStats:
+    """
+    Analyze a text file without loading it into memory.
+
+    Args:
+        path: File to analyze
+        chunk_size: Characters read per chunk
+        encoding: File encoding
+        exact_unique_limit: Distinct words tracked exactly before estimating
+        track_frequencies: Count how often each word occurs
+        ngram_size: Count n-grams of this many words (0 disables)
+
+    Returns:
+        TextStats: The finished statistics
+    """
+    return analyze_stream(iter_file_chunks(path, chunk_size, encoding), exact_unique_limit,
+                          track_frequencies, ngram_size)
+
+
+def split_file(path: str, chunk_bytes: int = DEFAULT_PARALLEL_CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """
+    Split a file into (start, end) byte ranges that begin and end on whitespace.
+
+    Each nominal boundary is moved forward to the next ASCII whitespace byte,
+    so no word (and, for UTF-8, no multi-byte character) is cut in two.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            f.seek(end)
+            while end < size:
+                block = f.read(64 * 1024)
+                offsets = [i for i in (block.find(bytes([c])) for c in ASCII_WHITESPACE) if i >= 0]
+                if offsets:
+                    end += min(offsets) + 1
+                    break
+                end += len(block)
+            ranges.append((start, min(end, size)))
+            start = end
+    return ranges
+
+
+def split_text(text: str, parts: int) -> List[str]:
+    """Split an in-memory string into about `parts` pieces on whitespace."""
+    size = max(len(text) // max(parts, 1), 1)
+    pieces = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        while end < len(text) and not text[end - 1].isspace():
+            end += 1
+        pieces.append(text[start:end])
+        start = end
+    return pieces
+
+
+def _analyze_file_range(path: str, start: int, end: int, encoding: str,
+                        options: Dict[str, Any]) -> TextStats:
+    """Worker: analyze one byte range of a file."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    return analyze_stream([text], **options)
+
+
+def _analyze_text_piece(text: str, options: Dict[str, Any]) -> TextStats:
+    """Worker: analyze one piece of an in-memory string."""
+    return analyze_stream([text], **options)
+
+
+def analyze_parallel(paths: Optional[List[str]] = None, text: Optional[str] = None,
+                     workers: Optional[int] = None, chunk_bytes: int = DEFAULT_PARALLEL_CHUNK_BYTES,
+                     encoding: str = "utf-8", exact_unique_limit: int = DEFAULT_EXACT_UNIQUE_LIMIT,
+                     track_frequencies: bool = False, ngram_size: int = 0) -> TextStats:
+    """
+    Analyze a corpus on several cores and merge the partial statistics.
+
+    Every file is split into word-aligned byte ranges, the ranges are analyzed
+    in a ProcessPoolExecutor, and the results are merged in order. Ranges of
+    the same file are merged contiguously and separate files are merged as
+    separate documents, so the result equals a serial run that analyzes each
+    file with analyze_file() and merges the results with contiguous=False.
+
+    Args:
+        paths: Files making up the corpus
+        text: Alternatively, one large in-memory string
+        workers: Number of worker processes (defaults to the CPU count)
+        chunk_bytes: Target size of each file range
+        encoding: File encoding (must be ASCII-compatible, e.g. UTF-8)
+        exact_unique_limit: Distinct words tracked exactly before estimating
+        track_frequencies: Count how often each word occurs
+        ngram_size: Count n-grams of this many words (0 disables)
+
+    Returns:
+        TextStats: The merged statistics
+    """
+    if (paths is None) == (text is None):
+        raise ValueError("Pass either paths or text")
+
+    options = {"exact_unique_limit": exact_unique_limit, "track_frequencies": track_frequencies,
+               "ngram_size": ngram_size}
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if text is not None:
+            futures = [[pool.submit(_analyze_text_piece, piece, options)
+                        for piece in split_text(text, workers * 4)]]
+        else:
+            futures = [[pool.submit(_analyze_file_range, path, start, end, encoding, options)
+                        for start, end in split_file(path, chunk_bytes)]
+                       for path in paths]
+
+        result = TextStats(**options)
+        for file_futures in futures:
+            document = TextStats(**options)
+            for future in file_futures:
+                document.merge(future.result())
+            result.merge(document, contiguous=False)
+
+    return result
+
+
+def main() -> None:
+    """Analyze a corpus from the command line: python text_stats.py [options] FILE..."""
+    import json
+    import time
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Parallel single-pass text statistics")
+    parser.add_argument("paths", nargs="+", help="Text files to analyze")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=0, help="Report the N most frequent words and n-grams")
+    parser.add_argument("--ngrams", type=int, default=0, help="Count n-grams of this size")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = analyze_parallel(paths=args.paths, workers=args.workers,
+                             track_frequencies=args.top > 0, ngram_size=args.ngrams)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps(stats.to_dict(top_n=args.top), indent=2))
+    print(f"⏱️  Analyzed {len(args.paths)} file(s) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Tool Result Cache
+
+Per-tool caching policies for CrewAI tools:
+- Each tool declares a policy: PURE (same arguments, same result; cached
+  until evicted), IMPURE (side effects; never cached) or a TTL (cached for
+  a number of seconds, e.g. tools reading files that may change)
+- BaseTool subclasses declare it with a `cache_policy` class attribute;
+  `@tool` functions get one with `set_cache_policy()`; tools without a
+  policy are treated as IMPURE
+- Results are keyed by the tool name and its canonicalized arguments, kept
+  in a memory-bounded LRU shared by every agent and crew in the process
+- Hit/miss counters per tool
+
+Usage:
+    tools = shared_tool_cache().attach([CalculatorTool(), quick_calc])
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import json
+import time
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from crewai.tools import BaseTool
+from crewai.tools.base_tool import Tool
+
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How a tool's results may be cached (ttl=None: no expiry)."""
+
+    cacheable: bool
+    ttl: Optional[float] = None
+
+    def __str__(self) -> str:
+        if not self.cacheable:
+            return "impure"
+        return "pure" if self.ttl is None else f"ttl={self.ttl:g}s"
+
+
+PURE = CachePolicy(cacheable=True)
+IMPURE = CachePolicy(cacheable=False)
+
+
+def ttl(seconds: float) -> CachePolicy:
+    """Policy for results that stay valid for a limited time."""
+    return CachePolicy(cacheable=True, ttl=seconds)
+
+
+def set_cache_policy(tool: BaseTool, policy: CachePolicy) -> BaseTool:
+    """Declare the cache policy of a tool instance (for `@tool` functions)."""
+    object.__setattr__(tool, "cache_policy", policy)
+    return tool
+
+
+def cache_policy_of(tool: BaseTool) -> CachePolicy:
+    return getattr(tool, "cache_policy", None) or IMPURE
+
+
+def canonicalize(value: Any) -> Any:
+    """JSON-compatible form of tool arguments, independent of key order and container types."""
+    if isinstance(value, dict):
+        return {str(key): canonicalize(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return canonicalize(value.tolist())
+    if hasattr(value, "model_dump"):  # pydantic models
+        return canonicalize(value.model_dump())
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
+
+
+def argument_key(tool_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    payload = {"tool": tool_name, "args": canonicalize(args), "kwargs": canonicalize(kwargs)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _result_size(result: Any) -> int:
+    return len(result.encode("utf-8")) if isinstance(result, str) else len(repr(result))
+
+
+class ToolCache:
+    """Thread-safe, memory-bounded LRU of tool results."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Total size of cached results above which LRU entries are evicted
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool_name: str, counter: str) -> None:
+        counters = self._counters.setdefault(tool_name, {"hits": 0, "misses": 0, "uncached": 0})
+        counters[counter] += 1
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """(found, result) for a key; expired entries count as missing."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            result, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.total_bytes -= size
+                return False, None
+            self._entries.move_to_end(key)
+            return True, result
+
+    def put(self, key: str, result: Any, policy: CachePolicy) -> None:
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + policy.ttl if policy.ttl is not None else None
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (result, size, expires_at)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def call(self, tool_name: str, policy: CachePolicy, function: Callable[..., Any],
+             *args: Any, **kwargs: Any) -> Any:
+        """Return a cached result, or run the function and cache what it returns (unless it is an error message)."""
+        if not policy.cacheable:
+            with self._lock:
+                self._count(tool_name, "uncached")
+            return function(*args, **kwargs)
+
+        key = argument_key(tool_name, args, kwargs)
+        found, result = self.get(key)
+        with self._lock:
+            self._count(tool_name, "hits" if found else "misses")
+        if found:
+            return result
+
+        result = function(*args, **kwargs)
+        if not (isinstance(result, str) and result.startswith("Error")):
+            self.put(key, result, policy)
+        return result
+
+    def _cached(self, tool_name: str, policy: CachePolicy, function: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(function)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            return self.call(tool_name, policy, function, *args, **kwargs)
+        cached._tool_wrapper_tag = "tool_cache"
+        return cached
+
+    def attach(self, tools: List[BaseTool]) -> List[BaseTool]:
+        """Route every run of the given tools through this cache (in place, once per tool)."""
+        for tool in tools:
+            attribute = "func" if isinstance(tool, Tool) else "_run"
+            current = getattr(tool, attribute)
+            wrapped = current
+            while wrapped is not None and getattr(wrapped, "_tool_wrapper_tag", None) != "tool_cache":
+                wrapped = getattr(wrapped, "__wrapped__", None)
+            if wrapped is None:
+                object.__setattr__(tool, attribute, self._cached(tool.name, cache_policy_of(tool), current))
+        return tools
+
+    def stats(self) -> Dict[str, Any]:
+        """Overall and per-tool hit rates, size and evictions."""
+        with self._lock:
+            per_tool = {name: dict(counters) for name, counters in self._counters.items()}
+            entries = len(self._entries)
+        hits = sum(counters["hits"] for counters in per_tool.values())
+        misses = sum(counters["misses"] for counters in per_tool.values())
+        for counters in per_tool.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "evictions": self.evictions,
+            "tools": per_tool,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+_shared_cache: Optional[ToolCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_tool_cache() -> ToolCache:
+    """The tool cache shared by every agent and crew in the process."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ToolCache()
+        return _shared_cache
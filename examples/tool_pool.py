@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+Tool Process Pool
+
+Runs CPU-bound CrewAI tools in a warm pool of worker processes instead of the
+agent's thread:
+- Each tool declares an execution policy: INLINE (run in the calling thread,
+  the default) or cpu_bound(timeout) (run in a worker process)
+- BaseTool subclasses declare it with an `execution_policy` class attribute;
+  `@tool` functions get one with `set_execution_policy()`
+- Workers are started once and reused; they run with an address-space
+  limit, so a runaway call fails with an error instead of exhausting the host
+- Workers import the preloaded modules when they start and a tool's module
+  on its first call there; each reports back when done, and only then does
+  the call's timeout start (warm() starts the workers ahead of the first call)
+- Calls wait for a free worker first come first served; time spent queued
+  does not count against the timeout either
+- Calls that exceed their timeout get an error result, and the stuck worker
+  alone is killed and replaced; calls running in other workers carry on
+- Large text arguments travel through shared memory rather than the pipe
+- While a call runs in a worker, the calling thread waits without holding
+  the GIL, so other agents keep running; call_async() awaits the result on
+  an asyncio event loop without a thread
+
+Workers import the tool by module and name, so tools must be defined at
+module level (BaseTool subclasses must be constructible without arguments).
+
+Usage:
+    tools = shared_tool_pool().attach([CalculatorTool(), quick_calc])
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import sys
+import atexit
+import asyncio
+import functools
+import importlib
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from crewai.tools import BaseTool
+from crewai.tools.base_tool import Tool
+
+try:
+    import resource
+except ImportError:  # Windows: no address-space limit
+    resource = None
+
+
+DEFAULT_TIMEOUT = 30.0
+STARTUP_TIMEOUT = 120.0
+DEFAULT_MEMORY_LIMIT_MB = 2048
+SHARED_MEMORY_THRESHOLD = 256 * 1024
+
+
+@dataclass(frozen=True)
+class ExecutionPolicy:
+    """Where a tool runs: inline in the agent's thread, or isolated in a worker process."""
+
+    isolated: bool
+    timeout: Optional[float] = None
+
+    def __str__(self) -> str:
+        return f"process(timeout={self.timeout:g}s)" if self.isolated else "inline"
+
+
+INLINE = ExecutionPolicy(isolated=False)
+
+
+def cpu_bound(timeout: float = DEFAULT_TIMEOUT) -> ExecutionPolicy:
+    """Policy for CPU-heavy tools, run in a worker process with a per-call timeout."""
+    return ExecutionPolicy(isolated=True, timeout=timeout)
+
+
+def set_execution_policy(tool: BaseTool, policy: ExecutionPolicy) -> BaseTool:
+    """Declare the execution policy of a tool instance (for `@tool` functions)."""
+    object.__setattr__(tool, "execution_policy", policy)
+    return tool
+
+
+def execution_policy_of(tool: BaseTool) -> ExecutionPolicy:
+    return getattr(tool, "execution_policy", None) or INLINE
+
+
+ToolRef = Tuple[str, str, bool]  # (module, attribute, is a BaseTool subclass)
+
+
+def tool_ref(tool: BaseTool) -> ToolRef:
+    """How a worker process finds the tool: a module-level @tool function or BaseTool subclass."""
+    if isinstance(tool, Tool):
+        function = tool.func
+        while hasattr(function, "__wrapped__"):
+            function = function.__wrapped__
+        return _importable(function.__module__), function.__name__, False
+    return _importable(type(tool).__module__), type(tool).__qualname__, True
+
+
+def _importable(module: str) -> str:
+    """Name under which a worker can import a module (a script run as __main__ is imported by file name)."""
+    main_file = getattr(sys.modules.get("__main__"), "__file__", None)
+    if module == "__main__" and main_file:
+        return os.path.splitext(os.path.basename(main_file))[0]
+    return module
+
+
+@dataclass(frozen=True)
+class SharedText:
+    """A large string argument placed in a shared-memory block."""
+
+    name: str
+    size: int
+
+
+# --- worker side -----------------------------------------------------------
+
+_worker_functions: Dict[ToolRef, Callable[..., Any]] = {}
+
+
+def _init_worker(memory_limit_mb: Optional[int], preload: Tuple[str, ...]) -> None:
+    # One BLAS thread per worker: the pool already provides the parallelism, and
+    # per-thread BLAS buffers would eat into the address-space limit.
+    for variable in ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(variable, "1")
+    if resource is not None and memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    for module in preload:
+        importlib.import_module(module)
+
+
+def _resolve(ref: ToolRef) -> Callable[..., Any]:
+    function = _worker_functions.get(ref)
+    if function is None:
+        module, name, is_class = ref
+        target = getattr(importlib.import_module(module), name)
+        function = target()._run if is_class else target.func
+        _worker_functions[ref] = function
+    return function
+
+
+def _attach_shared(block: SharedText) -> str:
+    try:
+        shm = shared_memory.SharedMemory(name=block.name, track=False)
+    except TypeError:  # Python < 3.13: workers share the caller's resource tracker, which unlinks the block
+        shm = shared_memory.SharedMemory(name=block.name)
+    try:
+        return bytes(shm.buf[:block.size]).decode("utf-8")
+    finally:
+        shm.close()
+
+
+def _unpack(value: Any) -> Any:
+    return _attach_shared(value) if isinstance(value, SharedText) else value
+
+
+def _run_in_worker(ref: ToolRef, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    args = tuple(_unpack(arg) for arg in args)
+    kwargs = {key: _unpack(value) for key, value in kwargs.items()}
+    return _resolve(ref)(*args, **kwargs)
+
+
+def _send_reply(connection: Connection, reply: Tuple[str, Any]) -> None:
+    try:
+        connection.send(reply)
+    except Exception as e:  # unpicklable result or exception
+        connection.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+def _worker_main(connection: Connection, memory_limit_mb: Optional[int], preload: Tuple[str, ...]) -> None:
+    """
+    Worker process loop: run one call at a time from the pipe until the pool closes it.
+
+    Replies "ready" once the preloaded modules are imported, and "loaded"
+    before running the first call of each tool (after importing its module),
+    so the caller can tell import time from the call's own run time.
+    """
+    try:
+        _init_worker(memory_limit_mb, preload)
+    except BaseException as e:
+        _send_reply(connection, ("error", e))
+        return
+    connection.send(("ready", os.getpid()))
+    while True:
+        try:
+            ref, args, kwargs = connection.recv()
+        except (EOFError, OSError):
+            return
+        if ref not in _worker_functions:
+            try:
+                _resolve(ref)
+            except BaseException as e:
+                _send_reply(connection, ("error", e))
+                continue
+            connection.send(("loaded", ref))
+        try:
+            reply = ("ok", _run_in_worker(ref, args, kwargs))
+        except BaseException as e:
+            reply = ("error", e)
+        _send_reply(connection, reply)
+
+
+# --- caller side -----------------------------------------------------------
+
+class _Worker:
+    """One worker process, the pipe it receives calls on, and what it has imported so far."""
+
+    def __init__(self, context: Any, memory_limit_mb: Optional[int], preload: Tuple[str, ...]):
+        self.ready = False  # reported that the preloaded modules are imported
+        self.loaded: Set[ToolRef] = set()  # tools whose module it has imported
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child, memory_limit_mb, preload),
+                                       name="tool-worker", daemon=True)
+        self.process.start()
+        child.close()
+
+    def kill(self) -> None:
+        self.connection.close()
+        self.process.kill()
+        self.process.join(timeout=5)
+
+    def close(self) -> None:
+        self.connection.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+async def _wait_readable(connection: Connection, timeout: Optional[float]) -> bool:
+    """Await data on a worker's pipe without a thread (where the event loop can watch pipes)."""
+    loop = asyncio.get_running_loop()
+    ready = loop.create_future()
+
+    def on_readable() -> None:
+        if not ready.done():
+            ready.set_result(True)
+
+    try:
+        loop.add_reader(connection.fileno(), on_readable)
+    except NotImplementedError:  # Windows proactor loop: wait in a thread instead
+        return await loop.run_in_executor(None, connection.poll, timeout)
+    try:
+        return await asyncio.wait_for(ready, timeout=timeout)
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        loop.remove_reader(connection.fileno())
+
+
+class ToolProcessPool:
+    """Warm pool of worker processes for tools with an isolated execution policy."""
+
+    def __init__(self, max_workers: Optional[int] = None, memory_limit_mb: Optional[int] = DEFAULT_MEMORY_LIMIT_MB,
+                 preload: Tuple[str, ...] = (), shared_memory_threshold: int = SHARED_MEMORY_THRESHOLD,
+                 start_method: Optional[str] = None, startup_timeout: float = STARTUP_TIMEOUT):
+        """
+        Args:
+            max_workers: Number of worker processes (default: CPU count)
+            memory_limit_mb: Address-space limit of each worker (None: unlimited; not enforced on Windows)
+            preload: Modules every worker imports when it starts (keep these light: a call
+                cannot start until its worker has imported them)
+            shared_memory_threshold: String arguments of at least this many bytes go through shared memory
+            start_method: multiprocessing start method (default: "forkserver" where available, else "spawn";
+                forking a threaded agent process is unsafe)
+            startup_timeout: How long a worker may take to import the preloaded modules, or a
+                tool's module on its first call there (not counted against the call's timeout)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.memory_limit_mb = memory_limit_mb
+        self.preload = tuple(preload)
+        self.shared_memory_threshold = shared_memory_threshold
+        self.startup_timeout = startup_timeout
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._waiters: Deque[Future] = deque()  # calls waiting for a worker, first come first served
+        self._started = 0
+        self._closed = False
+        self._counters = {"calls": 0, "timeouts": 0, "crashes": 0, "failed_starts": 0, "replaced": 0,
+                          "shared_bytes": 0}
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _checkout(self) -> Future:
+        """Future of a worker for one call: an idle one, a new one while under max_workers, else the next freed."""
+        waiter: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Tool process pool is shut down")
+            if self._idle:
+                waiter.set_result(self._idle.pop())
+                return waiter
+            if self._started >= self.max_workers:
+                self._waiters.append(waiter)
+                return waiter
+            self._started += 1
+        waiter.set_result(self._start_worker())
+        return waiter
+
+    def _checkin(self, worker: _Worker) -> None:
+        """Hand a free worker to the longest-waiting call, or park it."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter.set_running_or_notify_cancel():
+                    waiter.set_result(worker)
+                    return
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+    def _start_worker(self) -> _Worker:
+        try:
+            return _Worker(self._context, self.memory_limit_mb, self.preload)
+        except BaseException:
+            with self._lock:
+                self._started -= 1
+            raise
+
+    def _replace(self, worker: _Worker) -> None:
+        """Kill a stuck or crashed worker; a fresh one takes its place (now if a call is waiting for it)."""
+        worker.kill()
+        with self._lock:
+            self._counters["replaced"] += 1
+            if self._closed or not self._waiters:
+                self._started -= 1  # the next call starts the replacement
+                return
+        self._checkin(self._start_worker())
+
+    def warm(self) -> "ToolProcessPool":
+        """
+        Start every worker now instead of on first use.
+
+        Returns without waiting: the workers import the preloaded modules in
+        the background, and a call that gets one before it is ready waits for
+        it (not counted against the call's timeout).
+        """
+        with self._lock:
+            missing = 0 if self._closed else self.max_workers - self._started
+            self._started += missing
+        for _ in range(missing):
+            self._checkin(self._start_worker())
+        return self
+
+    def _pack(self, value: Any, blocks: List[shared_memory.SharedMemory]) -> Any:
+        if not isinstance(value, str) or len(value) < self.shared_memory_threshold:
+            return value
+        data = value.encode("utf-8")
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[:len(data)] = data
+        blocks.append(shm)
+        self._count("shared_bytes", len(data))
+        return SharedText(shm.name, len(data))
+
+    def _send(self, worker: _Worker, ref: ToolRef, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> bool:
+        """Start a call on a worker; False if the worker had already died while idle (it is replaced)."""
+        try:
+            worker.connection.send((ref, args, kwargs))
+        except (BrokenPipeError, EOFError, OSError):
+            self._replace(worker)
+            return False
+        self._count("calls")
+        return True
+
+    def _handshake(self, name: str, worker: _Worker, readable: bool, ref: Optional[ToolRef] = None) -> Optional[str]:
+        """
+        Take a worker's "ready" message (or with ref, its "loaded" message for that tool).
+
+        Returns None when it arrived, else an error message for the call; a
+        worker that failed to start is replaced. A tool module that failed to
+        import raises its error, like any other error in the tool.
+        """
+        stage = "load the tool" if ref else "start"
+        if not readable:
+            self._replace(worker)
+            self._count("failed_starts")
+            return f"Error: {name} worker did not {stage} within {self.startup_timeout:g}s"
+        try:
+            status, value = worker.connection.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            self._count("crashes")
+            return f"Error: {name} worker process died while trying to {stage}"
+        if status == "ready":
+            worker.ready = True
+            return None
+        if status == "loaded":
+            worker.loaded.add(ref)
+            return None
+        if ref is not None:
+            self._checkin(worker)
+            raise value
+        self._replace(worker)
+        self._count("failed_starts")
+        return f"Error: {name} worker could not start: {type(value).__name__}: {value}"
+
+    def _reply(self, name: str, worker: _Worker, policy: ExecutionPolicy, readable: bool) -> Any:
+        """Result of a call once its worker replied (or did not in time); only this worker is replaced on failure."""
+        if not readable:
+            self._replace(worker)
+            self._count("timeouts")
+            return f"Error: {name} did not finish within {policy.timeout:g}s"
+        try:
+            status, value = worker.connection.recv()
+        except (EOFError, OSError):
+            self._replace(worker)
+            self._count("crashes")
+            return f"Error: {name} worker process died (memory limit {self.memory_limit_mb} MiB?)"
+        self._checkin(worker)
+        if status == "ok":
+            return value
+        if isinstance(value, MemoryError):
+            return f"Error: {name} exceeded the {self.memory_limit_mb} MiB memory limit"
+        raise value
+
+    @staticmethod
+    def _release(blocks: List[shared_memory.SharedMemory]) -> None:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    def call(self, name: str, ref: ToolRef, policy: ExecutionPolicy, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a tool in a worker process and wait for its result.
+
+        Calls queue for a free worker first come first served; the timeout
+        starts once the worker has imported the tool and begins the call. A
+        timeout, a worker crash or failed start, or running out of memory
+        returns an error message (like any failed tool call) instead of
+        raising, and only the worker that ran the call is killed and replaced.
+        """
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            args = tuple(self._pack(arg, blocks) for arg in args)
+            kwargs = {key: self._pack(value, blocks) for key, value in kwargs.items()}
+            while True:
+                worker = self._checkout().result()
+                if not worker.ready:
+                    failure = self._handshake(name, worker, worker.connection.poll(self.startup_timeout))
+                    if failure:
+                        return failure
+                if not self._send(worker, ref, args, kwargs):
+                    continue
+                if ref not in worker.loaded:
+                    failure = self._handshake(name, worker, worker.connection.poll(self.startup_timeout), ref)
+                    if failure:
+                        return failure
+                return self._reply(name, worker, policy, worker.connection.poll(policy.timeout))
+        finally:
+            self._release(blocks)
+
+    async def call_async(self, name: str, ref: ToolRef, policy: ExecutionPolicy, *args: Any, **kwargs: Any) -> Any:
+        """call() for asyncio callers: awaits a worker and its result without blocking the event loop or a thread."""
+        blocks: List[shared_memory.SharedMemory] = []
+        try:
+            args = tuple(self._pack(arg, blocks) for arg in args)
+            kwargs = {key: self._pack(value, blocks) for key, value in kwargs.items()}
+            while True:
+                checkout = self._checkout()
+                try:
+                    worker = await asyncio.wrap_future(checkout)
+                except asyncio.CancelledError:
+                    if checkout.done() and not checkout.cancelled():
+                        self._checkin(checkout.result())
+                    raise
+                if not worker.ready:
+                    try:
+                        readable = await _wait_readable(worker.connection, self.startup_timeout)
+                    except asyncio.CancelledError:
+                        self._checkin(worker)  # still starting; the next call waits for it
+                        raise
+                    failure = self._handshake(name, worker, readable)
+                    if failure:
+                        return failure
+                if not self._send(worker, ref, args, kwargs):
+                    continue
+                try:
+                    if ref not in worker.loaded:
+                        failure = self._handshake(
+                            name, worker, await _wait_readable(worker.connection, self.startup_timeout), ref)
+                        if failure:
+                            return failure
+                    readable = await _wait_readable(worker.connection, policy.timeout)
+                except asyncio.CancelledError:
+                    self._replace(worker)  # the call is still running in it
+                    raise
+                return self._reply(name, worker, policy, readable)
+        finally:
+            self._release(blocks)
+
+    def _dispatching(self, tool: BaseTool, policy: ExecutionPolicy, function: Callable[..., Any]) -> Callable[..., Any]:
+        ref = tool_ref(tool)
+
+        @functools.wraps(function)
+        def dispatch(*args: Any, **kwargs: Any) -> Any:
+            return self.call(tool.name, ref, policy, *args, **kwargs)
+        dispatch._tool_wrapper_tag = "tool_pool"
+        return dispatch
+
+    def attach(self, tools: List[BaseTool]) -> List[BaseTool]:
+        """Run the isolated tools among the given ones in this pool (in place, once per tool)."""
+        for tool in tools:
+            policy = execution_policy_of(tool)
+            if not policy.isolated:
+                continue
+            attribute = "func" if isinstance(tool, Tool) else "_run"
+            current = getattr(tool, attribute)
+            wrapped = current
+            while wrapped is not None and getattr(wrapped, "_tool_wrapper_tag", None) != "tool_pool":
+                wrapped = getattr(wrapped, "__wrapped__", None)
+            if wrapped is None:
+                object.__setattr__(tool, attribute, self._dispatching(tool, policy, current))
+        return tools
+
+    def stats(self) -> Dict[str, int]:
+        """Calls, timeouts, crashes, failed worker starts, replaced workers and bytes passed through shared memory."""
+        with self._lock:
+            return dict(self._counters)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            waiters, self._waiters = self._waiters, deque()
+        for waiter in waiters:
+            waiter.cancel()
+        for worker in idle:
+            worker.close()
+
+
+_shared_pool: Optional[ToolProcessPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_tool_pool() -> ToolProcessPool:
+    """The tool process pool shared by every agent and crew in the process (workers start on first use)."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            workers = int(os.getenv("CREWAI_TOOL_WORKERS", "0")) or None
+            _shared_pool = ToolProcessPool(max_workers=workers, preload=("safe_eval", "text_stats"))
+            atexit.register(_shared_pool.shutdown)
+        return _shared_pool
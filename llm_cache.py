@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Persistent, content-addressed cache for LLM responses:
+- Responses are stored in SQLite, keyed by a hash of the model, the agent's
+  role/goal/backstory, the task description and the full message list
+  (which carries the task context and any tool observations)
+- Entries expire after a TTL, and the least recently used entries are
+  evicted once the cache grows past a size limit
+- Hit/miss counters, and a bypass flag to force fresh LLM calls
+
+Re-running a crew on the same topic replays every LLM call from the cache,
+and a run that failed part-way only pays for the calls it had not made yet.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Union
+from crewai.llms.base_llm import BaseLLM
+
+from llm_wrappers import DelegatingLLM
+from tracing import annotate
+
+
+DEFAULT_CACHE_PATH = os.path.join(".crewai_cache", "llm_responses.sqlite3")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(model: str, messages: Union[str, List[Dict[str, Any]]], agent: Optional[Any] = None,
+              task: Optional[Any] = None, tools: Optional[List[Any]] = None) -> str:
+    """
+    Content hash identifying one LLM request.
+
+    Args:
+        model: Model name
+        messages: Prompt or message list sent to the model
+        agent: Agent making the call (role, goal and backstory are hashed)
+        task: Task being worked on (its description is hashed)
+        tools: Tool schemas offered to the model
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = {
+        "model": model,
+        "role": getattr(agent, "role", None),
+        "goal": getattr(agent, "goal", None),
+        "backstory": getattr(agent, "backstory", None),
+        "task": getattr(task, "description", None),
+        "messages": messages,
+        "tools": tools,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry and LRU size eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) a response cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry stays valid (None for no expiry)
+            max_bytes: Total response size above which LRU entries are evicted
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )""")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, size, created_at FROM responses WHERE key = ?",
+                                   (key,)).fetchone()
+            if row is not None and self.ttl is not None and now - row[2] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= row[1]
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        """Store a response and evict least recently used entries if over the size limit."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)", (key, response, size, now, now))
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64").fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+            for key, size in rows:
+                if self._total_bytes <= self.max_bytes:
+                    return
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry. Returns the number removed."""
+        if self.ttl is None:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            removed = self._db.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+            self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachingLLM(DelegatingLLM):
+    """
+    LLM wrapper that answers repeated requests from a ResponseCache.
+
+    Only plain-text responses are cached; structured or tool-call responses
+    always go to the wrapped LLM.
+    """
+
+    cache: Any = None
+    bypass: bool = False
+
+    def __init__(self, llm: BaseLLM, cache: ResponseCache, bypass: bool = False):
+        """
+        Args:
+            llm: The LLM to call on a cache miss
+            cache: Shared response cache
+            bypass: Skip cache lookups (fresh responses are still stored)
+        """
+        super().__init__(llm, cache=cache, bypass=bypass)
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        key = None
+        if response_model is None:
+            key = cache_key(self.model, messages, agent=from_agent, task=from_task, tools=tools)
+            if not self.bypass:
+                cached = self.cache.get(key)
+                annotate(cache_hit=cached is not None)
+                if cached is not None:
+                    return cached
+
+        response = self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                       available_functions=available_functions, from_task=from_task,
+                                       from_agent=from_agent, response_model=response_model)
+
+        if key is not None and isinstance(response, str):
+            self.cache.put(key, response)
+        return response
+
+
+def main() -> None:
+    """Show or clear the response cache: python llm_cache.py [stats|purge|clear] [path]."""
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_PATH
+
+    if not os.path.exists(path):
+        print(f"❌ No response cache found at {path}")
+        return
+
+    cache = ResponseCache(path)
+    if command == "clear":
+        cache.clear()
+        print(f"🧹 Cleared response cache at {path}")
+    elif command == "purge":
+        print(f"🧹 Removed {cache.purge_expired()} expired entries")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
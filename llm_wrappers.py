@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+LLM Wrappers
+
+Base class for LLMs that add behaviour (caching, tracing, ...) around another
+CrewAI LLM. A wrapper can be passed to any Agent as its `llm`; it reports the
+wrapped model's name and capabilities and forwards every call to it.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Union
+from crewai.llms.base_llm import BaseLLM
+
+try:
+    from crewai.llms.base_llm import call_stop_override
+except ImportError:  # older CrewAI releases set llm.stop directly
+    call_stop_override = None
+
+# Without call_stop_override, stop words are set on the shared inner LLM for the
+# duration of a call, so concurrent callers of one LLM take turns.
+_stop_locks: Dict[int, threading.Lock] = {}
+_stop_locks_guard = threading.Lock()
+
+
+def _stop_lock(llm: BaseLLM) -> threading.Lock:
+    with _stop_locks_guard:
+        return _stop_locks.setdefault(id(llm), threading.Lock())
+
+
+def default_llm() -> BaseLLM:
+    """The LLM CrewAI would pick for an agent without one (honours OPENAI_MODEL_NAME etc.)."""
+    from crewai.utilities.llm_utils import create_llm
+    return create_llm(None)
+
+
+def unwrap_llm(llm: BaseLLM) -> BaseLLM:
+    """Return the innermost LLM behind any number of wrappers."""
+    while isinstance(llm, DelegatingLLM):
+        llm = llm.llm
+    return llm
+
+
+class DelegatingLLM(BaseLLM):
+    """
+    An LLM that forwards calls to another LLM.
+
+    Subclasses override call() and use _delegate_call() to reach the wrapped
+    LLM. Stop words applied to the wrapper by the agent executor are passed
+    on to the wrapped LLM.
+    """
+
+    llm: Any = None
+
+    def __init__(self, llm: BaseLLM, **data: Any):
+        super().__init__(model=llm.model, llm=llm, stop=list(getattr(llm, "stop", None) or []), **data)
+
+    def supports_stop_words(self) -> bool:
+        return self.llm.supports_stop_words()
+
+    def supports_function_calling(self) -> bool:
+        supports = getattr(self.llm, "supports_function_calling", None)
+        return bool(supports()) if supports else False
+
+    def get_context_window_size(self) -> int:
+        return self.llm.get_context_window_size()
+
+    def _delegate_call(self, messages: Union[str, List[Dict[str, Any]]], **kwargs: Any) -> Any:
+        stop = getattr(self, "stop_sequences", self.stop)
+        if call_stop_override is None:
+            with _stop_lock(self.llm):
+                self.llm.stop = stop
+                return self.llm.call(messages, **kwargs)
+        with call_stop_override(self.llm, stop):
+            return self.llm.call(messages, **kwargs)
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        return self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                   available_functions=available_functions, from_task=from_task,
+                                   from_agent=from_agent, response_model=response_model)
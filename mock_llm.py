@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Mock LLM
+
+Offline, deterministic stand-in for a real LLM, for benchmarks and dry runs:
+- Responses are generated from a seed and the prompt, so identical prompts
+  always get identical answers, with no network access or API keys
+- Configurable per-call latency (fixed, jittered, or per generated token)
+- Emits ReAct-style tool calls for the tools it is told how to call, so tool
+  dispatch is exercised exactly as with a real model
+- Counts calls and prompt/response sizes, and measures the round trip from
+  emitting a tool call to being called again with its result
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Union
+from pydantic import PrivateAttr
+from crewai.llms.base_llm import BaseLLM
+
+
+VOCABULARY = (
+    "analysis market growth patients clinical data model adoption risk strategy platform "
+    "regulatory outcomes research insight trend investment workflow diagnostic care cost "
+    "provider technology evidence quality access scale partnership forecast segment value"
+).split()
+
+TOOL_NAME_PATTERN = re.compile(r"^Tool Name: (.+)$", re.MULTILINE)
+
+
+def tool_key(name: str) -> str:
+    """Tool name normalized for matching: 'Quick Calculator' and 'quick_calculator' are the same tool."""
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+class MockLLM(BaseLLM):
+    """
+    Scripted, seeded LLM that never leaves the process.
+
+    Each task gets `tool_calls_per_task` tool calls (for tools listed in
+    `tool_inputs` and available to the agent; names are matched after
+    normalizing case, spaces and punctuation) followed by a final answer of
+    `sections` markdown sections. Alternatively, `script` supplies the exact
+    responses to return, in order.
+    """
+
+    seed: int = 0
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    seconds_per_token: float = 0.0
+    sections: int = 3
+    words_per_section: int = 60
+    tool_calls_per_task: int = 0
+    tool_inputs: Dict[str, Dict[str, Any]] = {}
+    script: Optional[List[str]] = None
+    calls: int = 0
+    prompt_chars: int = 0
+    response_chars: int = 0
+    tool_round_trips: List[float] = []
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _pending_tool_call: Any = PrivateAttr(default_factory=threading.local)
+
+    def __init__(self, model: str = "mock/offline", **data: Any):
+        super().__init__(model=model, **data)
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return True
+
+    def get_context_window_size(self) -> int:
+        return 128_000
+
+    def _rng(self, messages: Union[str, List[Dict[str, Any]]]) -> random.Random:
+        digest = hashlib.sha256(json.dumps(messages, default=str, sort_keys=True).encode("utf-8")).hexdigest()
+        return random.Random(f"{self.seed}:{digest}")
+
+    def _final_answer(self, rng: random.Random, title: str) -> str:
+        sections = [f"# {title}"]
+        for number in range(1, self.sections + 1):
+            words = " ".join(rng.choice(VOCABULARY) for _ in range(self.words_per_section))
+            sections.append(f"## Section {number}: {rng.choice(VOCABULARY).title()}\n\n{words.capitalize()}.")
+        return "Thought: I now know the final answer\nFinal Answer: " + "\n\n".join(sections)
+
+    def _tool_call(self, messages: List[Dict[str, Any]]) -> Optional[str]:
+        """A tool call if this task still has tool calls left and a known tool is offered."""
+        iterations = sum(1 for message in messages if message.get("role") == "assistant")
+        if iterations >= self.tool_calls_per_task:
+            return None
+        inputs = {tool_key(name): tool_input for name, tool_input in self.tool_inputs.items()}
+        offered = TOOL_NAME_PATTERN.findall(str(messages[0].get("content", ""))) if messages else []
+        usable = [name.strip() for name in offered if tool_key(name) in inputs]
+        if not usable:
+            return None
+        name = usable[iterations % len(usable)]
+        return (f"Thought: I should use the {name} tool\n"
+                f"Action: {name}\nAction Input: {json.dumps(inputs[tool_key(name)])}")
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> str:
+        started = time.perf_counter()
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+
+        with self._lock:
+            index = self.calls
+            self.calls += 1
+            emitted_at = getattr(self._pending_tool_call, "emitted_at", None)
+            if emitted_at is not None:
+                self.tool_round_trips.append(started - emitted_at)
+                self._pending_tool_call.emitted_at = None
+
+        rng = self._rng(messages)
+        tool_call = None
+        if self.script:
+            response = self.script[index % len(self.script)]
+        else:
+            title = " ".join(str(getattr(from_task, "description", "Result")).split()[:8])
+            tool_call = self._tool_call(messages)
+            response = tool_call or self._final_answer(rng, title)
+
+        delay = self.latency + rng.uniform(0, self.latency_jitter) + self.seconds_per_token * len(response) / 4
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.prompt_chars += sum(len(str(message.get("content", ""))) for message in messages)
+            self.response_chars += len(response)
+        if tool_call:
+            self._pending_tool_call.emitted_at = time.perf_counter()
+        return response
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Prompt Prefix Caching
+
+Keeps the static part of every agent prompt (role, goal, backstory, tool
+descriptions and format instructions) byte-identical across calls and runs,
+so providers can serve it from their prompt cache:
+- The prefix always travels as the first, separate system message: prompts
+  CrewAI sends as one string are split before 'Current Task:', the point
+  where the task-specific tail starts
+- Every distinct prefix is stored once in a process-wide LRU PrefixCache with
+  its digest and token estimate, so repeated calls reuse one interned string;
+  the SHA-256 digest and token count are computed once per distinct prefix
+  (finding the entry still hashes the prompt text, as any dict lookup does)
+- For Anthropic models (routed through LiteLLM as 'anthropic/...') the
+  prefix is marked with cache_control; OpenAI caches identical prefixes of
+  1024+ tokens automatically
+- An agent whose prefix changes between calls (e.g. a spec that puts a
+  per-run parameter in a backstory) is counted, since it defeats caching
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+from crewai.llms.base_llm import BaseLLM
+
+from llm_wrappers import DelegatingLLM, unwrap_llm
+from tracing import annotate, estimate_tokens
+
+
+TASK_MARKER = "\nCurrent Task:"
+DEFAULT_MAX_PREFIXES = 256
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """A static prompt prefix with its digest and token estimate, computed once."""
+
+    text: str
+    digest: str
+    tokens: int
+
+
+class PrefixCache:
+    """LRU cache of the distinct prompt prefixes seen in the process."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_PREFIXES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PromptPrefix]" = OrderedDict()
+        self._by_agent: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.changes = 0
+        self.tokens_reused = 0
+
+    def intern(self, text: str, agent: Optional[str] = None) -> PromptPrefix:
+        """Return the cached entry for a prefix, adding it on first sight."""
+        with self._lock:
+            prefix = self._entries.get(text)
+            if prefix is None:
+                self.misses += 1
+                prefix = PromptPrefix(text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+                                      estimate_tokens(text))
+                self._entries[text] = prefix
+                if len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self.hits += 1
+                self.tokens_reused += prefix.tokens
+                self._entries.move_to_end(text)
+            if agent is not None:
+                if self._by_agent.get(agent, prefix.digest) != prefix.digest:
+                    self.changes += 1
+                self._by_agent[agent] = prefix.digest
+            return prefix
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "prefixes": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "tokens_reused": self.tokens_reused,
+                "changes": self.changes,
+            }
+
+
+def split_prefix(messages: Union[str, List[Dict[str, Any]]]) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """
+    Separate the static prefix from the rest of a prompt.
+
+    Returns:
+        Tuple of the prefix (None if the prompt has none) and the remaining messages
+    """
+    if isinstance(messages, str):
+        marker = messages.find(TASK_MARKER)
+        if marker <= 0:
+            return None, [{"role": "user", "content": messages}]
+        return messages[:marker], [{"role": "user", "content": messages[marker + 1:]}]
+    if messages and messages[0].get("role") == "system" and isinstance(messages[0].get("content"), str):
+        return messages[0]["content"], list(messages[1:])
+    return None, list(messages)
+
+
+class PrefixCachingLLM(DelegatingLLM):
+    """LLM wrapper sending every prompt as a stable system prefix followed by the task-specific tail."""
+
+    prefix_cache: Any = None
+    cache_control: bool = False
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        text, rest = split_prefix(messages)
+        if text is not None:
+            prefix = self.prefix_cache.intern(text, agent=getattr(from_agent, "role", None))
+            annotate(prefix_digest=prefix.digest, prefix_tokens=prefix.tokens)
+            if self.cache_control:
+                system = {"role": "system", "content": [
+                    {"type": "text", "text": prefix.text, "cache_control": {"type": "ephemeral"}}]}
+            else:
+                system = {"role": "system", "content": prefix.text}
+            messages = [system] + rest
+        return self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                   available_functions=available_functions, from_task=from_task,
+                                   from_agent=from_agent, response_model=response_model)
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    """Summary line of PrefixCache.stats(), plus a warning if agent prefixes changed between calls."""
+    lines = [f"🧩 Prompt prefixes: {stats['prefixes']} distinct, {stats['hit_rate']:.0%} of calls reused one "
+             f"(~{stats['tokens_reused']} tokens)"]
+    if stats["changes"]:
+        lines.append(f"⚠️  {stats['changes']} agent prefix change(s): a per-run value in a role, goal or backstory "
+                     f"defeats prompt caching")
+    return "\n".join(lines)
+
+
+_shared_cache: Optional[PrefixCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def shared_prefix_cache() -> PrefixCache:
+    """The process-wide prefix cache."""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = PrefixCache()
+        return _shared_cache
+
+
+def with_prefix_cache(llm: BaseLLM, cache: Optional[PrefixCache] = None,
+                      cache_control: Optional[bool] = None) -> BaseLLM:
+    """
+    Wrap an LLM so its prompts carry a stable, cached prefix.
+
+    Args:
+        llm: The LLM to wrap
+        cache: Prefix cache (default: the process-wide one)
+        cache_control: Mark the prefix for provider-side caching (default:
+            only for 'anthropic/...' models)
+    """
+    if isinstance(llm, PrefixCachingLLM):
+        return llm
+    if cache_control is None:
+        cache_control = str(getattr(unwrap_llm(llm), "model", "")).startswith("anthropic/")
+    return PrefixCachingLLM(llm, prefix_cache=cache or shared_prefix_cache(), cache_control=cache_control)
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Search Gateway
+
+One shared path to the web search API for every crew in the process:
+- Pooled HTTP connections (one requests.Session)
+- A global token-bucket rate limiter, so concurrent crews stay under the
+  provider's limit instead of collecting 429 responses
+- Single-flight: identical queries in flight at the same time share one
+  request
+- Results cached on disk with a TTL (the same SQLite store as the LLM cache)
+- 429 and 5xx responses are retried with backoff, honouring Retry-After
+
+GatewaySearchTool exposes the gateway to agents as a drop-in replacement
+for SerperDevTool. StubSearchServer is a local, rate-limited stand-in for
+the search API, for tests and load experiments:
+
+    python search_gateway.py --crews 8 --queries 40 --rate 5
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Type
+import requests
+from requests.adapters import HTTPAdapter
+from pydantic import BaseModel, Field
+from crewai.tools import BaseTool
+
+from llm_cache import ResponseCache
+
+
+DEFAULT_ENDPOINT = "https://google.serper.dev/search"
+DEFAULT_CACHE_PATH = os.path.join(".crewai_cache", "search_results.sqlite3")
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+class SearchError(RuntimeError):
+    """The search API could not be reached or kept failing."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting for it if necessary. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class _Flight:
+    """A request in progress, awaited by every caller asking for the same query."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchGateway:
+    """Rate-limited, deduplicating, caching client for a Serper-compatible search API."""
+
+    def __init__(self, api_key: Optional[str] = None, endpoint: Optional[str] = None,
+                 rate: float = 5.0, burst: Optional[float] = None, pool_size: int = 16,
+                 cache: Optional[ResponseCache] = None, ttl: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_retries: int = 3, timeout: float = 15.0):
+        """
+        Args:
+            api_key: Search API key (defaults to SERPER_API_KEY)
+            endpoint: Search URL (defaults to SEARCH_GATEWAY_URL or the Serper API)
+            rate: Requests per second allowed across all crews
+            burst: Requests that may go out back to back (defaults to rate)
+            pool_size: Maximum pooled connections
+            cache: Result cache (defaults to one in .crewai_cache/)
+            ttl: Seconds a cached result stays valid (ignored if cache is given)
+            max_retries: Retries after a 429, 5xx or connection error
+            timeout: Per-request timeout in seconds
+        """
+        self.api_key = api_key or os.getenv("SERPER_API_KEY", "")
+        self.endpoint = endpoint or os.getenv("SEARCH_GATEWAY_URL", DEFAULT_ENDPOINT)
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache or ResponseCache(DEFAULT_CACHE_PATH, ttl=ttl)
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.counters = {"queries": 0, "cache_hits": 0, "coalesced": 0, "requests": 0,
+                         "rate_limited": 0, "retries": 0}
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(query: str, num: int, search_type: str) -> str:
+        normalized = re.sub(r"\s+", " ", query.strip().casefold())
+        return hashlib.sha256(f"{search_type}\x00{num}\x00{normalized}".encode("utf-8")).hexdigest()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def search(self, query: str, num: int = 10, search_type: str = "search") -> Dict[str, Any]:
+        """
+        Run a search, from the cache or a request shared with identical in-flight queries.
+
+        Args:
+            query: Search query
+            num: Number of results
+            search_type: "search" or "news"
+
+        Returns:
+            Dict[str, Any]: The API's JSON response
+
+        Raises:
+            SearchError: If the request kept failing
+        """
+        self._count("queries")
+        key = self._key(query, num, search_type)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count("cache_hits")
+            return json.loads(cached)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._request(query, num, search_type)
+            self.cache.put(key, json.dumps(flight.result))
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _request(self, query: str, num: int, search_type: str) -> Dict[str, Any]:
+        url = self.endpoint if search_type == "search" else self.endpoint.rsplit("/", 1)[0] + f"/{search_type}"
+        headers = {"X-API-KEY": self.api_key, "Content-Type": "application/json"}
+        delay = 0.5
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count("retries")
+            self.bucket.acquire()
+            self._count("requests")
+            try:
+                response = self.session.post(url, json={"q": query, "num": num}, headers=headers,
+                                             timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise SearchError(f"Search request failed: {e}") from e
+                time.sleep(delay + random.uniform(0, delay))
+                delay *= 2
+                continue
+
+            if response.status_code == 429 or response.status_code >= 500:
+                if response.status_code == 429:
+                    self._count("rate_limited")
+                if attempt == self.max_retries:
+                    raise SearchError(f"Search API returned {response.status_code} after {attempt + 1} attempts")
+                retry_after = response.headers.get("Retry-After")
+                time.sleep(float(retry_after) if retry_after and retry_after.replace(".", "", 1).isdigit()
+                           else delay + random.uniform(0, delay))
+                delay *= 2
+                continue
+
+            if response.status_code >= 400:
+                raise SearchError(f"Search API returned {response.status_code}: {response.text[:200]}")
+            try:
+                return response.json()
+            except ValueError as e:
+                raise SearchError(f"Search API returned a malformed response: {e}") from e
+        raise SearchError("Search request failed")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+
+_gateway: Optional[SearchGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def shared_search_gateway() -> SearchGateway:
+    """The search gateway shared by every crew in the process, created on first use."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = SearchGateway(rate=float(os.getenv("SEARCH_GATEWAY_RATE", "5")))
+        return _gateway
+
+
+class GatewaySearchInput(BaseModel):
+    search_query: str = Field(..., description="Mandatory search query you want to use to search the internet")
+
+
+class GatewaySearchTool(BaseTool):
+    name: str = "Search the internet"
+    description: str = "A tool that can be used to search the internet with a search_query."
+    args_schema: Type[BaseModel] = GatewaySearchInput
+    gateway: Any = None
+    n_results: int = 10
+
+    def _run(self, search_query: str) -> str:
+        gateway = self.gateway or shared_search_gateway()
+        try:
+            results = gateway.search(search_query, num=self.n_results)
+        except SearchError as e:
+            return f"Error: {str(e)}"
+
+        lines = []
+        for result in results.get("organic", [])[:self.n_results]:
+            lines.append(f"Title: {result.get('title', '')}\nLink: {result.get('link', '')}\n"
+                         f"Snippet: {result.get('snippet', '')}")
+        return "\n---\n".join(lines) or "No results found."
+
+
+class StubSearchServer:
+    """Local Serper-compatible search API with its own rate limit, for tests and load experiments."""
+
+    def __init__(self, rate: float = 5.0, latency: float = 0.2, port: int = 0):
+        """
+        Args:
+            rate: Requests per second served before answering 429
+            latency: Seconds each answered request takes
+            port: Port to listen on (0 picks a free port)
+        """
+        self.requests = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        bucket = TokenBucket(rate)
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                accepted = bucket.acquire(timeout=0)
+                with stub._lock:
+                    stub.requests += 1
+                    stub.rejected += 0 if accepted else 1
+                if not accepted:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "1")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                time.sleep(latency)
+                query = body.get("q", "")
+                payload = json.dumps({"searchParameters": body, "organic": [
+                    {"title": f"Result {i + 1} for {query}", "link": f"https://example.com/{i + 1}",
+                     "snippet": f"Stub snippet {i + 1} about {query}."} for i in range(body.get("num", 10))
+                ]}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/search"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StubSearchServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main() -> None:
+    """Load test: several crews searching overlapping queries through one gateway against the stub server."""
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Search gateway load test against a local stub server")
+    parser.add_argument("--crews", type=int, default=8, help="Concurrent searchers")
+    parser.add_argument("--queries", type=int, default=40, help="Queries per searcher")
+    parser.add_argument("--distinct", type=int, default=30, help="Distinct queries in the pool")
+    parser.add_argument("--rate", type=float, default=5.0, help="Requests per second allowed by the stub")
+    args = parser.parse_args()
+
+    with StubSearchServer(rate=args.rate) as stub, tempfile.TemporaryDirectory() as cache_dir:
+        gateway = SearchGateway(api_key="stub", endpoint=stub.url, rate=args.rate,
+                                cache=ResponseCache(os.path.join(cache_dir, "search.sqlite3")))
+        latencies: List[float] = []
+        latencies_lock = threading.Lock()
+
+        def searcher(seed: int) -> None:
+            rng = random.Random(seed)
+            for _ in range(args.queries):
+                start = time.perf_counter()
+                gateway.search(f"topic {rng.randrange(args.distinct)}")
+                with latencies_lock:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.crews) as pool:
+            list(pool.map(searcher, range(args.crews)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"🔎 {len(latencies)} searches by {args.crews} crews in {elapsed:.1f}s")
+    print(f"   p50 {latencies[len(latencies) // 2] * 1000:.0f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms")
+    print(f"   gateway: {json.dumps(gateway.stats())}")
+    print(f"   stub server: {stub.requests} requests, {stub.rejected} rejected with 429")
+
+
+if __name__ == "__main__":
+    main()
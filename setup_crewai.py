@@ -5,94 +5,332 @@ CrewAI Setup Script
 This script helps you set up a CrewAI environment and create your first project.
 It handles installation, environment setup, and project initialization.
 
+Setup runs as a graph of steps:
+- Independent steps run concurrently (e.g. several projects, or a project's
+  dependency install and its .env file)
+- A completed step writes a marker keyed by its inputs, so re-running the
+  setup skips it until its inputs (or its result) change
+- Every project shares one uv package cache, and optionally a local
+  wheelhouse, so packages are downloaded once per machine
+- Per-step timing is printed at the end
+
+Usage:
+    python setup_crewai.py [project ...] [--workers N] [--force]
+                           [--cache-dir DIR] [--wheelhouse DIR]
+
 Author: AI Assistant
 Date: 2025
 """
 
 import os
 import sys
-import subprocess
+import json
+import time
+import shutil
+import hashlib
+import argparse
 import platform
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = Path(os.getenv("CREWAI_SETUP_CACHE", Path.home() / ".cache" / "crewai-setup"))
+MARKER_DIR = ".crewai_setup"
+UV_INSTALLERS = {
+    "windows": ("https://astral.sh/uv/install.ps1", ".ps1"),
+    "default": ("https://astral.sh/uv/install.sh", ".sh"),
+}
+
+ENV_TEMPLATE = """# CrewAI Environment Variables
+# Add your API keys here
+
+# OpenAI API Key (required)
+OPENAI_API_KEY=your_openai_api_key_here
+
+# Serper API Key (for web search tools)
+SERPER_API_KEY=your_serper_api_key_here
+
+# Anthropic API Key (alternative to OpenAI)
+ANTHROPIC_API_KEY=your_anthropic_api_key_here
+
+# Other optional API keys
+GOOGLE_API_KEY=your_google_api_key_here
+SERPER_API_KEY=your_serper_api_key_here
+
+# CrewAI Configuration
+CREWAI_VERBOSE=true
+CREWAI_DEBUG=false
+"""
+
+_print_lock = threading.Lock()
+
+
+def say(message: str) -> None:
+    """Print a line without interleaving with other steps' output."""
+    with _print_lock:
+        print(message, flush=True)
+
+
+def file_digest(*paths: Path) -> str:
+    """SHA-256 over the contents of the given files (missing files hash as empty)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8") + b"\x00")
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class Step:
+    """
+    One unit of setup work.
+
+    A step with `inputs` is cached: after it succeeds, a marker file records
+    the hash of its inputs, and the step is skipped while the hash matches
+    and `verify` (if given) still holds.
+    """
+
+    name: str
+    action: Callable[[], bool]
+    deps: Tuple[str, ...] = ()
+    inputs: Optional[Callable[[], Dict[str, str]]] = None
+    marker_dir: Optional[Path] = None
+    verify: Optional[Callable[[], bool]] = None
+
+    def _marker(self) -> Path:
+        return (self.marker_dir or DEFAULT_CACHE_DIR) / MARKER_DIR / f"{self.name.replace('/', '_')}.json"
+
+    def _key(self) -> str:
+        encoded = json.dumps({"step": self.name, **self.inputs()}, sort_keys=True)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def is_done(self) -> bool:
+        if self.inputs is None:
+            return False
+        try:
+            with open(self._marker(), 'r') as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return marker.get("key") == self._key() and (self.verify is None or self.verify())
+
+    def mark_done(self, seconds: float) -> None:
+        if self.inputs is None:
+            return
+        marker = self._marker()
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = marker.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"key": self._key(), "seconds": round(seconds, 3), "completed_at": time.time()}, f)
+        os.replace(tmp_path, marker)
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str  # "ok", "cached", "failed" or "skipped"
+    seconds: float = 0.0
+
+
+class StepGraph:
+    """Runs steps as soon as their dependencies succeed, several at a time."""
+
+    def __init__(self, max_workers: int = 4, force: bool = False):
+        """
+        Args:
+            max_workers: Maximum number of steps running at the same time
+            force: Ignore completion markers and run every step
+        """
+        self.max_workers = max_workers
+        self.force = force
+        self.steps: Dict[str, Step] = {}
+
+    def add(self, step: Step) -> Step:
+        missing = [dep for dep in step.deps if dep not in self.steps]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(missing)}")
+        self.steps[step.name] = step
+        return step
+
+    def _run_step(self, step: Step) -> StepResult:
+        start = time.perf_counter()
+        if not self.force and step.is_done():
+            return StepResult(step.name, "cached", time.perf_counter() - start)
+        ok = step.action()
+        seconds = time.perf_counter() - start
+        if ok:
+            step.mark_done(seconds)
+        return StepResult(step.name, "ok" if ok else "failed", seconds)
+
+    def run(self) -> List[StepResult]:
+        """Run every step; steps depending on a failed step are skipped. Results are in insertion order."""
+        results: Dict[str, StepResult] = {}
+        running: Dict[Future, str] = {}
+        waiting = list(self.steps)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="setup") as pool:
+            while waiting or running:
+                for name in list(waiting):
+                    statuses = [results[dep].status if dep in results else None for dep in self.steps[name].deps]
+                    if any(status in ("failed", "skipped") for status in statuses):
+                        results[name] = StepResult(name, "skipped")
+                        waiting.remove(name)
+                    elif all(status in ("ok", "cached") for status in statuses):
+                        running[pool.submit(self._run_step, self.steps[name])] = name
+                        waiting.remove(name)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        say(f"❌ Step '{name}' raised {type(e).__name__}: {e}")
+                        results[name] = StepResult(name, "failed")
+
+        return [results[name] for name in self.steps]
+
+
+def print_timings(results: List[StepResult], wall_time: float) -> None:
+    icons = {"ok": "✅", "cached": "⏩", "failed": "❌", "skipped": "⏭️ "}
+    say("\n⏱️  Setup steps")
+    for result in results:
+        say(f"  {icons[result.status]} {result.name:<40} {result.status:<8} {result.seconds:>7.2f}s")
+    total = sum(result.seconds for result in results)
+    say(f"  Wall time {wall_time:.2f}s ({total:.2f}s of step time)")
 
 
 class CrewAISetup:
     """Helper class for setting up CrewAI environment."""
 
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[Path] = None, wheelhouse: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Shared uv package cache and marker directory
+                (default: ~/.cache/crewai-setup, or CREWAI_SETUP_CACHE)
+            wheelhouse: Directory of pre-built wheels offered to every install
+        """
         self.python_version = sys.version_info
         self.platform = platform.system().lower()
         self.project_dir = Path.cwd()
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.wheelhouse = Path(wheelhouse) if wheelhouse else None
+        self.env = self._subprocess_env()
+
+    def _subprocess_env(self) -> Dict[str, str]:
+        """Environment for uv and crewai: shared package cache, wheelhouse, and uv's install directory on PATH."""
+        env = dict(os.environ)
+        env.setdefault("UV_CACHE_DIR", str(self.cache_dir / "uv"))
+        if self.wheelhouse:
+            env.setdefault("UV_FIND_LINKS", str(self.wheelhouse))
+        uv_bin = str(Path.home() / ".local" / "bin")
+        if uv_bin not in env.get("PATH", "").split(os.pathsep):
+            env["PATH"] = env.get("PATH", "") + os.pathsep + uv_bin
+        return env
+
+    def _which(self, program: str) -> Optional[str]:
+        return shutil.which(program, path=self.env["PATH"])
+
+    def _run(self, command: List[str], cwd: Optional[Path] = None, interactive: bool = False) -> None:
+        """
+        Run a command with the shared environment.
+
+        Output is shown only if the command fails, except for interactive
+        commands, which run one at a time attached to the terminal.
+        """
+        if interactive:
+            with _print_lock:
+                subprocess.run(command, cwd=cwd, env=self.env, check=True)
+            return
+        result = subprocess.run(command, cwd=cwd, env=self.env, capture_output=True, text=True)
+        if result.returncode != 0:
+            output = (result.stderr or result.stdout).strip().splitlines()[-10:]
+            raise subprocess.CalledProcessError(result.returncode, command, "\n".join(output))
+
+    @staticmethod
+    def _error(e: subprocess.CalledProcessError) -> str:
+        return f"{e}\n{e.output}" if e.output else str(e)
 
     def check_python_version(self) -> bool:
         """Check if Python version is compatible with CrewAI."""
         if self.python_version.major == 3 and 10 <= self.python_version.minor <= 13:
-            print(f"✅ Python {self.python_version.major}.{self.python_version.minor} is compatible")
+            say(f"✅ Python {self.python_version.major}.{self.python_version.minor} is compatible")
             return True
         else:
-            print(f"❌ Python {self.python_version.major}.{self.python_version.minor} is not compatible")
-            print("CrewAI requires Python 3.10 to 3.13")
+            say(f"❌ Python {self.python_version.major}.{self.python_version.minor} is not compatible")
+            say("CrewAI requires Python 3.10 to 3.13")
             return False
 
     def install_uv(self) -> bool:
         """Install UV package manager if not already installed."""
-        try:
-            result = subprocess.run(['uv', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print("✅ UV is already installed")
-                return True
-        except FileNotFoundError:
-            pass
-
-        print("📦 Installing UV package manager...")
+        if self._which("uv"):
+            say("✅ UV is already installed")
+            return True
 
-        if self.platform == "windows":
-            cmd = "powershell -c \"irm https://astral.sh/uv/install.ps1 | iex\""
-        else:
-            cmd = "curl -LsSf https://astral.sh/uv/install.sh | sh"
+        say("📦 Installing UV package manager...")
 
+        url, suffix = UV_INSTALLERS.get(self.platform, UV_INSTALLERS["default"])
         try:
-            subprocess.run(cmd, shell=True, check=True)
-            print("✅ UV installed successfully")
+            with tempfile.TemporaryDirectory() as tmp:
+                script = os.path.join(tmp, f"install-uv{suffix}")
+                urllib.request.urlretrieve(url, script)
+                if self.platform == "windows":
+                    self._run(["powershell", "-ExecutionPolicy", "ByPass", "-File", script])
+                else:
+                    self._run(["sh", script])
+            say("✅ UV installed successfully")
             return True
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install UV: {e}")
+        except (OSError, subprocess.CalledProcessError) as e:
+            say(f"❌ Failed to install UV: {self._error(e) if isinstance(e, subprocess.CalledProcessError) else e}")
             return False
 
     def install_crewai_cli(self) -> bool:
         """Install CrewAI CLI using UV."""
-        print("🔧 Installing CrewAI CLI...")
+        say("🔧 Installing CrewAI CLI...")
 
         try:
-            subprocess.run(['uv', 'tool', 'install', 'crewai'], check=True)
-            print("✅ CrewAI CLI installed successfully")
+            self._run(["uv", "tool", "install", "crewai"])
+            say("✅ CrewAI CLI installed successfully")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install CrewAI CLI: {e}")
+            say(f"❌ Failed to install CrewAI CLI: {self._error(e)}")
             return False
 
     def create_project(self, project_name: str) -> bool:
         """Create a new CrewAI project."""
-        print(f"🚀 Creating CrewAI project: {project_name}")
+        if (self.project_dir / project_name / "pyproject.toml").exists():
+            say(f"✅ Project '{project_name}' already exists")
+            return True
+
+        say(f"🚀 Creating CrewAI project: {project_name}")
 
         try:
-            subprocess.run(['crewai', 'create', 'crew', project_name], check=True)
-            print(f"✅ Project '{project_name}' created successfully")
+            # 'crewai create' asks which LLM provider to use
+            self._run(["crewai", "create", "crew", project_name], cwd=self.project_dir, interactive=True)
+            say(f"✅ Project '{project_name}' created successfully")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to create project: {e}")
+            say(f"❌ Failed to create project: {self._error(e)}")
             return False
 
     def install_dependencies(self, project_path: Path) -> bool:
         """Install project dependencies."""
-        print("📦 Installing project dependencies...")
+        say(f"📦 Installing dependencies for {project_path.name}...")
 
         try:
-            subprocess.run(['crewai', 'install'], cwd=project_path, check=True)
-            print("✅ Dependencies installed successfully")
+            self._run(["crewai", "install"], cwd=project_path)
+            say(f"✅ Dependencies installed successfully for {project_path.name}")
             return True
         except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install dependencies: {e}")
+            say(f"❌ Failed to install dependencies: {self._error(e)}")
             return False
 
     def create_env_file(self, project_path: Path) -> bool:
@@ -100,37 +338,16 @@ class CrewAISetup:
         env_file = project_path / '.env'
 
         if env_file.exists():
-            print("✅ .env file already exists")
+            say(f"✅ .env file already exists for {project_path.name}")
             return True
 
-        env_content = """# CrewAI Environment Variables
-# Add your API keys here
-
-# OpenAI API Key (required)
-OPENAI_API_KEY=your_openai_api_key_here
-
-# Serper API Key (for web search tools)
-SERPER_API_KEY=your_serper_api_key_here
-
-# Anthropic API Key (alternative to OpenAI)
-ANTHROPIC_API_KEY=your_anthropic_api_key_here
-
-# Other optional API keys
-GOOGLE_API_KEY=your_google_api_key_here
-SERPER_API_KEY=your_serper_api_key_here
-
-# CrewAI Configuration
-CREWAI_VERBOSE=true
-CREWAI_DEBUG=false
-"""
-
         try:
             with open(env_file, 'w') as f:
-                f.write(env_content)
-            print("✅ .env file created with template")
+                f.write(ENV_TEMPLATE)
+            say(f"✅ .env file created with template for {project_path.name}")
             return True
         except Exception as e:
-            print(f"❌ Failed to create .env file: {e}")
+            say(f"❌ Failed to create .env file: {e}")
             return False
 
     def run_example(self, project_path: Path) -> bool:
@@ -138,69 +355,103 @@ CREWAI_DEBUG=false
         print("🎯 Running example...")
 
         try:
-            subprocess.run(['crewai', 'run'], cwd=project_path, check=True)
+            subprocess.run(['crewai', 'run'], cwd=project_path, env=self.env, check=True)
             print("✅ Example completed successfully")
             return True
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to run example: {e}")
             return False
 
-    def setup(self, project_name: str = "my_crewai_project"):
+    def build_graph(self, project_names: List[str], max_workers: int = 4, force: bool = False) -> StepGraph:
+        """The setup steps for the given projects, sharing the machine-wide steps."""
+        graph = StepGraph(max_workers=max_workers, force=force)
+        graph.add(Step("python", self.check_python_version))
+        graph.add(Step("uv", self.install_uv, inputs=lambda: {"platform": self.platform},
+                       marker_dir=self.cache_dir, verify=lambda: bool(self._which("uv"))))
+        graph.add(Step("crewai_cli", self.install_crewai_cli, deps=("python", "uv"), inputs=dict,
+                       marker_dir=self.cache_dir, verify=lambda: bool(self._which("crewai"))))
+
+        for name in project_names:
+            project_path = self.project_dir / name
+            graph.add(Step(f"{name}/create_project", lambda name=name: self.create_project(name),
+                           deps=("crewai_cli",), inputs=lambda name=name: {"project": name},
+                           marker_dir=project_path,
+                           verify=lambda path=project_path: (path / "pyproject.toml").exists()))
+            graph.add(Step(f"{name}/install_dependencies",
+                           lambda path=project_path: self.install_dependencies(path),
+                           deps=(f"{name}/create_project",),
+                           inputs=lambda path=project_path: {
+                               "python": platform.python_version(),
+                               "project": file_digest(path / "pyproject.toml", path / "uv.lock"),
+                           },
+                           marker_dir=project_path,
+                           verify=lambda path=project_path: (path / ".venv").exists()))
+            graph.add(Step(f"{name}/env_file", lambda path=project_path: self.create_env_file(path),
+                           deps=(f"{name}/create_project",)))
+        return graph
+
+    def setup(self, project_name: str = "my_crewai_project", max_workers: int = 4, force: bool = False) -> bool:
         """Complete setup process."""
-        print("🚀 CrewAI Setup Wizard")
-        print("=" * 50)
+        return self.setup_projects([project_name], max_workers=max_workers, force=force)
 
-        # Check Python version
-        if not self.check_python_version():
-            return False
+    def setup_projects(self, project_names: List[str], max_workers: int = 4, force: bool = False) -> bool:
+        """
+        Set up one or more projects, running independent steps concurrently.
 
-        # Install UV
-        if not self.install_uv():
-            return False
+        Args:
+            project_names: Projects to create (directories under the current directory)
+            max_workers: Maximum number of steps running at the same time
+            force: Re-run steps even if their completion markers are current
 
-        # Install CrewAI CLI
-        if not self.install_crewai_cli():
-            return False
+        Returns:
+            bool: True if every step succeeded
+        """
+        say("🚀 CrewAI Setup Wizard")
+        say("=" * 50)
 
-        # Create project
-        if not self.create_project(project_name):
-            return False
+        start = time.perf_counter()
+        results = self.build_graph(project_names, max_workers=max_workers, force=force).run()
+        print_timings(results, time.perf_counter() - start)
 
-        project_path = self.project_dir / project_name
-
-        # Install dependencies
-        if not self.install_dependencies(project_path):
+        if any(result.status in ("failed", "skipped") for result in results):
             return False
 
-        # Create .env file
-        if not self.create_env_file(project_path):
-            return False
-
-        print("\n" + "=" * 50)
-        print("🎉 Setup completed successfully!")
-        print(f"📁 Project created at: {project_path}")
-        print("\n📝 Next steps:")
-        print("1. Edit the .env file with your API keys")
-        print("2. Customize agents and tasks in config/")
-        print("3. Run 'crewai run' to test your crew")
-        print("4. Check out the documentation at https://docs.crewai.com")
+        say("\n" + "=" * 50)
+        say("🎉 Setup completed successfully!")
+        for name in project_names:
+            say(f"📁 Project created at: {self.project_dir / name}")
+        say("\n📝 Next steps:")
+        say("1. Edit the .env file with your API keys")
+        say("2. Customize agents and tasks in config/")
+        say("3. Run 'crewai run' to test your crew")
+        say("4. Check out the documentation at https://docs.crewai.com")
 
         return True
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Set up CrewAI and create one or more projects")
+    parser.add_argument("projects", nargs="*", help="Project names (prompted for when omitted)")
+    parser.add_argument("--workers", type=int, default=4, help="Setup steps running at the same time")
+    parser.add_argument("--force", action="store_true", help="Re-run steps that are already complete")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                        help="Shared package cache and completion markers")
+    parser.add_argument("--wheelhouse", type=Path, help="Directory of pre-built wheels used by every project")
+    return parser.parse_args(argv)
+
+
 def main():
     """Main function for the setup script."""
-    setup = CrewAISetup()
+    args = parse_args()
+    setup = CrewAISetup(cache_dir=args.cache_dir, wheelhouse=args.wheelhouse)
 
-    # Get project name from user or use default
-    if len(sys.argv) > 1:
-        project_name = sys.argv[1]
-    else:
+    # Get project names from the command line or the user, or use the default
+    project_names = args.projects
+    if not project_names:
         project_name = input("Enter project name (or press Enter for default): ").strip()
-        if not project_name:
-            project_name = "my_crewai_project"
+        project_names = [project_name or "my_crewai_project"]
 
-    success = setup.setup(project_name)
+    success = setup.setup_projects(project_names, max_workers=args.workers, force=args.force)
 
     if success:
         print("\n🌟 You're all set to start building with CrewAI!")
@@ -210,4 +461,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
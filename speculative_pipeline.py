@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Speculative Task Pipelining
+
+Runs a chain of tasks (research → write → edit) with overlapping stages:
+- Every task's answer is streamed (see streaming_output.py) into a
+  SectionFeed, which tracks the markdown sections completed so far
+- Once the upstream task has streamed `start_after` complete sections, the
+  downstream task starts speculatively, with those sections as its context
+- When the upstream task finishes, the speculation is judged on the
+  sections it saw: if they changed, the downstream task is rerun normally
+  with the final context; if not, the speculation is kept
+- A kept speculation that missed more than `max_missing` of the final
+  upstream output gets a follow-up run on just the sections it had not
+  seen, whose answer is appended to the kept one; the earlier part stays
+  unchanged, so whatever speculated on it downstream remains valid
+- An upstream task that is itself rerun restarts its feed, so anything that
+  speculated on its first answer is checked against the second
+
+With speculations kept, a chain takes about as long as its longest stage
+plus the time to the first sections of each upstream stage and the
+follow-ups, instead of the sum of all stages. A rejected speculation costs
+one extra run of that stage.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import re
+import time
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from crewai import Task, TaskOutput
+
+from checkpoint import context_tasks
+from dag_scheduler import TaskTiming, default_context, run_crewai_task, task_label
+from streaming_output import Observer, stream_label
+
+
+HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+FOLLOW_UP_NOTE = (
+    "You already answered this task from the first part of its input; that answer is under 'Earlier answer' "
+    "and is kept as it is. The rest of the input is under 'New input'. Answer with only what the new input "
+    "adds, written to follow on from your earlier answer, which it will be appended to. If the task asks you "
+    "to save your answer to a file, save the earlier answer followed by the new part.")
+DEFAULT_START_AFTER = 3
+DEFAULT_MAX_MISSING = 0.15
+
+
+class SectionFeed:
+    """The streamed text of one task, split at markdown headings as it arrives."""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the text streamed so far (the task is starting over)."""
+        with self._condition:
+            self._text = ""
+            self._headings: List[int] = []
+            self._closed = False
+            self._condition.notify_all()
+
+    def append(self, chunk: str) -> None:
+        with self._condition:
+            # Rescan from the start of the last line, where a heading may be split across chunks.
+            scan_from = self._text.rfind("\n") + 1
+            self._text += chunk
+            last = self._headings[-1] if self._headings else -1
+            self._headings.extend(match.start() for match in HEADING.finditer(self._text, scan_from)
+                                  if match.start() > last)
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Mark the task finished (or failed); waiters stop waiting."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def completed(self) -> Tuple[int, str]:
+        """Number of complete sections and their text (everything before the section being written)."""
+        with self._condition:
+            if len(self._headings) < 2:
+                return 0, ""
+            return len(self._headings) - 1, self._text[:self._headings[-1]]
+
+    def wait_for(self, sections: int) -> Optional[str]:
+        """Text of the first complete sections once there are enough; None if the task finished first."""
+        with self._condition:
+            while not self._closed:
+                count, text = self.completed()
+                if count >= sections:
+                    return text
+                self._condition.wait()
+            return None
+
+
+class SectionFeeds:
+    """Streaming observer sending each task's text to its SectionFeed (and on to another observer)."""
+
+    def __init__(self, forward: Optional[Observer] = None):
+        self.forward = forward
+        self._feeds: Dict[str, SectionFeed] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, label: str, chunk: str) -> None:
+        self.feed(label).append(chunk)
+        if self.forward:
+            self.forward(label, chunk)
+
+    def feed(self, label: str) -> SectionFeed:
+        with self._lock:
+            return self._feeds.setdefault(label, SectionFeed())
+
+
+@dataclass
+class Speculation:
+    """Outcome of one speculative start."""
+
+    label: str
+    sections: int
+    coverage: float
+    accepted: bool
+    followed_up: bool = False
+
+
+@dataclass
+class PipelineResult:
+    """Outputs, timing and speculation outcomes of a pipelined run."""
+
+    outputs: List[Optional[TaskOutput]]
+    timings: List[TaskTiming]
+    speculations: List[Speculation]
+    wall_time: float
+    sequential_time: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.sequential_time = sum(timing.duration for timing in self.timings)
+
+    def report(self) -> str:
+        """Per-task timing table, speculation outcomes and wall time."""
+        lines = [f"{'#':>2}  {'Task':<48} {'Start':>8} {'Duration':>9}"]
+        for index, timing in enumerate(self.timings):
+            lines.append(f"{index:>2}  {timing.label:<48} {timing.start:>7.2f}s {timing.duration:>8.2f}s")
+        for speculation in self.speculations:
+            outcome = "rerun"
+            if speculation.accepted:
+                outcome = "kept + follow-up" if speculation.followed_up else "kept"
+            lines.append(f"Speculation '{speculation.label}': started on {speculation.sections} section(s), "
+                         f"{speculation.coverage:.0%} of final context → {outcome}")
+        lines.append(f"Wall time {self.wall_time:.2f}s vs {self.sequential_time:.2f}s of task time")
+        return "\n".join(lines)
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+class SpeculativePipeline:
+    """
+    Runs tasks with each one starting on the completed sections of its
+    latest upstream task.
+
+    Context tasks that are not part of the pipeline (for example tasks
+    restored from a checkpoint) count as done and their existing output is
+    used. Only the latest upstream task of each task is speculated on;
+    earlier ones are waited for.
+    """
+
+    def __init__(self, tasks: List[Task], feeds: SectionFeeds, start_after: int = DEFAULT_START_AFTER,
+                 max_missing: float = DEFAULT_MAX_MISSING,
+                 run_task: Callable[[Task, str], TaskOutput] = run_crewai_task):
+        """
+        Args:
+            tasks: Tasks to run, upstream tasks first
+            feeds: Observer of the tasks' streamed answers (passed to StreamingOutput)
+            start_after: Complete upstream sections needed to start speculatively
+            max_missing: Largest share of the final upstream output a kept
+                speculation may have missed without a follow-up run
+            run_task: Executes one task given its context string
+        """
+        self.tasks = tasks
+        self.feeds = feeds
+        self.start_after = start_after
+        self.max_missing = max_missing
+        self.run_task = run_task
+        index_of = {id(task): index for index, task in enumerate(tasks)}
+        self.upstream: List[List[int]] = [
+            [index_of[id(upstream)] for upstream in context_tasks(task) if id(upstream) in index_of]
+            for task in tasks
+        ]
+        for index, upstream in enumerate(self.upstream):
+            if any(dependency >= index for dependency in upstream):
+                raise ValueError(f"Task '{task_label(tasks[index])}' depends on a later task")
+
+    def _feed(self, index: int) -> SectionFeed:
+        return self.feeds.feed(stream_label(self.tasks[index]))
+
+    def _speculative_context(self, task: Task, upstream: Task, snapshot: str) -> str:
+        return CONTEXT_DIVIDER.join(snapshot if other is upstream else other.output.raw
+                                    for other in context_tasks(task)
+                                    if other is upstream or other.output is not None)
+
+    @staticmethod
+    def _follow_up_context(earlier: str, new_input: str) -> str:
+        return CONTEXT_DIVIDER.join([FOLLOW_UP_NOTE, f"Earlier answer:\n\n{earlier}", f"New input:\n\n{new_input}"])
+
+    def run(self) -> PipelineResult:
+        """
+        Run every task, overlapping each with its upstream task.
+
+        Raises:
+            Exception: The first task failure; tasks waiting on it are skipped
+        """
+        count = len(self.tasks)
+        done = [threading.Event() for _ in range(count)]
+        failed = threading.Event()
+        outputs: List[Optional[TaskOutput]] = [None] * count
+        timings = [TaskTiming(task_label(task)) for task in self.tasks]
+        speculations: List[Speculation] = []
+        started_at = time.perf_counter()
+        for index in range(count):
+            self._feed(index).reset()
+
+        def run_stage(index: int) -> None:
+            try:
+                outputs[index] = self._stage(index, done, failed, timings, speculations, started_at)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                timings[index].end = time.perf_counter() - started_at
+                done[index].set()
+                self._feed(index).close()
+
+        with ThreadPoolExecutor(max_workers=max(count, 1), thread_name_prefix="pipeline-task") as pool:
+            futures = [pool.submit(run_stage, index) for index in range(count)]
+        for future in futures:
+            if future.exception() is not None:
+                raise future.exception()
+
+        return PipelineResult(outputs, timings, speculations, time.perf_counter() - started_at)
+
+    def _stage(self, index: int, done: List[threading.Event], failed: threading.Event,
+               timings: List[TaskTiming], speculations: List[Speculation], started_at: float) -> Optional[TaskOutput]:
+        task = self.tasks[index]
+        upstream = self.upstream[index]
+
+        if upstream:
+            latest = max(upstream)
+            for dependency in upstream:
+                if dependency != latest:
+                    done[dependency].wait()
+            snapshot = None if failed.is_set() else self._feed(latest).wait_for(self.start_after)
+            if snapshot is not None and not failed.is_set():
+                timings[index].ready = timings[index].start = time.perf_counter() - started_at
+                output = self.run_task(task, self._speculative_context(task, self.tasks[latest], snapshot))
+                done[latest].wait()
+                if failed.is_set():
+                    return None
+                sections = self._sections(snapshot)
+                seen, unseen = self._split(self.tasks[latest].output.raw, sections)
+                total = len(_normalize(seen + unseen))
+                coverage = len(_normalize(snapshot)) / total if total else 1.0
+                accepted = _normalize(seen) == _normalize(snapshot)
+                followed_up = accepted and 1 - coverage > self.max_missing
+                speculations.append(Speculation(task_label(task), sections, coverage, accepted, followed_up))
+                if followed_up:
+                    return self._follow_up(task, output, unseen)
+                if accepted:
+                    return output
+                self._feed(index).reset()
+            for dependency in upstream:
+                done[dependency].wait()
+            if failed.is_set():
+                return None
+
+        if not timings[index].start:
+            timings[index].ready = timings[index].start = time.perf_counter() - started_at
+        return self.run_task(task, default_context(task, context_tasks(task)))
+
+    def _follow_up(self, task: Task, earlier: TaskOutput, new_input: str) -> TaskOutput:
+        """Run a task on the upstream sections its speculation missed, appending the answer to the earlier one."""
+        callback = task.callback
+        prefix = earlier.raw.rstrip() + "\n\n"
+
+        def complete(output: TaskOutput) -> Any:
+            # Called before the output is checkpointed or streamed to its file, so both get the whole answer.
+            output.raw = prefix + output.raw.lstrip()
+            return callback(output) if callback is not None else None
+
+        self.feeds(stream_label(task), "\n\n")
+        task.callback = complete
+        try:
+            return self.run_task(task, self._follow_up_context(earlier.raw, new_input))
+        finally:
+            task.callback = callback
+
+    @staticmethod
+    def _sections(text: str) -> int:
+        return len(HEADING.findall(text))
+
+    @staticmethod
+    def _split(text: str, sections: int) -> Tuple[str, str]:
+        """Split text after its first complete sections (and anything before the first heading)."""
+        headings = [match.start() for match in HEADING.finditer(text)]
+        cut = headings[sections] if len(headings) > sections else len(text)
+        return text[:cut], text[cut:]
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Streaming Task Output
+
+Writes each task's final answer to an answer file while the LLM generates it:
+- The answer file sits next to the file the task targets ('notes.md' →
+  'notes.answer.md'); the target itself belongs to the agent, which writes
+  it with its file tool and may answer with something else (an editor's
+  answer can be a summary of its changes), so it is never overwritten
+- Tokens go to '<answer file>.partial' and to an observer callback (e.g.
+  stdout) as they arrive, so downstream consumers can start on early sections
+- When the task completes, the partial file is fsynced and atomically
+  renamed onto the answer file; readers never see a half-written answer
+- Only the final answer is streamed: ReAct thoughts and tool calls are
+  skipped, and a retried answer restarts the partial file
+- Nothing is accumulated in memory; a running hash of the streamed text is
+  compared with the task's final output, which replaces the file only if
+  CrewAI post-processed the answer
+
+Token streaming needs an LLM that streams (CrewAI's LLM with stream=True)
+and a CrewAI release that emits LLM stream-chunk events. Other LLMs (and
+cached responses) are streamed one whole response at a time.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import sys
+import hashlib
+import weakref
+import threading
+import contextvars
+from typing import Any, Callable, Dict, List, Optional, Union
+from crewai import Task
+from crewai.llms.base_llm import BaseLLM
+
+from llm_wrappers import DelegatingLLM, unwrap_llm
+from tool_wrappers import wrap_method
+
+try:
+    from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+except ImportError:
+    try:  # older CrewAI releases
+        from crewai.utilities.events import LLMStreamChunkEvent, crewai_event_bus
+    except ImportError:
+        LLMStreamChunkEvent = crewai_event_bus = None
+
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+ANSWER_SUFFIX = ".answer"
+PARTIAL_SUFFIX = ".partial"
+
+Observer = Callable[[str, str], None]
+
+
+def stream_label(task: Task) -> str:
+    """The label a task's streamed text is reported under (its name, else its agent's role)."""
+    return getattr(task, "name", None) or getattr(task.agent, "role", None) or "task"
+
+
+def answer_path(path: str) -> str:
+    """The file a task's streamed answer goes to, next to the file the task writes itself."""
+    root, extension = os.path.splitext(path)
+    return root + ANSWER_SUFFIX + extension
+
+
+def print_chunk(label: str, chunk: str) -> None:
+    """Observer echoing streamed text to stdout."""
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+
+
+class TaskStream:
+    """Streams one task's final answer into '<path>.partial', then renames it onto path."""
+
+    def __init__(self, path: str, label: str, observer: Optional[Observer] = None):
+        self.path = path
+        self.label = label
+        self.observer = observer
+        self.partial_path = path + PARTIAL_SUFFIX
+        self._file = None
+        self._lock = threading.Lock()
+        self._reset_call(react=True)
+
+    def _reset_call(self, react: bool) -> None:
+        self._pending = "" if react else None  # text held back while looking for the marker
+        self._call_chunks = 0
+
+    def open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.partial_path, 'w', encoding='utf-8')
+        self._hash = hashlib.sha256()
+        self._written = 0
+
+    def begin_call(self, react: bool) -> None:
+        """
+        Start a new LLM call of this task.
+
+        Args:
+            react: The response is ReAct text, so only what follows
+                'Final Answer:' is streamed
+        """
+        with self._lock:
+            self._reset_call(react)
+
+    def feed(self, chunk: str) -> None:
+        """Stream a piece of the current LLM response."""
+        with self._lock:
+            if self._file is None:  # chunk delivered after the task finished
+                return
+            self._call_chunks += 1
+            if self._pending is not None:
+                self._pending += chunk
+                marker = self._pending.find(FINAL_ANSWER_MARKER)
+                if marker < 0:
+                    # Keep just enough text to find a marker split across chunks.
+                    self._pending = self._pending[-len(FINAL_ANSWER_MARKER):]
+                    return
+                chunk = self._pending[marker + len(FINAL_ANSWER_MARKER):].lstrip()
+                self._pending = None
+                self._restart()
+            elif self._call_chunks == 1:
+                self._restart()
+            if chunk:
+                self._write(chunk)
+
+    def end_call(self, response: Any) -> None:
+        """Finish the current LLM call; a response that was not streamed is fed whole."""
+        if self._call_chunks == 0 and isinstance(response, str):
+            self.feed(response)
+
+    def _restart(self) -> None:
+        """Discard an answer streamed by an earlier call of this task."""
+        if self._written:
+            self._file.seek(0)
+            self._file.truncate()
+            self._hash = hashlib.sha256()
+            self._written = 0
+            if self.observer:
+                self.observer(self.label, "\n")
+
+    def _write(self, chunk: str) -> None:
+        self._file.write(chunk)
+        self._file.flush()
+        self._hash.update(chunk.encode("utf-8"))
+        self._written += len(chunk)
+        if self.observer:
+            self.observer(self.label, chunk)
+
+    def commit(self, raw: Optional[str]) -> None:
+        """Make the streamed answer the target file (rewritten if the final output differs)."""
+        with self._lock:
+            if raw is not None and hashlib.sha256(raw.encode("utf-8")).digest() != self._hash.digest():
+                self._file.seek(0)
+                self._file.truncate()
+                self._file.write(raw)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            os.replace(self.partial_path, self.path)
+        if self.observer:
+            self.observer(self.label, "\n")
+
+    def abort(self) -> None:
+        """Close the partial file after a failed task (it is left for inspection)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class StreamingOutput:
+    """Streams the final answers of attached tasks to answer files and an observer."""
+
+    def __init__(self, observer: Optional[Observer] = None):
+        """
+        Args:
+            observer: Called with (task label, text) for every streamed piece of text
+        """
+        self.observer = observer
+        self._current: contextvars.ContextVar[Optional[TaskStream]] = contextvars.ContextVar("stream", default=None)
+        self._by_task_id: Dict[str, TaskStream] = {}
+        self._lock = threading.Lock()
+        _subscribe(self)
+
+    def wrap(self, llm: BaseLLM) -> BaseLLM:
+        """Wrap the agents' LLM so its responses are streamed; switches on token streaming where supported."""
+        inner = unwrap_llm(llm)
+        if LLMStreamChunkEvent is not None and hasattr(inner, "stream"):
+            inner.stream = True
+        return llm if isinstance(llm, StreamingLLM) else StreamingLLM(llm, streams=self)
+
+    def attach(self, tasks: List[Task], paths: List[str]) -> List[Task]:
+        """Stream the final answer of each task next to the file it writes (see answer_path; in place)."""
+        for task, path in zip(tasks, paths):
+            wrap_method(task, "execute_sync", self._streaming(task, answer_path(path), stream_label(task)),
+                        tag="streaming_output")
+        return tasks
+
+    def _streaming(self, task: Task, path: str, label: str):
+        def decorator(execute_sync):
+            def execute(*args: Any, **kwargs: Any) -> Any:
+                stream = TaskStream(path, label, self.observer)
+                stream.open()
+                task_id = str(getattr(task, "id", id(task)))
+                with self._lock:
+                    self._by_task_id[task_id] = stream
+                token = self._current.set(stream)
+                try:
+                    output = execute_sync(*args, **kwargs)
+                    stream.commit(getattr(output, "raw", None))
+                    return output
+                except BaseException:
+                    stream.abort()
+                    raise
+                finally:
+                    self._current.reset(token)
+                    with self._lock:
+                        self._by_task_id.pop(task_id, None)
+            return execute
+        return decorator
+
+    def current(self) -> Optional[TaskStream]:
+        """The stream of the task running in this context, if any."""
+        return self._current.get()
+
+    def on_chunk(self, event: Any) -> None:
+        """Route an LLM stream-chunk event to its task's stream."""
+        task_id = getattr(event, "task_id", None)
+        with self._lock:
+            stream = self._by_task_id.get(str(task_id)) if task_id else None
+        stream = stream or self._current.get()
+        if stream is not None:
+            stream.feed(getattr(event, "chunk", "") or "")
+
+
+class StreamingLLM(DelegatingLLM):
+    """LLM wrapper marking the start and end of each call on the calling task's stream."""
+
+    streams: Any = None
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        stream = self.streams.current()
+        if stream is not None:
+            stream.begin_call(react=not (tools and self.supports_function_calling()))
+        response = self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                       available_functions=available_functions, from_task=from_task,
+                                       from_agent=from_agent, response_model=response_model)
+        if stream is not None:
+            stream.end_call(response)
+        return response
+
+
+_subscribers: "weakref.WeakSet[StreamingOutput]" = weakref.WeakSet()
+_subscribed = False
+_subscribe_lock = threading.Lock()
+
+
+def _subscribe(streams: StreamingOutput) -> None:
+    """Register one event-bus handler per process that forwards chunks to every StreamingOutput."""
+    if crewai_event_bus is None:
+        return
+    global _subscribed
+    with _subscribe_lock:
+        if not _subscribed:
+            @crewai_event_bus.on(LLMStreamChunkEvent)
+            def forward_chunk(source: Any, event: Any) -> None:
+                for subscriber in list(_subscribers):
+                    subscriber.on_chunk(event)
+            _subscribed = True
+        _subscribers.add(streams)
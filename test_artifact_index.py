@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Artifact Index Tests
+
+Scoped search on an index large enough for LSH, and document frequencies
+and compaction when artifacts are replaced.
+
+Run with: python -m pytest test_artifact_index.py
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("crewai")
+
+import artifact_index  # noqa: E402
+from artifact_index import EXACT_SEARCH_LIMIT, ArtifactIndex  # noqa: E402
+
+
+def filler(paragraphs: int, seed: int) -> str:
+    rng = random.Random(seed)
+    vocabulary = [f"term{number}" for number in range(5000)]
+    return "\n\n".join(" ".join(rng.choice(vocabulary) for _ in range(100)) for _ in range(paragraphs))
+
+
+def test_scoped_search_is_exact_on_a_large_index(tmp_path):
+    index = ArtifactIndex(str(tmp_path / "index"))
+    index.add_text("other/notes.md", filler(EXACT_SEARCH_LIMIT + 1000, seed=1))
+    index.add_text("run/research.md", "\n\n".join([
+        "Regulatory risk is the main concern for diagnostic vendors entering the market.",
+        filler(3, seed=2),
+    ]))
+    assert index.count > EXACT_SEARCH_LIMIT
+
+    results = index.search("regulatory risk diagnostic vendors", sources=["run/research.md"])
+
+    assert results and results[0]["source"] == "run/research.md"
+    assert "Regulatory risk" in results[0]["text"]
+
+
+def test_replacing_artifacts_keeps_frequencies_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifact_index, "COMPACT_MIN_DELETED", 0)
+    index = ArtifactIndex(str(tmp_path / "index"))
+    index.add_text("run/draft.md", filler(3, seed=3))
+    index.add_text("run/research.md", filler(2, seed=4))
+    final_draft = "A final draft about sepsis screening.\n\n" + filler(2, seed=5)
+    index.add_text("run/draft.md", final_draft)
+    index.remove("run/research.md")
+
+    fresh = ArtifactIndex(str(tmp_path / "fresh"))
+    fresh.add_text("run/draft.md", final_draft)
+    assert np.allclose(index.document_frequency, fresh.document_frequency)
+    assert index.count - len(index.deleted) == fresh.count
+    assert index.count < fresh.count * 2  # deleted rows were compacted away
+
+    index.close()
+    reopened = ArtifactIndex(str(tmp_path / "index"))
+    results = reopened.search("sepsis screening", source="run/draft.md")
+    assert results and "sepsis screening" in results[0]["text"]
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Speculative Pipeline Tests
+
+Runs a research → write → edit chain through SpeculativePipeline with a
+scripted run_task in place of the agents (no LLM is called):
+- Every agent thinks for a while, then answers with one markdown section
+  per section of its input, streamed at a fixed pace
+- A follow-up run answers with the sections for just its new input
+
+Run with: python -m pytest test_speculative_pipeline.py
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import time
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai import Agent, Task, TaskOutput  # noqa: E402
+
+from mock_llm import MockLLM  # noqa: E402
+from speculative_pipeline import (  # noqa: E402
+    CONTEXT_DIVIDER, FOLLOW_UP_NOTE, HEADING, SectionFeeds, SpeculativePipeline,
+)
+from streaming_output import stream_label  # noqa: E402
+
+
+SECTIONS = 8
+THINK_SECONDS = 0.1
+SECTION_SECONDS = 0.03
+
+
+class ScriptedRun:
+    """run_task stand-in answering like a well-behaved agent, at a fixed pace."""
+
+    def __init__(self, feeds: SectionFeeds, rewrite: str = ""):
+        self.feeds = feeds
+        self.rewrite = rewrite  # task whose final output differs from what it streamed
+        self.durations = []
+
+    def __call__(self, task: Task, context: str) -> TaskOutput:
+        started = time.perf_counter()
+        if context.startswith(FOLLOW_UP_NOTE):
+            _, earlier, new_input = context.split(CONTEXT_DIVIDER)
+            first, count = len(HEADING.findall(earlier)), len(HEADING.findall(new_input))
+        else:
+            time.sleep(THINK_SECONDS)
+            first, count = 0, len(HEADING.findall(context)) or SECTIONS
+        text = ""
+        for number in range(first, first + count):
+            time.sleep(SECTION_SECONDS)
+            section = f"## {task.name} {number}\n\n{task.name} notes on part {number}.\n\n"
+            self.feeds(stream_label(task), section)
+            text += section
+        if task.name == self.rewrite:
+            text = text.replace("notes on part 1.", "revised notes on part 1.")
+        # Like Task.execute_sync: store the output, then run the callback.
+        output = TaskOutput(description=task.description, raw=text.strip(), agent=task.agent.role)
+        task.output = output
+        if task.callback is not None:
+            task.callback(output)
+        self.durations.append(time.perf_counter() - started)
+        return output
+
+
+def make_chain():
+    names = ["research", "writing", "editing"]
+    tasks = []
+    for name in names:
+        agent = Agent(role=f"{name} agent", goal=f"Do the {name}", backstory="Scripted for tests.",
+                      llm=MockLLM(), allow_delegation=False)
+        tasks.append(Task(name=name, description=f"Do the {name}.", expected_output="Markdown sections",
+                          agent=agent, context=tasks[-1:]))
+    return tasks
+
+
+def expected_answer(name: str) -> str:
+    return "".join(f"## {name} {number}\n\n{name} notes on part {number}.\n\n"
+                   for number in range(SECTIONS)).strip()
+
+
+def test_kept_speculations_overlap_stages():
+    tasks = make_chain()
+    feeds = SectionFeeds()
+    run_task = ScriptedRun(feeds)
+    completed = []
+    tasks[-1].callback = completed.append
+
+    result = SpeculativePipeline(tasks, feeds, run_task=run_task).run()
+
+    assert [speculation.accepted for speculation in result.speculations] == [True, True]
+    assert all(speculation.followed_up for speculation in result.speculations)
+    for task, output in zip(tasks, result.outputs):
+        assert output.raw == expected_answer(task.name)
+    # The callback (which checkpoints the task) sees the whole answer, not just the follow-up's part.
+    assert completed[-1].raw == expected_answer("editing")
+    solo_time = len(tasks) * (THINK_SECONDS + SECTIONS * SECTION_SECONDS)
+    assert result.wall_time < result.sequential_time
+    assert result.wall_time < 0.9 * solo_time
+
+
+def test_changed_sections_rerun_the_speculation():
+    tasks = make_chain()
+    feeds = SectionFeeds()
+    run_task = ScriptedRun(feeds, rewrite="research")
+
+    result = SpeculativePipeline(tasks, feeds, run_task=run_task).run()
+
+    writing = result.speculations[[speculation.label for speculation in result.speculations].index("writing")]
+    assert not writing.accepted
+    assert result.outputs[1].raw == expected_answer("writing")
+    assert result.outputs[2].raw == expected_answer("editing")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tool Wrappers
+
+Helpers for wrapping the function a CrewAI tool runs (or a method of any
+other CrewAI object, such as a task), so cross-cutting behaviour (result
+caching, streaming, ...) can be added to existing instances without
+changing their classes.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import functools
+from typing import Any, Callable
+from crewai.tools import BaseTool
+from crewai.tools.base_tool import Tool
+
+
+def _is_wrapped(function: Callable[..., Any], tag: str) -> bool:
+    while function is not None:
+        if getattr(function, "_tool_wrapper_tag", None) == tag:
+            return True
+        function = getattr(function, "__wrapped__", None)
+    return False
+
+
+def wrap_method(obj: Any, attribute: str, decorator: Callable[[Callable[..., Any]], Callable[..., Any]],
+                tag: str) -> Any:
+    """
+    Replace obj.<attribute> on the instance with decorator(current), once per tag.
+
+    Args:
+        obj: Object to modify in place (pydantic models included)
+        attribute: Name of the method or function attribute to wrap
+        decorator: Takes the current function and returns its replacement
+        tag: Name of the wrapper, used to avoid wrapping twice
+
+    Returns:
+        Any: The same object
+    """
+    current = getattr(obj, attribute)
+    if _is_wrapped(current, tag):
+        return obj
+
+    wrapped = functools.wraps(current)(decorator(current))
+    wrapped._tool_wrapper_tag = tag
+    object.__setattr__(obj, attribute, wrapped)
+    return obj
+
+
+def wrap_tool(tool: BaseTool, decorator: Callable[[Callable[..., Any]], Callable[..., Any]], tag: str) -> BaseTool:
+    """
+    Wrap the function a tool executes, once per tag.
+
+    `@tool` functions run their `func`; BaseTool subclasses run `_run`, which
+    is replaced on the instance only. Wrapping a tool twice with the same tag
+    is a no-op, so shared tool instances can be wrapped by every crew.
+
+    Args:
+        tool: Tool instance to wrap (modified in place)
+        decorator: Takes the current function and returns its replacement
+        tag: Name of the wrapper, used to avoid wrapping twice
+
+    Returns:
+        BaseTool: The same tool instance
+    """
+    return wrap_method(tool, "func" if isinstance(tool, Tool) else "_run", decorator, tag)
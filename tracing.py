@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Run Tracing
+
+Lightweight spans for crew runs:
+- Spans for crew build and execution, each task, each LLM call and each
+  tool call, with duration, estimated token counts, bytes in and out and
+  LLM cache hits
+- Spans are written to a JSONL file (one span per line) or, for a path
+  ending in .json, to a Chrome trace (open it in chrome://tracing or Perfetto)
+- A summary table sorted by self-time (time not spent in child spans)
+
+Task and tool spans come from CrewAI's event bus (task started/completed/
+failed and tool usage events); LLM spans from a TracingLLM wrapper around
+the agents' LLM. CrewAI releases without an event bus get LLM spans only.
+
+Tracing is off unless configured (CREWAI_TRACE=<path> or configure_tracing()).
+When off, span() returns a shared no-op context manager, nothing is wrapped
+and no event handlers are registered, so the cost is a single attribute
+check per span.
+
+Author: AI Assistant
+Date: 2025
+"""
+
+import os
+import json
+import time
+import threading
+import contextlib
+import contextvars
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+from crewai import Task
+from crewai.llms.base_llm import BaseLLM
+from crewai.tools import BaseTool
+
+from llm_wrappers import DelegatingLLM
+
+try:
+    from crewai.events import (TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, ToolUsageErrorEvent,
+                               ToolUsageFinishedEvent, ToolUsageStartedEvent, crewai_event_bus)
+except ImportError:
+    try:  # older CrewAI releases
+        from crewai.utilities.events import (TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent,
+                                             ToolUsageErrorEvent, ToolUsageFinishedEvent,
+                                             ToolUsageStartedEvent, crewai_event_bus)
+    except ImportError:
+        crewai_event_bus = None
+
+
+CHARS_PER_TOKEN = 4
+_NO_SPAN = contextlib.nullcontext()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _message_text(messages: Union[str, List[Dict[str, Any]]]) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "".join(str(message.get("content", "")) for message in messages)
+
+
+@dataclass
+class Span:
+    """One timed operation."""
+
+    name: str
+    category: str
+    span_id: int
+    parent_id: Optional[int]
+    thread: str
+    start: float
+    end: float = 0.0
+    child_time: float = 0.0
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> float:
+        return max(self.duration - self.child_time, 0.0)
+
+
+class Tracer:
+    """Collects spans; nesting follows the context (threads started with a copied context inherit it)."""
+
+    def __init__(self, enabled: bool = True, path: Optional[str] = None):
+        """
+        Args:
+            enabled: Record spans (a disabled tracer records nothing)
+            path: File written by save() (.json for a Chrome trace, otherwise JSONL)
+        """
+        self.enabled = enabled
+        self.path = path
+        self.spans: List[Span] = []
+        self._open: Dict[int, Span] = {}
+        self._origin = time.perf_counter()
+        self._wall_origin = time.time()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("span", default=None)
+
+    def span(self, name: str, category: str = "app", **attrs: Any):
+        """Context manager timing a block; yields the Span (None when disabled)."""
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, category, attrs)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, category: str, attrs: Dict[str, Any]) -> Iterator[Span]:
+        parent = self._current.get()
+        with self._lock:
+            self._next_id += 1
+            span_id = self._next_id
+        span = Span(name, category, span_id, parent.span_id if parent else None,
+                    threading.current_thread().name, time.perf_counter() - self._origin, attrs=attrs)
+        with self._lock:
+            self._open[span_id] = span
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            span.end = time.perf_counter() - self._origin
+            self._current.reset(token)
+            with self._lock:
+                if parent is not None:
+                    parent.child_time += span.duration
+                del self._open[span.span_id]
+                self.spans.append(span)
+
+    def at(self, wall_time: Optional[float] = None) -> float:
+        """Trace time (seconds since the tracer started) of a wall-clock time (default: now)."""
+        if wall_time is None:
+            return time.perf_counter() - self._origin
+        return wall_time - self._wall_origin
+
+    def record(self, name: str, category: str, start: float, end: float, attrs: Dict[str, Any],
+               adopt: Optional[str] = None) -> Optional[Span]:
+        """
+        Add a span that was timed elsewhere (e.g. from event timestamps).
+
+        Args:
+            start, end: Trace times (see at())
+            adopt: Task ID; spans recorded with this task_id (or, without one,
+                by the same agent) inside [start, end] become children of the
+                new span, which takes their former parent
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._next_id += 1
+            span = Span(name, category, self._next_id, None, threading.current_thread().name,
+                        start, end=max(end, start), attrs=attrs)
+            if adopt is not None:
+                self._adopt(span, adopt)
+            self.spans.append(span)
+        return span
+
+    def _adopt(self, span: Span, task_id: str) -> None:
+        agent = span.attrs.get("agent")
+        by_id = {other.span_id: other for other in self.spans}
+        by_id.update(self._open)
+        children = [child for child in self.spans
+                    if child.category in ("llm", "tool") and span.start <= child.start and child.end <= span.end
+                    and getattr(by_id.get(child.parent_id), "category", None) != "task"
+                    and (child.attrs.get("task_id") == task_id
+                         or (child.attrs.get("task_id") is None and child.attrs.get("agent") == agent))]
+        for child in children:
+            former = by_id.get(child.parent_id)
+            if former is not None:
+                span.parent_id = span.parent_id or former.span_id
+                former.child_time -= child.duration
+            child.parent_id = span.span_id
+            span.child_time += child.duration
+        parent = by_id.get(span.parent_id)
+        if parent is not None:
+            parent.child_time += span.duration
+
+    def annotate(self, **attrs: Any) -> None:
+        """Add attributes to the innermost open span."""
+        current = self._current.get() if self.enabled else None
+        if current is not None:
+            current.attrs.update(attrs)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (category, name) totals, sorted by self-time, largest first."""
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            row = rows.setdefault((span.category, span.name), {
+                "category": span.category, "name": span.name, "count": 0,
+                "total": 0.0, "self": 0.0, "tokens_in": 0, "tokens_out": 0, "cache_hits": 0,
+            })
+            row["count"] += 1
+            row["total"] += span.duration
+            row["self"] += span.self_time
+            row["tokens_in"] += span.attrs.get("tokens_in", 0)
+            row["tokens_out"] += span.attrs.get("tokens_out", 0)
+            row["cache_hits"] += 1 if span.attrs.get("cache_hit") else 0
+        return sorted(rows.values(), key=lambda row: row["self"], reverse=True)
+
+    def format_summary(self, limit: int = 25) -> str:
+        lines = [f"{'Category':<8} {'Span':<40} {'Count':>6} {'Total':>9} {'Self':>9} "
+                 f"{'Tok in':>8} {'Tok out':>8} {'Hits':>5}"]
+        for row in self.summary()[:limit]:
+            name = row["name"] if len(row["name"]) <= 40 else row["name"][:39] + "…"
+            lines.append(f"{row['category']:<8} {name:<40} {row['count']:>6} {row['total']:>8.3f}s "
+                         f"{row['self']:>8.3f}s {row['tokens_in']:>8} {row['tokens_out']:>8} "
+                         f"{row['cache_hits']:>5}")
+        return "\n".join(lines)
+
+    def _records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        return [{
+            "id": span.span_id, "parent": span.parent_id, "name": span.name, "category": span.category,
+            "thread": span.thread, "start": round(span.start, 6), "duration": round(span.duration, 6),
+            "self_time": round(span.self_time, 6), **span.attrs,
+        } for span in spans]
+
+    def write_jsonl(self, path: str) -> None:
+        with open(path, 'w') as f:
+            for record in self._records():
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write complete ("X") events in the Chrome trace event format."""
+        threads: Dict[str, int] = {}
+        events = []
+        for record in self._records():
+            tid = threads.setdefault(record["thread"], len(threads) + 1)
+            args = {key: value for key, value in record.items()
+                    if key not in ("name", "category", "thread", "start", "duration")}
+            events.append({"name": record["name"], "cat": record["category"], "ph": "X", "pid": os.getpid(),
+                           "tid": tid, "ts": record["start"] * 1e6, "dur": record["duration"] * 1e6,
+                           "args": args})
+        for thread, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                           "args": {"name": thread}})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the spans to path (default: the configured path). Returns the path written."""
+        path = path or self.path
+        if not path:
+            return None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.endswith(".json"):
+            self.write_chrome_trace(path)
+        else:
+            self.write_jsonl(path)
+        return path
+
+    def report(self) -> None:
+        """Print the self-time summary and save the spans, if tracing is on."""
+        if not self.enabled:
+            return
+        print("\n🔎 Trace summary (sorted by self-time)")
+        print(self.format_summary())
+        path = self.save()
+        if path:
+            print(f"💾 Trace written to {path}")
+
+
+_tracer = Tracer(enabled=False)
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer (disabled until configured)."""
+    return _tracer
+
+
+def configure_tracing(path: Optional[str] = None, enabled: Optional[bool] = None) -> Tracer:
+    """
+    Set up the process-wide tracer.
+
+    Args:
+        path: Trace file (defaults to the CREWAI_TRACE environment variable)
+        enabled: Force tracing on or off (default: on when a path is given)
+
+    Returns:
+        Tracer: The configured tracer
+    """
+    global _tracer
+    path = path or os.getenv("CREWAI_TRACE") or None
+    _tracer = Tracer(enabled=bool(path) if enabled is None else enabled, path=path)
+    return _tracer
+
+
+def span(name: str, category: str = "app", **attrs: Any):
+    """Span on the process-wide tracer."""
+    return _tracer.span(name, category, **attrs)
+
+
+def annotate(**attrs: Any) -> None:
+    """Annotate the current span of the process-wide tracer."""
+    _tracer.annotate(**attrs)
+
+
+class TracingLLM(DelegatingLLM):
+    """LLM wrapper recording one span per call."""
+
+    def call(self, messages: Union[str, List[Dict[str, Any]]], tools: Optional[List[dict]] = None,
+             callbacks: Optional[List[Any]] = None, available_functions: Optional[Dict[str, Any]] = None,
+             from_task: Optional[Any] = None, from_agent: Optional[Any] = None,
+             response_model: Optional[Any] = None) -> Any:
+        prompt = _message_text(messages)
+        with span(f"llm:{self.model}", "llm", agent=getattr(from_agent, "role", None), task_id=_task_key(from_task),
+                  bytes_in=len(prompt.encode("utf-8")), tokens_in=estimate_tokens(prompt)) as current:
+            response = self._delegate_call(messages, tools=tools, callbacks=callbacks,
+                                           available_functions=available_functions, from_task=from_task,
+                                           from_agent=from_agent, response_model=response_model)
+            if current is not None:
+                text = response if isinstance(response, str) else str(response)
+                current.attrs.update(bytes_out=len(text.encode("utf-8")), tokens_out=estimate_tokens(text))
+            return response
+
+
+def instrument_llm(llm: BaseLLM) -> BaseLLM:
+    """Wrap an LLM in a TracingLLM when tracing is on."""
+    if not _tracer.enabled or isinstance(llm, TracingLLM):
+        return llm
+    return TracingLLM(llm)
+
+
+def _event_time(event: Any, attribute: str = "timestamp") -> Optional[float]:
+    """An event's wall-clock time as seconds since the epoch (None if it has none)."""
+    when = getattr(event, attribute, None)
+    return when.timestamp() if isinstance(when, datetime) else None
+
+
+def _task_key(task: Any) -> Optional[str]:
+    task_id = getattr(task, "id", None)
+    return str(task_id) if task_id is not None else None
+
+
+class _EventSpans:
+    """
+    Task and tool spans built from CrewAI's event bus.
+
+    Event handlers may run on a different thread than the task (newer CrewAI
+    releases dispatch them on a pool), so spans are placed by the events'
+    timestamps rather than by the current context. When a task completes,
+    the LLM and tool spans recorded for it during its run become its children.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, tuple] = {}
+        self._tools: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def task_started(self, source: Any, event: Any) -> None:
+        task = getattr(event, "task", None) or source
+        key = _task_key(task)
+        if key is None or not _tracer.enabled:
+            return
+        label = getattr(getattr(task, "agent", None), "role", None) or "task"
+        with self._lock:
+            self._tasks[key] = (_tracer.at(_event_time(event)), label)
+
+    def task_finished(self, source: Any, event: Any) -> None:
+        task = getattr(event, "task", None) or source
+        key = _task_key(task)
+        with self._lock:
+            started = self._tasks.pop(key, None) if key is not None else None
+        if started is None or not _tracer.enabled:
+            return
+        start, label = started
+        attrs: Dict[str, Any] = {"task_id": key, "agent": label}
+        output = getattr(event, "output", None)
+        if output is not None:
+            attrs["bytes_out"] = len((getattr(output, "raw", "") or "").encode("utf-8"))
+        error = getattr(event, "error", None)
+        if error is not None:
+            attrs["error"] = error if isinstance(error, str) else type(error).__name__
+        _tracer.record(f"task:{label}", "task", start, _tracer.at(_event_time(event)), attrs, adopt=key)
+
+    def tool_started(self, source: Any, event: Any) -> None:
+        if _tracer.enabled:
+            with self._lock:
+                self._tools[self._tool_key(event)] = _tracer.at(_event_time(event))
+
+    def tool_finished(self, source: Any, event: Any) -> None:
+        with self._lock:
+            start = self._tools.pop(self._tool_key(event), None)
+        if not _tracer.enabled:
+            return
+        started_at, finished_at = _event_time(event, "started_at"), _event_time(event, "finished_at")
+        end = _tracer.at(finished_at if finished_at is not None else _event_time(event))
+        if started_at is not None:
+            start = _tracer.at(started_at)
+        payload = json.dumps(getattr(event, "tool_args", None), default=str)
+        attrs: Dict[str, Any] = {"agent": getattr(event, "agent_role", None),
+                                 "task_id": getattr(event, "task_id", None),
+                                 "bytes_in": len(payload.encode("utf-8"))}
+        if getattr(event, "output", None) is not None:
+            attrs["bytes_out"] = len(str(event.output).encode("utf-8"))
+        if getattr(event, "error", None) is not None:
+            attrs["error"] = str(event.error)[:200]
+        _tracer.record(f"tool:{getattr(event, 'tool_name', 'tool')}", "tool",
+                       end if start is None else start, end, attrs)
+
+    @staticmethod
+    def _tool_key(event: Any) -> tuple:
+        return (getattr(event, "task_id", None), getattr(event, "agent_role", None),
+                getattr(event, "tool_name", None), getattr(event, "run_attempts", None))
+
+
+_event_spans = _EventSpans()
+_subscribed = False
+_subscribe_lock = threading.Lock()
+
+
+def _subscribe() -> bool:
+    """Register the tracing handlers on CrewAI's event bus once per process."""
+    global _subscribed
+    if crewai_event_bus is None:
+        return False
+    with _subscribe_lock:
+        if not _subscribed:
+            crewai_event_bus.on(TaskStartedEvent)(_event_spans.task_started)
+            crewai_event_bus.on(TaskCompletedEvent)(_event_spans.task_finished)
+            crewai_event_bus.on(TaskFailedEvent)(_event_spans.task_finished)
+            crewai_event_bus.on(ToolUsageStartedEvent)(_event_spans.tool_started)
+            crewai_event_bus.on(ToolUsageFinishedEvent)(_event_spans.tool_finished)
+            crewai_event_bus.on(ToolUsageErrorEvent)(_event_spans.tool_finished)
+            _subscribed = True
+    return True
+
+
+def instrument_tools(tools: List[BaseTool]) -> List[BaseTool]:
+    """Record a span for every tool run (from CrewAI's tool usage events) when tracing is on."""
+    if _tracer.enabled:
+        _subscribe()
+    return tools
+
+
+def instrument_tasks(tasks: List[Task]) -> List[Task]:
+    """Record a span for every task execution (from CrewAI's task events) when tracing is on."""
+    if _tracer.enabled:
+        _subscribe()
+    return tasks